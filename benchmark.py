@@ -0,0 +1,246 @@
+import argparse
+import asyncio
+import json
+import logging
+import os
+import random
+import statistics
+import sys
+import time
+import types
+from aiohttp import web
+
+# bot.py exits at import without a token; the benchmark never logs in, so any value will do.
+os.environ.setdefault('DISCORD_BOT_TOKEN', 'benchmark')
+import bot
+
+class MockPanel:
+    def __init__(self, latency: float, jitter: float, error_rate: float, rate_limit_rate: float, retry_after: float, servers_per_panel: int):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.retry_after = retry_after
+        self.servers_per_panel = servers_per_panel
+        self.requests = 0
+        self.responses = {}
+        self.runner = None
+        self.port = None
+
+    def _server(self, server_id: str) -> dict:
+        return {'name': f"Bench {server_id}", 'uuid': server_id, 'identifier': server_id[:8]}
+
+    async def _respond(self, handler) -> web.StreamResponse:
+        self.requests += 1
+        await asyncio.sleep(max(self.latency + random.uniform(-self.jitter, self.jitter), 0.0))
+        roll = random.random()
+        if roll < self.rate_limit_rate:
+            response = web.json_response({'errors': [{'code': 'TooManyRequestsHttpException', 'status': '429', 'detail': "Too many requests."}]}, status=429, headers={'Retry-After': str(self.retry_after)})
+        elif roll < self.rate_limit_rate + self.error_rate:
+            response = web.json_response({'errors': [{'code': 'HttpException', 'status': '500', 'detail': "Mock panel error."}]}, status=500)
+        else:
+            response = handler()
+        self.responses[response.status] = self.responses.get(response.status, 0) + 1
+        return response
+
+    async def list_servers(self, request: web.Request) -> web.StreamResponse:
+        page = int(request.query.get('page', 1)); per_page = int(request.query.get('per_page', 50))
+        total = self.servers_per_panel
+        ids = range((page - 1) * per_page, min(page * per_page, total))
+        return await self._respond(lambda: web.json_response({
+            'data': [{'object': 'server', 'attributes': self._server(f"bench-{index}")} for index in ids],
+            'meta': {'pagination': {'total': total, 'count': len(ids), 'per_page': per_page, 'current_page': page, 'total_pages': max((total + per_page - 1) // per_page, 1)}},
+        }))
+
+    async def server(self, request: web.Request) -> web.StreamResponse:
+        return await self._respond(lambda: web.json_response({'object': 'server', 'attributes': self._server(request.match_info['server_id'])}))
+
+    async def resources(self, request: web.Request) -> web.StreamResponse:
+        uptime = int(time.monotonic() * 1000)
+        return await self._respond(lambda: web.json_response({'object': 'stats', 'attributes': {
+            'current_state': 'running', 'is_suspended': False,
+            'resources': {'memory_bytes': random.randint(1 << 28, 1 << 30), 'cpu_absolute': random.uniform(0, 100), 'disk_bytes': 1 << 31, 'network_rx_bytes': uptime * 10, 'network_tx_bytes': uptime * 4, 'uptime': uptime},
+            'limits': {'memory': 2048, 'disk': 0, 'cpu': 100},
+        }}))
+
+    async def power(self, request: web.Request) -> web.StreamResponse:
+        return await self._respond(lambda: web.Response(status=204))
+
+    async def command(self, request: web.Request) -> web.StreamResponse:
+        return await self._respond(lambda: web.Response(status=204))
+
+    async def start(self, port: int = 0):
+        app = web.Application()
+        app.router.add_get('/{panel}/api/client', self.list_servers)
+        app.router.add_get('/{panel}/api/client/servers/{server_id}', self.server)
+        app.router.add_get('/{panel}/api/client/servers/{server_id}/resources', self.resources)
+        app.router.add_post('/{panel}/api/client/servers/{server_id}/power', self.power)
+        app.router.add_post('/{panel}/api/client/servers/{server_id}/command', self.command)
+        self.runner = web.AppRunner(app, access_log=None)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, '127.0.0.1', port)
+        await site.start()
+        self.port = site._server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        if self.runner: await self.runner.cleanup()
+
+class FakeMessage:
+    def __init__(self, content=None, embed=None):
+        self.content = content
+        self.embed = embed
+
+    async def edit(self, content=None, embed=None, **kwargs):
+        self.content = content; self.embed = embed
+        return self
+
+class FakeFollowup:
+    def __init__(self, interaction):
+        self.interaction = interaction
+
+    async def send(self, content=None, embed=None, wait=False, **kwargs):
+        message = FakeMessage(content, embed)
+        self.interaction.messages.append(message)
+        return message
+
+class FakeInteractionResponse:
+    def __init__(self, interaction):
+        self.interaction = interaction
+        self._done = False
+
+    def is_done(self) -> bool:
+        return self._done
+
+    async def defer(self, **kwargs):
+        self._done = True
+
+    async def send_message(self, content=None, embed=None, **kwargs):
+        self._done = True
+        self.interaction.messages.append(FakeMessage(content, embed))
+
+class FakeInteraction:
+    def __init__(self, guild_id: int):
+        self.guild = types.SimpleNamespace(id=guild_id, name=f"Bench Guild {guild_id}")
+        self.guild_id = guild_id
+        self.user = types.SimpleNamespace(id=guild_id, display_name="bench", mention=f"<@{guild_id}>")
+        self.channel_id = guild_id
+        self.channel = None
+        self.extras = {}
+        self.messages = []
+        self.response = FakeInteractionResponse(self)
+        self.followup = FakeFollowup(self)
+
+    def failed(self) -> bool:
+        final = self.messages[-1] if self.messages else None
+        return final is None or (final.embed is None and not (final.content or "").startswith("✅"))
+
+SCENARIOS = {
+    'status': lambda interaction, server_id: bot.ptero_status.callback(interaction, server_id),
+    'power': lambda interaction, server_id: bot.ptero_restart.callback(interaction, server_id),
+    'list_servers': lambda interaction, server_id: bot.ptero_list_servers.callback(interaction),
+}
+
+def percentile(values, fraction: float) -> float:
+    if not values: return 0.0
+    ordered = sorted(values)
+    return ordered[min(int(round(fraction * (len(ordered) - 1))), len(ordered) - 1)]
+
+async def sample_event_loop_lag(samples: list, interval: float = 0.01):
+    while True:
+        started = time.perf_counter()
+        await asyncio.sleep(interval)
+        samples.append(time.perf_counter() - started - interval)
+
+def panel_url_for(panel: MockPanel, guild_index: int, panels: int) -> str:
+    return f"http://127.0.0.1:{panel.port}/panel-{guild_index % panels}"
+
+async def run_scenario(name: str, panel: MockPanel, args) -> dict:
+    for guild_config in bot.ALL_GUILD_CONFIGS.values():
+        bot.server_name_cache.invalidate_panel(guild_config['panel_url'])
+        bot.resource_poller.invalidate_panel(guild_config['panel_url'])
+        bot.server_list_page_cache.invalidate_panel(guild_config['panel_url'])
+    scenario = SCENARIOS[name]
+    latencies = []; failures = 0
+    panel_requests_before = panel.requests
+    lag_samples = []
+    lag_task = asyncio.create_task(sample_event_loop_lag(lag_samples))
+
+    async def guild_worker(guild_index: int):
+        nonlocal failures
+        for iteration in range(args.iterations):
+            interaction = FakeInteraction(guild_index + 1)
+            server_id = f"bench-{random.randrange(args.servers)}"
+            started = time.perf_counter()
+            await scenario(interaction, server_id)
+            finished = time.perf_counter()
+            latencies.append(finished - started)
+            if interaction.failed(): failures += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(guild_worker(guild_index) for guild_index in range(args.guilds)))
+    elapsed = time.perf_counter() - started
+    lag_task.cancel()
+    return {
+        'scenario': name,
+        'commands': len(latencies),
+        'failures': failures,
+        'elapsed_seconds': round(elapsed, 3),
+        'commands_per_second': round(len(latencies) / elapsed, 1) if elapsed else 0.0,
+        'panel_requests': panel.requests - panel_requests_before,
+        'panel_requests_per_second': round((panel.requests - panel_requests_before) / elapsed, 1) if elapsed else 0.0,
+        'p50_ms': round(percentile(latencies, 0.50) * 1000, 1),
+        'p99_ms': round(percentile(latencies, 0.99) * 1000, 1),
+        'max_ms': round(max(latencies, default=0.0) * 1000, 1),
+        'loop_lag_mean_ms': round(statistics.fmean(lag_samples) * 1000, 2) if lag_samples else 0.0,
+        'loop_lag_max_ms': round(max(lag_samples, default=0.0) * 1000, 2),
+    }
+
+def print_report(results: list, panel: MockPanel):
+    columns = ('scenario', 'commands', 'failures', 'commands_per_second', 'panel_requests_per_second', 'p50_ms', 'p99_ms', 'max_ms', 'loop_lag_mean_ms', 'loop_lag_max_ms')
+    headers = ('scenario', 'cmds', 'fail', 'cmd/s', 'req/s', 'p50 ms', 'p99 ms', 'max ms', 'lag ms', 'lag max')
+    widths = [max(len(header), *(len(str(result[column])) for result in results)) for header, column in zip(headers, columns)]
+    print("  ".join(header.ljust(width) for header, width in zip(headers, widths)))
+    for result in results:
+        print("  ".join(str(result[column]).ljust(width) for column, width in zip(columns, widths)))
+    print(f"Mock panel responses by status: {dict(sorted(panel.responses.items()))}")
+
+async def main(args) -> int:
+    if not args.verbose: bot.ptero_logger.setLevel(logging.ERROR)
+    panel = MockPanel(args.latency_ms / 1000, args.jitter_ms / 1000, args.error_rate, args.rate_limit_rate, args.retry_after, args.servers)
+    await panel.start(args.port)
+    panels = args.panels or args.guilds
+    for guild_index in range(args.guilds):
+        bot.ALL_GUILD_CONFIGS[str(guild_index + 1)] = {'panel_url': panel_url_for(panel, guild_index, panels), 'api_key': 'benchmark', 'server_aliases': {}, 'default_pterodactyl_server_uuid': None}
+    bot.configs_ready.set()
+    results = []
+    try:
+        for name in args.scenarios:
+            results.append(await run_scenario(name, panel, args))
+    finally:
+        await bot.ptero_client.close()
+        await panel.stop()
+    if args.json: print(json.dumps(results, indent=2))
+    else: print_report(results, panel)
+    regressions = [result['scenario'] for result in results if args.max_p99_ms and result['p99_ms'] > args.max_p99_ms]
+    if regressions:
+        print(f"p99 latency above {args.max_p99_ms} ms in: {', '.join(regressions)}", file=sys.stderr)
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmarks the bot's command handlers against a local mock Pterodactyl panel.")
+    parser.add_argument('--guilds', type=int, default=50, help="Concurrent guilds issuing commands")
+    parser.add_argument('--iterations', type=int, default=20, help="Commands issued by each guild per scenario")
+    parser.add_argument('--panels', type=int, default=0, help="Distinct panels shared by the guilds (default: one per guild)")
+    parser.add_argument('--servers', type=int, default=10, help="Servers per panel")
+    parser.add_argument('--scenarios', nargs='+', choices=sorted(SCENARIOS), default=['status', 'power', 'list_servers'])
+    parser.add_argument('--latency-ms', type=float, default=50.0, help="Mock panel response latency")
+    parser.add_argument('--jitter-ms', type=float, default=10.0, help="Random +/- variation of the latency")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="Fraction of panel requests answered with HTTP 500")
+    parser.add_argument('--rate-limit-rate', type=float, default=0.0, help="Fraction of panel requests answered with HTTP 429")
+    parser.add_argument('--retry-after', type=float, default=1.0, help="Retry-After seconds sent with mock 429 responses")
+    parser.add_argument('--port', type=int, default=0, help="Port of the mock panel (default: random free port)")
+    parser.add_argument('--max-p99-ms', type=float, default=0.0, help="Exit with status 1 if any scenario's p99 latency exceeds this")
+    parser.add_argument('--json', action='store_true', help="Print results as JSON")
+    parser.add_argument('--verbose', action='store_true', help="Keep the bot's request logs")
+    sys.exit(asyncio.run(main(parser.parse_args())))
@@ -1,65 +1,1256 @@
 import discord
 from discord import app_commands
 from discord.ext import commands
-import requests
+import aiohttp
 import os
 import json
 from dotenv import load_dotenv
 import asyncio
 import typing
+import time
+import collections
+import datetime
+import re
+import fnmatch
+import random
+import hashlib
+import hmac
+import bisect
+import io
+import heapq
+import array
+import logging
+import sqlite3
+import concurrent.futures
+import contextlib
+from aiohttp import web
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+try:
+    from cryptography.fernet import Fernet, MultiFernet, InvalidToken
+except ImportError:
+    Fernet = MultiFernet = InvalidToken = None
+
+PROCESS_STARTED_AT = time.perf_counter()
 
 load_dotenv()
 DISCORD_BOT_TOKEN = os.getenv('DISCORD_BOT_TOKEN')
 DISCORD_TOKEN = os.getenv('DISCORD_BOT_TOKEN')
 
+METRICS_PORT = os.getenv('PTERO_METRICS_PORT')
+ptero_logger = logging.getLogger('ptero')
+
+def log_event(event: str, level: int = logging.INFO, **fields):
+    if ptero_logger.isEnabledFor(level):
+        ptero_logger.log(level, json.dumps({'event': event, **fields}, default=str))
+
 if not DISCORD_BOT_TOKEN:
-    print("CRITICAL ERROR: Discord bot token (DISCORD_BOT_TOKEN) not found in .env file!")
+    log_event('startup_failed', logging.CRITICAL, reason="Discord bot token (DISCORD_BOT_TOKEN) not found in .env file")
     exit()
 
+class Metrics:
+    LATENCY_BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+    def __init__(self):
+        self.counters = collections.defaultdict(float)
+        self.gauges = {}
+        self.histograms = {}
+        self.descriptions = {}
+        self.collectors = []
+
+    def describe(self, name: str, metric_type: str, description: str):
+        self.descriptions[name] = (metric_type, description)
+
+    def inc(self, name: str, value: float = 1, **labels):
+        self.counters[(name, tuple(sorted(labels.items())))] += value
+
+    def set_gauge(self, name: str, value: float, **labels):
+        self.gauges[(name, tuple(sorted(labels.items())))] = value
+
+    def observe(self, name: str, value: float, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        histogram = self.histograms.get(key)
+        if histogram is None:
+            histogram = self.histograms[key] = [[0] * len(self.LATENCY_BUCKETS), 0.0, 0]
+        for index, bound in enumerate(self.LATENCY_BUCKETS):
+            if value <= bound: histogram[0][index] += 1
+        histogram[1] += value
+        histogram[2] += 1
+
+    def cache_lookup(self, cache: str, hit: bool):
+        self.inc('ptero_cache_lookups_total', cache=cache, result='hit' if hit else 'miss')
+
+    @staticmethod
+    def _format_labels(labels: tuple, extra: tuple = ()) -> str:
+        items = labels + extra
+        if not items: return ""
+        return "{" + ",".join(f'{key}="{str(value).replace(chr(92), chr(92) * 2).replace(chr(34), chr(92) + chr(34))}"' for key, value in items) + "}"
+
+    def render(self) -> str:
+        for collector in self.collectors:
+            collector()
+        lines = []
+        described = set()
+        def header(name: str, default_type: str):
+            if name in described: return
+            described.add(name)
+            metric_type, description = self.descriptions.get(name, (default_type, name))
+            lines.append(f"# HELP {name} {description}")
+            lines.append(f"# TYPE {name} {metric_type}")
+        for (name, labels), value in sorted(self.counters.items()):
+            header(name, 'counter'); lines.append(f"{name}{self._format_labels(labels)} {value}")
+        for (name, labels), value in sorted(self.gauges.items()):
+            header(name, 'gauge'); lines.append(f"{name}{self._format_labels(labels)} {value}")
+        for (name, labels), (bucket_counts, total, count) in sorted(self.histograms.items()):
+            header(name, 'histogram')
+            for bound, bucket_count in zip(self.LATENCY_BUCKETS, bucket_counts):
+                lines.append(f"{name}_bucket{self._format_labels(labels, (('le', bound),))} {bucket_count}")
+            lines.append(f"{name}_bucket{self._format_labels(labels, (('le', '+Inf'),))} {count}")
+            lines.append(f"{name}_sum{self._format_labels(labels)} {total}")
+            lines.append(f"{name}_count{self._format_labels(labels)} {count}")
+        return "\n".join(lines) + "\n"
+
+metrics = Metrics()
+metrics.describe('ptero_panel_request_seconds', 'histogram', "Latency of Pterodactyl API requests by endpoint.")
+metrics.describe('ptero_panel_responses_total', 'counter', "Pterodactyl API responses by panel and status code.")
+metrics.describe('ptero_panel_errors_total', 'counter', "Failed Pterodactyl API requests by panel and kind.")
+metrics.describe('ptero_command_seconds', 'histogram', "Slash command handler latency.")
+metrics.describe('ptero_command_dispatch_seconds', 'histogram', "Delay between Discord creating an interaction and the bot starting to handle it.")
+metrics.describe('ptero_event_loop_lag_seconds', 'histogram', "How late the event loop wakes up a sleeping task.")
+metrics.describe('ptero_cache_lookups_total', 'counter', "Cache lookups by cache and result.")
+metrics.describe('ptero_scheduled_runs_total', 'counter', "Scheduled actions fired by action and outcome.")
+metrics.describe('ptero_panel_gets_total', 'counter', "GET requests issued through the Pterodactyl client, including coalesced ones.")
+metrics.describe('ptero_panel_gets_coalesced_total', 'counter', "GET requests that joined an identical in-flight request instead of reaching the panel.")
+metrics.describe('ptero_panel_circuit_open', 'gauge', "1 while a panel's circuit breaker is open after consecutive failures.")
+metrics.describe('ptero_panel_circuit_transitions_total', 'counter', "Circuit breaker state changes by panel and new state.")
+metrics.describe('ptero_panel_fast_failures_total', 'counter', "Requests rejected without contacting the panel because its circuit breaker is open.")
+
+ENDPOINT_ID_PATTERN = re.compile(r'/servers/[^/]+')
+
+def normalize_endpoint(path: str) -> str:
+    return ENDPOINT_ID_PATTERN.sub('/servers/{id}', path)
+
+background_tasks = set()
+
+def create_background_task(coroutine) -> asyncio.Task:
+    # The event loop only keeps weak references to tasks; without this set a fire-and-forget task can be collected mid-run.
+    task = asyncio.create_task(coroutine)
+    background_tasks.add(task)
+    task.add_done_callback(background_tasks.discard)
+    return task
+
+async def monitor_event_loop_lag(interval: float = 0.5):
+    while True:
+        started = time.perf_counter()
+        await asyncio.sleep(interval)
+        lag = max(time.perf_counter() - started - interval, 0.0)
+        metrics.observe('ptero_event_loop_lag_seconds', lag)
+        metrics.set_gauge('ptero_event_loop_lag_last_seconds', lag)
+        if lag > 1.0: log_event('event_loop_lag', logging.WARNING, lag_seconds=round(lag, 3))
+
+async def start_metrics_server(port: int) -> web.AppRunner:
+    async def handle_metrics(request: web.Request) -> web.Response:
+        return web.Response(text=metrics.render(), content_type='text/plain', charset='utf-8')
+    app = web.Application()
+    app.router.add_get('/metrics', handle_metrics)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    await web.TCPSite(runner, '127.0.0.1', port).start()
+    log_event('metrics_server_started', url=f"http://127.0.0.1:{port}/metrics")
+    return runner
+
 GUILD_CONFIGS_FILE = "ptero_guild_configs.json"
+GUILD_CONFIGS_JOURNAL_FILE = "ptero_guild_configs.journal"
+GUILD_CONFIGS_LOCK_FILE = "ptero_guild_configs.lock"
+GUILD_CONFIGS_DB_FILE = "ptero_guild_configs.db"
+STORAGE_BACKEND = os.getenv('PTERO_STORAGE', 'json').lower()
+SHARD_COUNT = int(os.getenv('PTERO_SHARD_COUNT')) if os.getenv('PTERO_SHARD_COUNT') else None
+SHARD_IDS = [int(shard_id) for shard_id in os.getenv('PTERO_SHARD_IDS').split(',')] if os.getenv('PTERO_SHARD_IDS') else None
 ALL_GUILD_CONFIGS = {}
 config_lock = asyncio.Lock()
 
-async def load_all_guild_configs():
-    global ALL_GUILD_CONFIGS
-    async with config_lock:
+if SHARD_IDS is not None and not SHARD_COUNT:
+    log_event('startup_failed', logging.CRITICAL, reason="PTERO_SHARD_IDS requires PTERO_SHARD_COUNT to be set in .env file")
+    exit()
+
+if SHARD_IDS is not None and STORAGE_BACKEND != 'sqlite' and fcntl is None:
+    log_event('startup_failed', logging.CRITICAL, reason="Sharing the JSON config file between shard processes needs file locks, which this platform lacks; set PTERO_STORAGE=sqlite")
+    exit()
+
+MASTER_KEYS = [key.strip() for key in (os.getenv('PTERO_MASTER_KEYS') or os.getenv('PTERO_MASTER_KEY') or '').split(',') if key.strip()]
+
+if MASTER_KEYS and Fernet is None:
+    log_event('startup_failed', logging.CRITICAL, reason="PTERO_MASTER_KEYS is set but the 'cryptography' package is not installed (pip install cryptography)")
+    exit()
+
+def owns_guild(guild_id_str: str) -> bool:
+    if SHARD_IDS is None or not SHARD_COUNT: return True
+    return (int(guild_id_str) >> 22) % SHARD_COUNT in SHARD_IDS
+
+def write_file_atomically(path: str, data: str):
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    with open(temp_path, 'w') as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temp_path, path)
+
+class JsonGuildConfigStorage:
+    supports_shared_cache = False
+
+    def __init__(self, snapshot_path: str, journal_path: str, lock_path: str, compact_after: int = 500):
+        self.snapshot_path = snapshot_path
+        self.journal_path = journal_path
+        self.lock_path = lock_path
+        self.compact_after = compact_after
+        self.journal_entries = 0
+
+    @contextlib.contextmanager
+    def _locked(self, exclusive: bool):
+        # Shard processes share the snapshot and journal; an exclusive lock keeps appends out while compact rewrites both files.
+        if fcntl is None:
+            yield; return
+        with open(self.lock_path, 'a') as lock_file:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+            yield
+
+    def _read(self, strict: bool = False) -> dict:
         try:
-            with open(GUILD_CONFIGS_FILE, 'r') as f:
-                ALL_GUILD_CONFIGS = json.load(f)
-                for guild_id_str in ALL_GUILD_CONFIGS:
-                    if 'server_aliases' not in ALL_GUILD_CONFIGS[guild_id_str]:
-                        ALL_GUILD_CONFIGS[guild_id_str]['server_aliases'] = {}
-                    if 'default_pterodactyl_server_uuid' not in ALL_GUILD_CONFIGS[guild_id_str]:
-                        ALL_GUILD_CONFIGS[guild_id_str]['default_pterodactyl_server_uuid'] = None
-                print(f"Loaded Pterodactyl configurations for {len(ALL_GUILD_CONFIGS)} guilds from {GUILD_CONFIGS_FILE}")
+            with open(self.snapshot_path, 'r') as f:
+                configs = json.load(f)
         except FileNotFoundError:
-            ALL_GUILD_CONFIGS = {}
-            print(f"Config file {GUILD_CONFIGS_FILE} not found. It will be created on first configuration.")
+            if strict: raise
+            configs = {}
+            log_event('guild_config_file_missing', path=self.snapshot_path)
         except json.JSONDecodeError:
-            ALL_GUILD_CONFIGS = {}
-            print(f"WARNING: File {GUILD_CONFIGS_FILE} is corrupted or empty. It will be overwritten on first configuration.")
+            if strict: raise
+            configs = {}
+            log_event('guild_config_file_corrupted', logging.WARNING, path=self.snapshot_path)
+        self.journal_entries = 0
+        try:
+            with open(self.journal_path, 'r') as f:
+                for line in f:
+                    try: entry = json.loads(line)
+                    except json.JSONDecodeError: log_event('guild_config_journal_entry_skipped', logging.WARNING, path=self.journal_path); continue
+                    if entry.get('config') is None: configs.pop(entry['guild'], None)
+                    else: configs[entry['guild']] = entry['config']
+                    self.journal_entries += 1
+        except FileNotFoundError: pass
+        return configs
+
+    def load(self, owns_guild_id, strict: bool = False) -> dict:
+        with self._locked(False):
+            configs = self._read(strict)
+        return {guild_id_str: config for guild_id_str, config in configs.items() if owns_guild_id(guild_id_str)}
+
+    def change_token(self):
+        token = []
+        for path in (self.snapshot_path, self.journal_path):
+            try: stat = os.stat(path)
+            except FileNotFoundError: token.append(None); continue
+            token.append((stat.st_mtime_ns, stat.st_size))
+        return tuple(token)
+
+    def write_changes(self, changes: dict):
+        lines = "".join(f'{{"guild":{json.dumps(guild_id_str)},"config":{config_json or "null"}}}\n' for guild_id_str, config_json in changes.items())
+        with self._locked(True), open(self.journal_path, 'a') as f:
+            f.write(lines)
+            f.flush()
+            os.fsync(f.fileno())
+        self.journal_entries += len(changes)
+
+    def should_compact(self) -> bool:
+        return self.journal_entries >= self.compact_after
+
+    def compact(self, configs_json: str, owns_guild_id):
+        configs = json.loads(configs_json)
+        with self._locked(True):
+            if SHARD_IDS is not None:
+                configs = {**{guild_id_str: config for guild_id_str, config in self._read().items() if not owns_guild_id(guild_id_str)}, **configs}
+            write_file_atomically(self.snapshot_path, json.dumps(configs, separators=(',', ':')))
+            with open(self.journal_path, 'w'): pass
+        self.journal_entries = 0
+
+    def get_shared(self, key: str) -> typing.Optional[str]:
+        return None
 
-async def save_all_guild_configs():
+    def put_shared(self, key: str, value: str, ttl: float):
+        pass
+
+    def close(self):
+        pass
+
+class SQLiteGuildConfigStorage:
+    supports_shared_cache = True
+
+    def __init__(self, path: str, compact_interval: float = 3600.0):
+        self.path = path
+        self.compact_interval = compact_interval
+        self._next_compact_at = time.monotonic() + compact_interval
+        self._connection = None
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._connection is None:
+            self._connection = sqlite3.connect(self.path, timeout=30, check_same_thread=False, isolation_level=None)
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute("PRAGMA synchronous=NORMAL")
+            self._connection.execute("CREATE TABLE IF NOT EXISTS guild_configs (guild_id TEXT PRIMARY KEY, config TEXT NOT NULL, updated_at REAL NOT NULL)")
+            self._connection.execute("CREATE TABLE IF NOT EXISTS shared_cache (key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)")
+        return self._connection
+
+    def load(self, owns_guild_id, strict: bool = False) -> dict:
+        connection = self._connect()
+        if SHARD_IDS is not None and SHARD_COUNT:
+            placeholders = ",".join("?" for _ in SHARD_IDS)
+            rows = connection.execute(f"SELECT guild_id, config FROM guild_configs WHERE ((CAST(guild_id AS INTEGER) >> 22) % ?) IN ({placeholders})", (SHARD_COUNT, *SHARD_IDS))
+        else:
+            rows = connection.execute("SELECT guild_id, config FROM guild_configs")
+        return {guild_id_str: json.loads(config_json) for guild_id_str, config_json in rows}
+
+    def write_changes(self, changes: dict):
+        connection = self._connect()
+        now = time.time()
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            for guild_id_str, config_json in changes.items():
+                if config_json is None: connection.execute("DELETE FROM guild_configs WHERE guild_id = ?", (guild_id_str,))
+                else: connection.execute("INSERT INTO guild_configs (guild_id, config, updated_at) VALUES (?, ?, ?) ON CONFLICT(guild_id) DO UPDATE SET config = excluded.config, updated_at = excluded.updated_at", (guild_id_str, config_json, now))
+            connection.execute("COMMIT")
+        except Exception:
+            connection.execute("ROLLBACK")
+            raise
+
+    def should_compact(self) -> bool:
+        return time.monotonic() >= self._next_compact_at
+
+    def change_token(self):
+        # data_version only changes when another connection commits, so this process's own writes never trigger a reload.
+        return self._connect().execute("PRAGMA data_version").fetchone()[0]
+
+    def compact(self, configs_json: str, owns_guild_id):
+        self._next_compact_at = time.monotonic() + self.compact_interval
+        self._connect().execute("DELETE FROM shared_cache WHERE expires_at <= ?", (time.time(),))
+
+    def get_shared(self, key: str) -> typing.Optional[str]:
+        row = self._connect().execute("SELECT value FROM shared_cache WHERE key = ? AND expires_at > ?", (key, time.time())).fetchone()
+        return row[0] if row else None
+
+    def put_shared(self, key: str, value: str, ttl: float):
+        self._connect().execute("INSERT INTO shared_cache (key, value, expires_at) VALUES (?, ?, ?) ON CONFLICT(key) DO UPDATE SET value = excluded.value, expires_at = excluded.expires_at", (key, value, time.time() + ttl))
+
+    def close(self):
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+class GuildConfigPersistence:
+    def __init__(self, storage, debounce_seconds: float = 1.0):
+        self.storage = storage
+        self.debounce_seconds = debounce_seconds
+        self._dirty = set()
+        self._flush_task = None
+        self._write_lock = asyncio.Lock()
+        self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=1, thread_name_prefix='ptero-storage')
+        self._change_token = None
+
+    async def run(self, function, *args):
+        return await asyncio.get_running_loop().run_in_executor(self._executor, function, *args)
+
+    async def load(self) -> dict:
+        self._change_token = await self.run(self.storage.change_token)
+        return await self.run(self.storage.load, owns_guild)
+
+    async def reload(self, apply) -> bool:
+        async with self._write_lock:
+            change_token = await self.run(self.storage.change_token)
+            if change_token == self._change_token: return False
+            configs = await self.run(self.storage.load, owns_guild, True)
+            self._change_token = change_token
+            # Holding the write lock keeps flushes out, so guilds changed in memory since the last flush are exactly the dirty set.
+            await apply(configs, self._dirty)
+            return True
+
+    def mark_dirty(self, guild_id_str: str):
+        self._dirty.add(guild_id_str)
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._flush_later())
+
+    async def _flush_later(self):
+        # Guilds marked dirty while a flush is writing find this task still running, so keep flushing until nothing is left.
+        while True:
+            await asyncio.sleep(self.debounce_seconds)
+            await self.flush()
+            if not self._dirty: return
+
+    async def flush(self, compact: bool = False):
+        async with self._write_lock:
+            dirty, self._dirty = self._dirty, set()
+            try:
+                if not dirty and not compact: return
+                # An outside edit that has not been reloaded yet must stay visible to the reloader after our own write.
+                externally_changed = await self.run(self.storage.change_token) != self._change_token
+                if dirty:
+                    changes = {guild_id_str: json.dumps(ALL_GUILD_CONFIGS[guild_id_str], separators=(',', ':')) if guild_id_str in ALL_GUILD_CONFIGS else None for guild_id_str in dirty}
+                    await self.run(self.storage.write_changes, changes)
+                # Compacting rewrites the snapshot from memory, which would drop that edit too, so it waits for the reloader (even at shutdown).
+                if (compact or self.storage.should_compact()) and not externally_changed:
+                    await self.run(self.storage.compact, json.dumps(ALL_GUILD_CONFIGS, separators=(',', ':')), owns_guild)
+                if not externally_changed: self._change_token = await self.run(self.storage.change_token)
+            except Exception as e:
+                self._dirty |= dirty
+                log_event('guild_config_save_failed', logging.CRITICAL, guilds=len(dirty), error=str(e), error_type=type(e).__name__)
+            except BaseException:
+                self._dirty |= dirty
+                raise
+
+    async def get_shared(self, key: str) -> typing.Optional[str]:
+        if not self.storage.supports_shared_cache: return None
+        try: return await self.run(self.storage.get_shared, key)
+        except sqlite3.Error: return None
+
+    def _put_shared_quietly(self, key: str, value: str, ttl: float):
+        try: self.storage.put_shared(key, value, ttl)
+        except sqlite3.Error as e: log_event('shared_cache_write_failed', logging.WARNING, key=key, error=str(e))
+
+    def put_shared(self, key: str, value: str, ttl: float):
+        if not self.storage.supports_shared_cache: return
+        asyncio.get_running_loop().run_in_executor(self._executor, self._put_shared_quietly, key, value, ttl)
+
+    async def close(self, compact: bool = True):
+        if self._flush_task and not self._flush_task.done():
+            self._flush_task.cancel()
+        await self.flush(compact=compact)
+        await self.run(self.storage.close)
+        self._executor.shutdown(wait=False)
+
+def create_guild_config_storage():
+    if STORAGE_BACKEND == 'sqlite':
+        return SQLiteGuildConfigStorage(GUILD_CONFIGS_DB_FILE)
+    return JsonGuildConfigStorage(GUILD_CONFIGS_FILE, GUILD_CONFIGS_JOURNAL_FILE, GUILD_CONFIGS_LOCK_FILE)
+
+guild_config_persistence = GuildConfigPersistence(create_guild_config_storage())
+
+configs_ready = asyncio.Event()
+config_load_error = None
+
+async def load_all_guild_configs():
+    global ALL_GUILD_CONFIGS, config_load_error
     async with config_lock:
         try:
-            with open(GUILD_CONFIGS_FILE, 'w') as f:
-                json.dump(ALL_GUILD_CONFIGS, f, indent=4)
-        except IOError:
-            print(f"CRITICAL ERROR: Failed to save configuration to {GUILD_CONFIGS_FILE}")
+            ALL_GUILD_CONFIGS = await guild_config_persistence.load()
+            for guild_id_str in ALL_GUILD_CONFIGS:
+                normalize_guild_config(ALL_GUILD_CONFIGS[guild_id_str])
+                if credential_store.enabled and reseal_guild_credentials(ALL_GUILD_CONFIGS[guild_id_str]):
+                    save_guild_config(guild_id_str)
+                resource_poller.track_default_server(guild_id_str, ALL_GUILD_CONFIGS[guild_id_str])
+            if not credential_store.enabled: log_event('credentials_unencrypted', logging.WARNING, reason="PTERO_MASTER_KEYS is not set; Pterodactyl API keys are stored in plaintext")
+            log_event('guild_configs_loaded', guilds=len(ALL_GUILD_CONFIGS), backend=STORAGE_BACKEND, shards=SHARD_IDS, shard_count=SHARD_COUNT)
+        except Exception as e:
+            config_load_error = e
+            log_event('guild_configs_load_failed', logging.CRITICAL, error=str(e))
+        finally:
+            # Waiters must never hang; they check config_load_error once this is set.
+            configs_ready.set()
+
+def normalize_guild_config(config: dict) -> dict:
+    if 'server_aliases' not in config:
+        config['server_aliases'] = {}
+    if 'default_pterodactyl_server_uuid' not in config:
+        config['default_pterodactyl_server_uuid'] = None
+    return config
+
+def save_guild_config(guild_id_str: str):
+    guild_config_persistence.mark_dirty(guild_id_str)
 
 def get_guild_config(guild_id: int):
     guild_id_str = str(guild_id)
     config = ALL_GUILD_CONFIGS.get(guild_id_str)
     if config:
-        if 'server_aliases' not in config:
-            config['server_aliases'] = {}
-        if 'default_pterodactyl_server_uuid' not in config:
-            config['default_pterodactyl_server_uuid'] = None
+        normalize_guild_config(config)
+        if reseal_guild_credentials(config):
+            save_guild_config(guild_id_str)
     return config
 
 def get_api_headers(api_key: str):
     if not api_key: return {}
-    return {'Authorization': f'Bearer {api_key}', 'Accept': 'application/json', 'Content-Type': 'application/json'}
+    return {'Authorization': f'Bearer {credential_store.reveal(api_key)}', 'Accept': 'application/json', 'Content-Type': 'application/json'}
+
+class PterodactylResponse:
+    def __init__(self, status_code: int, headers, text: str):
+        self.status_code = status_code
+        self.headers = headers
+        self.text = text
+        self._json = None
+
+    def json(self):
+        if self._json is None: self._json = json.loads(self.text)
+        return self._json
+
+class PterodactylError(Exception):
+    pass
+
+class PterodactylHTTPError(PterodactylError):
+    def __init__(self, response: PterodactylResponse):
+        super().__init__(f"HTTP Error: {response.status_code}")
+        self.response = response
+
+class PterodactylConnectionError(PterodactylError):
+    pass
+
+class PterodactylTimeoutError(PterodactylConnectionError):
+    pass
+
+class CredentialError(PterodactylError):
+    pass
+
+class PanelUnavailableError(PterodactylConnectionError):
+    pass
+
+ENCRYPTED_CREDENTIAL_PREFIX = "enc:"
+
+class CredentialStore:
+    FINGERPRINT_KEY = b"ptero-api-key-fingerprint"
+
+    def __init__(self, master_keys: typing.List[str], max_cached: int = 128):
+        self.max_cached = max_cached
+        self.stale = set()
+        self._plaintexts = collections.OrderedDict()
+        self._primary = Fernet(master_keys[0].encode()) if master_keys else None
+        self._fernet = MultiFernet([Fernet(key.encode()) for key in master_keys]) if master_keys else None
+
+    @property
+    def enabled(self) -> bool:
+        return self._fernet is not None
+
+    @staticmethod
+    def _digest(secret: str) -> str:
+        return hmac.new(CredentialStore.FINGERPRINT_KEY, secret.encode(), hashlib.sha256).hexdigest()[:24]
+
+    @staticmethod
+    def _split(stored: str) -> typing.Tuple[typing.Optional[str], str]:
+        # Sealed keys are "enc:<fingerprint>:<token>"; keys sealed by older versions lack the fingerprint.
+        fingerprint, _, token = stored[len(ENCRYPTED_CREDENTIAL_PREFIX):].rpartition(':')
+        return fingerprint or None, token
+
+    def has_fingerprint(self, stored: str) -> bool:
+        return not stored.startswith(ENCRYPTED_CREDENTIAL_PREFIX) or self._split(stored)[0] is not None
+
+    def seal(self, api_key: typing.Optional[str]) -> typing.Optional[str]:
+        if not self.enabled or not api_key or api_key.startswith(ENCRYPTED_CREDENTIAL_PREFIX): return api_key
+        return f"{ENCRYPTED_CREDENTIAL_PREFIX}{self._digest(api_key)}:{self._primary.encrypt(api_key.encode()).decode()}"
+
+    def reveal(self, stored: typing.Optional[str]) -> typing.Optional[str]:
+        if not stored or not stored.startswith(ENCRYPTED_CREDENTIAL_PREFIX): return stored
+        plaintext = self._plaintexts.get(stored)
+        metrics.cache_lookup('credential', plaintext is not None)
+        if plaintext is not None:
+            self._plaintexts.move_to_end(stored)
+            return plaintext
+        if not self.enabled: raise CredentialError("The stored API key is encrypted, but PTERO_MASTER_KEYS is not set.")
+        token = self._split(stored)[1].encode()
+        try: plaintext = self._primary.decrypt(token).decode()
+        except InvalidToken:
+            try: plaintext = self._fernet.decrypt(token).decode()
+            except InvalidToken: raise CredentialError("The stored API key cannot be decrypted with the configured master keys.")
+            self.stale.add(stored)
+        self._plaintexts[stored] = plaintext
+        while len(self._plaintexts) > self.max_cached:
+            self._plaintexts.popitem(last=False)
+        return plaintext
+
+    def fingerprint(self, stored: typing.Optional[str]) -> typing.Optional[str]:
+        # Ciphertext differs every time the same key is sealed, so caches shared between guilds key on this instead.
+        # It is stored next to the ciphertext so lookups never decrypt; older sealed keys get one on load (see reseal_guild_credentials).
+        if not stored: return None
+        if not stored.startswith(ENCRYPTED_CREDENTIAL_PREFIX): return self._digest(stored)
+        return self._split(stored)[0] or self._digest(stored)
+
+    def rotate(self, stored: str) -> str:
+        plaintext = self.reveal(stored)
+        self.stale.discard(stored)
+        rotated = f"{ENCRYPTED_CREDENTIAL_PREFIX}{self._split(stored)[0] or self._digest(plaintext)}:{self._primary.encrypt(plaintext.encode()).decode()}"
+        self._plaintexts.pop(stored, None)
+        self._plaintexts[rotated] = plaintext
+        return rotated
+
+    def mask(self, stored: str) -> str:
+        try: api_key = self.reveal(stored)
+        except CredentialError: return "(cannot be decrypted)"
+        masked_key = api_key[:4] + "..." + api_key[-4:] if len(api_key) > 8 else api_key
+        return f"{masked_key} (encrypted)" if stored.startswith(ENCRYPTED_CREDENTIAL_PREFIX) else masked_key
+
+try: credential_store = CredentialStore(MASTER_KEYS)
+except ValueError:
+    log_event('startup_failed', logging.CRITICAL, reason="PTERO_MASTER_KEYS must contain url-safe base64-encoded 32-byte Fernet keys")
+    exit()
+
+def panel_credential_key(guild_config: dict) -> tuple:
+    return (guild_config.get('panel_url'), credential_store.fingerprint(guild_config.get('api_key')))
+
+def reseal_guild_credentials(guild_config: dict) -> bool:
+    changed = False
+    for holder in [guild_config, *guild_config.get('panels', {}).values()]:
+        stored = holder.get('api_key')
+        if not stored: continue
+        if credential_store.enabled and not stored.startswith(ENCRYPTED_CREDENTIAL_PREFIX):
+            holder['api_key'] = credential_store.seal(stored); changed = True
+        elif stored in credential_store.stale or not credential_store.has_fingerprint(stored):
+            try: holder['api_key'] = credential_store.rotate(stored); changed = True
+            except CredentialError: pass
+    return changed
+
+class PanelRateLimiter:
+    def __init__(self, requests_per_minute: float = 720, burst: int = 60):
+        self.rate = requests_per_minute / 60
+        self.capacity = burst
+        self.tokens = float(burst)
+        self.updated_at = time.monotonic()
+        self.blocked_until = 0.0
+        self._lanes = {'read': asyncio.Lock(), 'write': asyncio.Lock()}
+
+    def _refill(self, now: float):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    async def acquire(self, lane: str):
+        async with self._lanes[lane]:
+            while True:
+                now = time.monotonic()
+                self._refill(now)
+                wait = self.blocked_until - now
+                if wait <= 0 and self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep(max(wait, (1 - self.tokens) / self.rate))
+
+    def update_from_headers(self, headers):
+        try:
+            if 'X-RateLimit-Limit' in headers:
+                limit = int(headers['X-RateLimit-Limit'])
+                self.rate = max(limit, 1) / 60
+                self.capacity = max(min(limit, self.capacity), 1)
+            if 'X-RateLimit-Remaining' in headers:
+                self._refill(time.monotonic())
+                self.tokens = min(self.tokens, float(headers['X-RateLimit-Remaining']))
+        except ValueError: pass
+
+    def block_for(self, seconds: float):
+        self.blocked_until = max(self.blocked_until, time.monotonic() + seconds)
+        self.tokens = 0.0
+
+class PanelHealth:
+    PROBE_PATH = "/api/client/account"
+
+    def __init__(self, panel_url: str, failure_threshold: int = 5, probe_interval: float = 5.0, max_probe_interval: float = 60.0):
+        self.panel_url = panel_url
+        self.failure_threshold = failure_threshold
+        self.probe_interval = probe_interval
+        self.max_probe_interval = max_probe_interval
+        self.state = 'closed'
+        self.consecutive_failures = 0
+        self.last_error = None
+        self.unreachable_since = None
+        self.last_success_at = None
+        self.guild_config = None
+        self._probe_task = None
+
+    def check(self):
+        if self.state == 'open':
+            metrics.inc('ptero_panel_fast_failures_total', panel=self.panel_url)
+            raise PanelUnavailableError(f"Panel {self.panel_url} unreachable since {time.strftime('%H:%M:%S UTC', time.gmtime(self.unreachable_since))} ({self.last_error}); retrying in the background.")
+
+    def record_success(self):
+        self.consecutive_failures = 0
+        self.last_success_at = time.time()
+        if self.state == 'open':
+            log_event('panel_circuit_closed', logging.WARNING, panel=self.panel_url, down_seconds=round(time.time() - self.unreachable_since, 1))
+            metrics.inc('ptero_panel_circuit_transitions_total', panel=self.panel_url, state='closed')
+        self.state = 'closed'; self.unreachable_since = None
+
+    def record_failure(self, reason: str, probe: typing.Callable):
+        self.consecutive_failures += 1
+        self.last_error = reason
+        if self.state == 'open' or self.consecutive_failures < self.failure_threshold: return
+        self.state = 'open'; self.unreachable_since = time.time()
+        log_event('panel_circuit_opened', logging.WARNING, panel=self.panel_url, failures=self.consecutive_failures, error=reason)
+        metrics.inc('ptero_panel_circuit_transitions_total', panel=self.panel_url, state='open')
+        if self._probe_task is None or self._probe_task.done():
+            self._probe_task = asyncio.create_task(self._probe_until_closed(probe))
+
+    async def _probe_until_closed(self, probe: typing.Callable):
+        interval = self.probe_interval
+        while self.state == 'open':
+            await asyncio.sleep(interval * random.uniform(0.8, 1.2))
+            if self.state != 'open' or self.guild_config is None: continue
+            try: await probe(self.guild_config, self.PROBE_PATH)
+            except PterodactylError: pass
+            interval = min(interval * 2, self.max_probe_interval)
+
+    def describe(self) -> str:
+        if self.state == 'open':
+            return f"🔴 Unreachable since <t:{int(self.unreachable_since)}:R> ({self.last_error})"
+        if self.consecutive_failures:
+            return f"🟡 {self.consecutive_failures} recent failure(s) ({self.last_error})"
+        if self.last_success_at:
+            return f"🟢 Healthy (last response <t:{int(self.last_success_at)}:R>)"
+        return "⚪ No requests yet"
+
+    def stop(self):
+        if self._probe_task: self._probe_task.cancel()
+
+def get_retry_after(headers, default: float) -> float:
+    try: return max(float(headers.get('Retry-After', default)), 0.0)
+    except ValueError: return default
+
+def jittered_backoff(attempt: int, base: float = 0.5, cap: float = 8.0) -> float:
+    return min(cap, base * (2 ** attempt)) * random.uniform(0.5, 1.5)
+
+class PterodactylClient:
+    RETRYABLE_GET_STATUSES = (429, 502, 503, 504)
+
+    def __init__(self, connections_per_panel: int = 20, keepalive_timeout: float = 60.0, max_retries: int = 3):
+        self.connections_per_panel = connections_per_panel
+        self.keepalive_timeout = keepalive_timeout
+        self.max_retries = max_retries
+        self._sessions = {}
+        self._rate_limiters = {}
+        self._health = {}
+        self._in_flight_gets = {}
+        self.total_gets = 0
+        self.coalesced_gets = 0
+
+    def _session_for(self, panel_url: str) -> aiohttp.ClientSession:
+        session = self._sessions.get(panel_url)
+        if session is None or session.closed:
+            connector = aiohttp.TCPConnector(limit=self.connections_per_panel, keepalive_timeout=self.keepalive_timeout, ttl_dns_cache=300)
+            session = aiohttp.ClientSession(connector=connector)
+            self._sessions[panel_url] = session
+        return session
+
+    def rate_limiter_for(self, guild_config: dict) -> PanelRateLimiter:
+        key = panel_credential_key(guild_config)
+        limiter = self._rate_limiters.get(key)
+        if limiter is None:
+            limiter = self._rate_limiters[key] = PanelRateLimiter()
+        return limiter
+
+    def health_for(self, panel_url: str) -> PanelHealth:
+        health = self._health.get(panel_url)
+        if health is None:
+            health = self._health[panel_url] = PanelHealth(panel_url)
+        return health
+
+    @staticmethod
+    def _is_node_error(response: PterodactylResponse) -> bool:
+        # The panel answers for an unreachable Wings node with its own JSON error (DaemonConnectionException); that says nothing about the panel.
+        # A bare 502/504 from a proxy in front of the panel does, so only these are exempt from the breaker.
+        try: errors = response.json().get('errors') or []
+        except (ValueError, AttributeError): return False
+        return any(isinstance(error, dict) and 'Daemon' in str(error.get('code', '')) for error in errors)
+
+    async def _probe(self, guild_config: dict, path: str):
+        await self.rate_limiter_for(guild_config).acquire('read')
+        response = await self._send('GET', guild_config, path, None, None, 10)
+        if response.status_code >= 500: raise PterodactylHTTPError(response)
+
+    async def _send(self, method: str, guild_config: dict, path: str, payload: typing.Optional[dict], params: typing.Optional[dict], timeout: float) -> PterodactylResponse:
+        panel_url = guild_config['panel_url']
+        session = self._session_for(panel_url)
+        endpoint = normalize_endpoint(path)
+        started = time.perf_counter()
+        try:
+            async with session.request(method, f"{panel_url}{path}", headers=get_api_headers(guild_config['api_key']), json=payload, params=params, timeout=aiohttp.ClientTimeout(total=timeout)) as resp:
+                response = PterodactylResponse(resp.status, resp.headers, await resp.text(errors='replace'))
+        except asyncio.TimeoutError:
+            self._record_failure(panel_url, method, endpoint, 'timeout', time.perf_counter() - started)
+            self.health_for(panel_url).record_failure(f"timed out after {timeout}s", self._probe)
+            raise PterodactylTimeoutError(f"Timed out after {timeout:.0f}s waiting for {panel_url}")
+        except aiohttp.ClientError as e:
+            self._record_failure(panel_url, method, endpoint, 'connection', time.perf_counter() - started)
+            self.health_for(panel_url).record_failure(f"connection failed: {e}", self._probe)
+            raise PterodactylConnectionError(f"Could not connect to {panel_url}: {e}")
+        if response.status_code >= 500 and not self._is_node_error(response): self.health_for(panel_url).record_failure(f"HTTP {response.status_code}", self._probe)
+        else: self.health_for(panel_url).record_success()
+        duration = time.perf_counter() - started
+        metrics.observe('ptero_panel_request_seconds', duration, method=method, endpoint=endpoint)
+        metrics.inc('ptero_panel_responses_total', panel=panel_url, status=response.status_code)
+        if response.status_code == 429 or response.status_code >= 500:
+            metrics.inc('ptero_panel_errors_total', panel=panel_url, kind='rate_limited' if response.status_code == 429 else 'server_error')
+        level = logging.WARNING if response.status_code >= 500 or duration > 2.0 else logging.DEBUG
+        log_event('panel_request', level, panel=panel_url, method=method, endpoint=endpoint, status=response.status_code, duration_ms=round(duration * 1000, 1))
+        return response
+
+    def _record_failure(self, panel_url: str, method: str, endpoint: str, kind: str, duration: float):
+        metrics.observe('ptero_panel_request_seconds', duration, method=method, endpoint=endpoint)
+        metrics.inc('ptero_panel_errors_total', panel=panel_url, kind=kind)
+        log_event('panel_request_failed', logging.WARNING, panel=panel_url, method=method, endpoint=endpoint, kind=kind, duration_ms=round(duration * 1000, 1))
+
+    async def request(self, method: str, guild_config: dict, path: str, *, payload: typing.Optional[dict] = None, params: typing.Optional[dict] = None, timeout: float = 10) -> PterodactylResponse:
+        is_read = method == 'GET'
+        limiter = self.rate_limiter_for(guild_config)
+        health = self.health_for(guild_config['panel_url'])
+        health.guild_config = guild_config
+        # Retries share the caller's timeout, so a struggling panel cannot stretch one request past it.
+        deadline = time.monotonic() + timeout
+        can_retry = lambda attempt, delay: attempt < self.max_retries and time.monotonic() + delay < deadline and health.state != 'open'
+        for attempt in range(self.max_retries + 1):
+            health.check()
+            await limiter.acquire('read' if is_read else 'write')
+            try:
+                response = await self._send(method, guild_config, path, payload, params, timeout if attempt == 0 else max(deadline - time.monotonic(), 1.0))
+            except PterodactylTimeoutError:
+                raise
+            except PterodactylConnectionError:
+                backoff = jittered_backoff(attempt)
+                if is_read and can_retry(attempt, backoff):
+                    await asyncio.sleep(backoff)
+                    continue
+                raise
+            limiter.update_from_headers(response.headers)
+            if response.status_code == 429:
+                retry_after = get_retry_after(response.headers, jittered_backoff(attempt))
+                limiter.block_for(retry_after)
+                if can_retry(attempt, retry_after): continue
+            elif is_read and response.status_code in self.RETRYABLE_GET_STATUSES:
+                backoff = jittered_backoff(attempt)
+                if can_retry(attempt, backoff):
+                    await asyncio.sleep(backoff)
+                    continue
+            break
+        if response.status_code >= 400:
+            raise PterodactylHTTPError(response)
+        return response
+
+    def forget_credentials(self, credential_keys: typing.Iterable[tuple]):
+        for key in credential_keys:
+            self._rate_limiters.pop(key, None)
+
+    def _forget_in_flight_get(self, key: tuple, future: asyncio.Future):
+        if self._in_flight_gets.get(key) is future:
+            del self._in_flight_gets[key]
+        if not future.cancelled(): future.exception()
+
+    async def get(self, guild_config: dict, path: str, **kwargs) -> PterodactylResponse:
+        key = (*panel_credential_key(guild_config), path, tuple(sorted((kwargs.get('params') or {}).items())))
+        self.total_gets += 1
+        metrics.inc('ptero_panel_gets_total')
+        future = self._in_flight_gets.get(key)
+        metrics.cache_lookup('panel_get_singleflight', future is not None)
+        if future is not None:
+            self.coalesced_gets += 1
+            metrics.inc('ptero_panel_gets_coalesced_total')
+        else:
+            future = asyncio.ensure_future(self.request('GET', guild_config, path, **kwargs))
+            self._in_flight_gets[key] = future
+            future.add_done_callback(lambda done: self._forget_in_flight_get(key, done))
+        return await asyncio.shield(future)
+
+    async def post(self, guild_config: dict, path: str, **kwargs) -> PterodactylResponse:
+        return await self.request('POST', guild_config, path, **kwargs)
+
+    async def close_panel(self, panel_url: str):
+        self.forget_credentials([key for key in self._rate_limiters if key[0] == panel_url])
+        health = self._health.pop(panel_url, None)
+        if health: health.stop()
+        session = self._sessions.pop(panel_url, None)
+        if session and not session.closed:
+            await session.close()
+
+    async def close(self):
+        for panel_url in list(self._sessions.keys() | self._health.keys()):
+            await self.close_panel(panel_url)
+
+ptero_client = PterodactylClient()
+
+class ServerNameCache:
+    def __init__(self, ttl: float = 600.0, negative_ttl: float = 60.0, max_entries: int = 5000):
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.max_entries = max_entries
+        self._entries = collections.OrderedDict()
+
+    def get(self, guild_config: dict, server_uuid: str) -> typing.Tuple[bool, typing.Optional[str]]:
+        # Keyed per API key as well: another guild's key may not see the server, or may see it when this one gets a 404.
+        key = (*panel_credential_key(guild_config), server_uuid)
+        entry = self._entries.get(key)
+        if entry is None: return False, None
+        name, expires_at = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            return False, None
+        self._entries.move_to_end(key)
+        return True, name
+
+    def _store(self, guild_config: dict, server_uuid: str, name: typing.Optional[str], ttl: float):
+        key = (*panel_credential_key(guild_config), server_uuid)
+        self._entries[key] = (name, time.monotonic() + ttl)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def put(self, guild_config: dict, server_uuid: str, name: str):
+        self._store(guild_config, server_uuid, name, self.ttl)
+
+    def put_missing(self, guild_config: dict, server_uuid: str):
+        self._store(guild_config, server_uuid, None, self.negative_ttl)
+
+    def invalidate_panel(self, panel_url: typing.Optional[str]):
+        if not panel_url: return
+        for key in [key for key in self._entries if key[0] == panel_url]:
+            del self._entries[key]
+
+server_name_cache = ServerNameCache()
+
+HISTORY_FIELDS = ('cpu', 'memory', 'disk', 'rx_rate', 'tx_rate')
+HISTORY_TIERS = {'1h': (60, 60), '48h': (3600, 48), '30d': (86400, 30)}
+SPARKLINE_BLOCKS = "▁▂▃▄▅▆▇█"
+
+class HistoryTier:
+    def __init__(self, resolution: int, slots: int):
+        self.resolution = resolution
+        self.slots = slots
+        self.bucket_ids = array.array('q', [-1]) * slots
+        # Counted per field: network rates are missing for the first sample and after a counter reset.
+        self.counts = array.array('I', [0]) * (slots * len(HISTORY_FIELDS))
+        self.sums = array.array('d', [0.0]) * (slots * len(HISTORY_FIELDS))
+
+    def add(self, timestamp: float, values: typing.Sequence[typing.Optional[float]]):
+        bucket_id = int(timestamp // self.resolution)
+        slot = bucket_id % self.slots
+        offset = slot * len(HISTORY_FIELDS)
+        if self.bucket_ids[slot] != bucket_id:
+            self.bucket_ids[slot] = bucket_id
+            for field_index in range(len(HISTORY_FIELDS)): self.counts[offset + field_index] = 0; self.sums[offset + field_index] = 0.0
+        for field_index, value in enumerate(values):
+            if value is not None: self.counts[offset + field_index] += 1; self.sums[offset + field_index] += value
+
+    def series(self, field_index: int, now: float) -> typing.List[typing.Optional[float]]:
+        current_bucket_id = int(now // self.resolution)
+        values = []
+        for bucket_id in range(current_bucket_id - self.slots + 1, current_bucket_id + 1):
+            index = bucket_id % self.slots * len(HISTORY_FIELDS) + field_index
+            if self.bucket_ids[bucket_id % self.slots] == bucket_id and self.counts[index]:
+                values.append(self.sums[index] / self.counts[index])
+            else:
+                values.append(None)
+        return values
+
+class ServerHistory:
+    def __init__(self):
+        self.tiers = {name: HistoryTier(resolution, slots) for name, (resolution, slots) in HISTORY_TIERS.items()}
+        self.last_counters = None
+
+    def record(self, timestamp: float, resources: dict):
+        network = resources.get('network', {})
+        rx_bytes = network.get('rx_bytes', resources.get('network_rx_bytes', 0)); tx_bytes = network.get('tx_bytes', resources.get('network_tx_bytes', 0))
+        rx_rate = tx_rate = None
+        if self.last_counters is not None:
+            last_timestamp, last_rx_bytes, last_tx_bytes = self.last_counters
+            elapsed = timestamp - last_timestamp
+            # Counters reset when the server restarts; skip that interval instead of recording a negative rate.
+            if elapsed > 0 and rx_bytes >= last_rx_bytes and tx_bytes >= last_tx_bytes:
+                rx_rate = (rx_bytes - last_rx_bytes) / elapsed; tx_rate = (tx_bytes - last_tx_bytes) / elapsed
+        self.last_counters = (timestamp, rx_bytes, tx_bytes)
+        values = (resources.get('cpu_absolute', 0.0), resources.get('memory_bytes', 0) / (1024**2), resources.get('disk_bytes', 0) / (1024**2), rx_rate, tx_rate)
+        for tier in self.tiers.values(): tier.add(timestamp, values)
+
+class ResourceHistory:
+    def __init__(self, max_servers: int = 500):
+        self.max_servers = max_servers
+        self._servers = collections.OrderedDict()
+
+    def record(self, panel_url: str, server_uuid: str, snapshot: dict, timestamp: typing.Optional[float] = None):
+        resources = snapshot.get('attributes', {}).get('resources')
+        if resources is None: return
+        key = (panel_url, server_uuid)
+        history = self._servers.get(key)
+        if history is None:
+            history = self._servers[key] = ServerHistory()
+            while len(self._servers) > self.max_servers:
+                self._servers.popitem(last=False)
+        self._servers.move_to_end(key)
+        history.record(time.time() if timestamp is None else timestamp, resources)
+
+    def get(self, panel_url: str, server_uuid: str) -> typing.Optional[ServerHistory]:
+        return self._servers.get((panel_url, server_uuid))
+
+resource_history = ResourceHistory()
+
+def render_sparkline(values: typing.Sequence[typing.Optional[float]]) -> str:
+    present = [value for value in values if value is not None]
+    if not present: return ""
+    low = min(present); span = max(present) - low
+    return "".join(" " if value is None else SPARKLINE_BLOCKS[int((value - low) / span * (len(SPARKLINE_BLOCKS) - 1)) if span else 0] for value in values)
+
+def format_byte_rate(bytes_per_second: float) -> str:
+    for unit in ('B/s', 'KB/s', 'MB/s'):
+        if bytes_per_second < 1024: return f"{bytes_per_second:.1f} {unit}"
+        bytes_per_second /= 1024
+    return f"{bytes_per_second:.1f} GB/s"
+
+class ResourcePollTarget:
+    def __init__(self, panel_url: str, api_key: str, server_uuid: str):
+        self.guild_config = {'panel_url': panel_url, 'api_key': api_key}
+        self.server_uuid = server_uuid
+        self.request_times = collections.deque(maxlen=64)
+        self.last_requested = float('-inf')
+        self.snapshot = None
+        self.fetched_at = 0.0
+        self.next_refresh = 0.0
+        self.in_flight = None
+
+class ResourcePoller:
+    def __init__(self, fresh_for: float = 10.0, min_interval: float = 5.0, max_interval: float = 60.0, interest_ttl: float = 300.0, max_concurrent_refreshes: int = 10):
+        self.fresh_for = fresh_for
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.interest_ttl = interest_ttl
+        self.max_concurrent_refreshes = max_concurrent_refreshes
+        self._targets = {}
+        self._default_servers = {}
+        self._task = None
+
+    def _target_for(self, key: tuple, panel_url: str, api_key: str, server_uuid: str) -> ResourcePollTarget:
+        target = self._targets.get(key)
+        if target is None:
+            target = self._targets[key] = ResourcePollTarget(panel_url, api_key, server_uuid)
+        return target
+
+    def _target(self, guild_config: dict, server_uuid: str) -> ResourcePollTarget:
+        return self._target_for((*panel_credential_key(guild_config), server_uuid), guild_config['panel_url'], guild_config['api_key'], server_uuid)
+
+    def _interval_for(self, target: ResourcePollTarget, now: float) -> float:
+        recent_requests = sum(1 for requested_at in target.request_times if now - requested_at < 60)
+        return max(self.min_interval, self.max_interval / (1 + recent_requests))
+
+    async def _refresh(self, target: ResourcePollTarget) -> dict:
+        if target.in_flight is None:
+            target.in_flight = asyncio.ensure_future(ptero_client.get(target.guild_config, f"/api/client/servers/{target.server_uuid}/resources", timeout=10))
+            target.in_flight.add_done_callback(lambda future: self._store(target, future))
+        response = await asyncio.shield(target.in_flight)
+        return response.json()
+
+    def _store(self, target: ResourcePollTarget, future: asyncio.Future):
+        target.in_flight = None
+        now = time.monotonic()
+        if future.cancelled() or future.exception() is not None:
+            target.next_refresh = now + self.max_interval
+            return
+        target.snapshot = future.result().json()
+        target.fetched_at = now
+        resource_history.record(target.guild_config['panel_url'], target.server_uuid, target.snapshot)
+        target.next_refresh = now + self._interval_for(target, now)
+
+    async def get(self, guild_config: dict, server_uuid: str, max_age: typing.Optional[float] = None, track: bool = True) -> typing.Tuple[dict, float]:
+        target = self._target(guild_config, server_uuid)
+        now = time.monotonic()
+        if track:
+            target.request_times.append(now)
+            target.last_requested = now
+        max_age = self.fresh_for if max_age is None else max_age
+        is_fresh = target.snapshot is not None and now - target.fetched_at <= max_age
+        metrics.cache_lookup('resource_snapshot', is_fresh)
+        if is_fresh:
+            return target.snapshot, now - target.fetched_at
+        data = await self._refresh(target)
+        return data, time.monotonic() - target.fetched_at
+
+    def invalidate_panel(self, panel_url: typing.Optional[str]):
+        for key in [key for key in self._targets if key[0] == panel_url]:
+            del self._targets[key]
+
+    def track_default_server(self, guild_id_str: str, guild_config: typing.Optional[dict]):
+        # Called wherever a guild's panel, key or default server changes, so sweeps only touch guilds that have a default.
+        server_uuid = (guild_config or {}).get('default_pterodactyl_server_uuid')
+        if server_uuid and guild_config.get('panel_url') and guild_config.get('api_key'):
+            self._default_servers[guild_id_str] = ((*panel_credential_key(guild_config), server_uuid), guild_config['panel_url'], guild_config['api_key'], server_uuid)
+        else: self._default_servers.pop(guild_id_str, None)
+
+    def _track_default_servers(self, now: float):
+        for key, panel_url, api_key, server_uuid in self._default_servers.values():
+            self._target_for(key, panel_url, api_key, server_uuid).last_requested = now
+
+    async def _refresh_quietly(self, target: ResourcePollTarget, semaphore: asyncio.Semaphore):
+        async with semaphore:
+            try: await self._refresh(target)
+            except Exception: pass
+
+    def _sweep(self, now: float, semaphore: asyncio.Semaphore):
+        self._track_default_servers(now)
+        for key, target in list(self._targets.items()):
+            # Untracked lookups (e.g. /ptero overview) keep their snapshot cached for reuse but are never polled.
+            if now - max(target.last_requested, target.fetched_at) > self.interest_ttl:
+                del self._targets[key]
+            elif target.in_flight is None and now >= target.next_refresh and now - target.last_requested <= self.interest_ttl:
+                target.next_refresh = now + self.min_interval
+                create_background_task(self._refresh_quietly(target, semaphore))
+
+    async def _run(self):
+        semaphore = asyncio.Semaphore(self.max_concurrent_refreshes)
+        while True:
+            self._sweep(time.monotonic(), semaphore)
+            await asyncio.sleep(1)
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            self._task = None
+
+resource_poller = ResourcePoller()
+
+ANSI_ESCAPE_PATTERN = re.compile(r'\x1b\[[0-9;?]*[A-Za-z]')
+
+class ServerConsoleStream:
+    def __init__(self, manager, guild_config: dict, server_uuid: str):
+        self.manager = manager
+        self.guild_config = {'panel_url': guild_config['panel_url'], 'api_key': guild_config['api_key']}
+        self.server_uuid = server_uuid
+        self.listeners = set()
+        self.state = None
+        self.stats = None
+        self.console_lines = collections.deque(maxlen=50)
+        self.error = None
+        self.closed = False
+        self.ready = asyncio.Event()
+        self._ws = None
+        self._task = None
+        self._idle_handle = None
+
+    async def _fetch_credentials(self) -> dict:
+        response = await ptero_client.get(self.guild_config, f"/api/client/servers/{self.server_uuid}/websocket", timeout=10)
+        return response.json().get('data', {})
+
+    def _dispatch(self, event: str, args: list):
+        for listener in list(self.listeners):
+            try: listener(event, args)
+            except Exception as e: log_event('console_listener_failed', logging.ERROR, server=self.server_uuid, error=str(e))
+
+    async def _handle_message(self, ws, message: dict):
+        event = message.get('event'); args = message.get('args') or []
+        if event == 'auth success':
+            self.error = None
+            self.ready.set()
+            await ws.send_json({'event': 'send stats', 'args': [None]})
+            await ws.send_json({'event': 'send logs', 'args': [None]})
+        elif event == 'token expiring':
+            credentials = await self._fetch_credentials()
+            await ws.send_json({'event': 'auth', 'args': [credentials.get('token')]})
+        elif event == 'token expired':
+            await ws.close()
+        elif event == 'stats' and args:
+            try: self.stats = json.loads(args[0])
+            except (TypeError, json.JSONDecodeError): return
+            self.state = self.stats.get('state', self.state)
+        elif event == 'status' and args:
+            self.state = args[0]
+        elif event in ('console output', 'install output', 'daemon message') and args:
+            self.console_lines.append(ANSI_ESCAPE_PATTERN.sub('', str(args[0])).rstrip())
+        elif event == 'jwt error':
+            self.error = f"Websocket authentication failed: {args[0] if args else 'unknown error'}"
+        self._dispatch(event, args)
+
+    async def _run(self):
+        retry_delay = 1.0
+        while self.listeners:
+            try:
+                credentials = await self._fetch_credentials()
+                session = ptero_client._session_for(self.guild_config['panel_url'])
+                async with session.ws_connect(credentials['socket'], origin=self.guild_config['panel_url'], heartbeat=30) as ws:
+                    self._ws = ws
+                    await ws.send_json({'event': 'auth', 'args': [credentials['token']]})
+                    retry_delay = 1.0
+                    async for msg in ws:
+                        if msg.type != aiohttp.WSMsgType.TEXT: continue
+                        try: message = json.loads(msg.data)
+                        except json.JSONDecodeError: continue
+                        await self._handle_message(ws, message)
+            except asyncio.CancelledError:
+                raise
+            except PterodactylHTTPError as errh:
+                self.error = f"HTTP Error {errh.response.status_code} while opening the console websocket."
+            except Exception as e:
+                self.error = f"Console websocket error: {e}"
+            finally:
+                self._ws = None
+                self.ready.clear()
+            if self.error:
+                self._dispatch('error', [self.error])
+            await asyncio.sleep(retry_delay)
+            retry_delay = min(retry_delay * 2, 60.0)
+
+    def add_listener(self, listener):
+        self.listeners.add(listener)
+        if self._idle_handle:
+            self._idle_handle.cancel()
+            self._idle_handle = None
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    def remove_listener(self, listener):
+        self.listeners.discard(listener)
+        if not self.listeners and self._idle_handle is None and not self.closed:
+            self._idle_handle = asyncio.get_running_loop().call_later(self.manager.idle_timeout, lambda: create_background_task(self.manager.close_stream(self)))
+
+    async def wait_ready(self, timeout: float = 10.0) -> bool:
+        try:
+            await asyncio.wait_for(self.ready.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+    async def send_command(self, command: str):
+        if self._ws is None or self._ws.closed:
+            raise PterodactylConnectionError("Console websocket is not connected.")
+        await self._ws.send_json({'event': 'send command', 'args': [command]})
+
+    async def close(self, reason: str = "The console stream was closed."):
+        self.closed = True
+        if self.listeners:
+            # Watches, scripts and power waits still attached would otherwise wait on a stream that never delivers again.
+            self.error = reason
+            self._dispatch('stream closed', [reason])
+            self.listeners.clear()
+        if self._idle_handle:
+            self._idle_handle.cancel()
+            self._idle_handle = None
+        if self._task:
+            self._task.cancel()
+            self._task = None
+
+class ConsoleStreamManager:
+    def __init__(self, idle_timeout: float = 30.0):
+        self.idle_timeout = idle_timeout
+        self._streams = {}
+
+    def get_stream(self, guild_config: dict, server_uuid: str) -> ServerConsoleStream:
+        key = (*panel_credential_key(guild_config), server_uuid)
+        stream = self._streams.get(key)
+        if stream is None:
+            stream = self._streams[key] = ServerConsoleStream(self, guild_config, server_uuid)
+        return stream
+
+    async def close_stream(self, stream: ServerConsoleStream):
+        if stream.listeners: return
+        key = (*panel_credential_key(stream.guild_config), stream.server_uuid)
+        if self._streams.get(key) is stream: del self._streams[key]
+        await stream.close()
+
+    async def close_panel(self, panel_url: typing.Optional[str]):
+        for key in [key for key in self._streams if key[0] == panel_url]:
+            await self._streams.pop(key).close(f"The panel {panel_url} was removed from the configuration.")
+
+    async def close(self):
+        for stream in list(self._streams.values()):
+            await stream.close("The bot is shutting down.")
+        self._streams.clear()
+
+console_streams = ConsoleStreamManager()
 
 async def resolve_server_identifier(guild_config: dict, identifier: str) -> typing.Optional[str]:
     if not identifier: return None
@@ -67,25 +1258,102 @@ async def resolve_server_identifier(guild_config: dict, identifier: str) -> typi
         return guild_config['server_aliases'].get(identifier.lower(), identifier)
     return identifier
 
+class ConfigsNotReady(app_commands.CheckFailure):
+    pass
+
+class PteroCommandTree(app_commands.CommandTree):
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        if interaction.type is discord.InteractionType.autocomplete:
+            if configs_ready.is_set() and config_load_error is None: return True
+            await interaction.response.autocomplete([])
+            return False
+        interaction.extras['ptero_started_at'] = time.perf_counter()
+        metrics.observe('ptero_command_dispatch_seconds', max((discord.utils.utcnow() - interaction.created_at).total_seconds(), 0.0))
+        if not configs_ready.is_set():
+            try: await asyncio.wait_for(configs_ready.wait(), timeout=2.5)
+            except asyncio.TimeoutError: raise ConfigsNotReady("Guild configurations are still loading.")
+        if config_load_error is not None: raise ConfigsNotReady("Guild configurations failed to load.")
+        return True
+
 intents = discord.Intents.default()
 intents.guilds = True
-bot = commands.Bot(command_prefix="§", intents=intents)
+if SHARD_COUNT or os.getenv('PTERO_SHARDED', '').lower() in ('1', 'true', 'yes'):
+    bot = commands.AutoShardedBot(command_prefix="§", intents=intents, tree_cls=PteroCommandTree, shard_count=SHARD_COUNT, shard_ids=SHARD_IDS)
+else:
+    bot = commands.Bot(command_prefix="§", intents=intents, tree_cls=PteroCommandTree)
+
+def record_command_finished(interaction: discord.Interaction, command_name: str, outcome: str):
+    started_at = interaction.extras.get('ptero_started_at')
+    if started_at is None: return
+    duration = time.perf_counter() - started_at
+    metrics.observe('ptero_command_seconds', duration, command=command_name)
+    metrics.inc('ptero_commands_total', command=command_name, outcome=outcome)
+    log_event('command', logging.INFO, command=command_name, outcome=outcome, guild=interaction.guild_id, duration_ms=round(duration * 1000, 1))
 
 @bot.event
-async def on_ready():
-    await load_all_guild_configs()
-    print(f'Bot logged in as {bot.user.name} (ID: {bot.user.id})')
-    print(f'Bot is on {len(bot.guilds)} guilds.')
+async def on_app_command_completion(interaction: discord.Interaction, command: typing.Union[app_commands.Command, app_commands.ContextMenu]):
+    record_command_finished(interaction, command.qualified_name, 'ok')
+
+COMMAND_SYNC_STATE_FILE = "ptero_command_sync.json"
+startup_completed = False
+
+def get_command_tree_hash() -> str:
+    payload = json.dumps([command.to_dict(bot.tree) for command in bot.tree.get_commands()], sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+def read_command_sync_state() -> dict:
+    try:
+        with open(COMMAND_SYNC_STATE_FILE, 'r') as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+async def sync_commands_if_changed():
+    loop = asyncio.get_running_loop()
+    tree_hash = get_command_tree_hash()
+    state = await loop.run_in_executor(None, read_command_sync_state)
+    if state.get(str(bot.application_id)) == tree_hash:
+        log_event('commands_sync_skipped', reason="unchanged since last sync")
+        return
     try:
         synced = await bot.tree.sync()
-        print(f"Synchronized {len(synced)} slash commands.")
+        log_event('commands_synced', commands=len(synced))
     except Exception as e:
-        print(f"Error synchronizing slash commands: {e}")
-    print('------')
-    print("Bot is ready. Administrators on each guild must configure Pterodactyl integration.")
+        log_event('commands_sync_failed', logging.ERROR, error=str(e))
+        return
+    state[str(bot.application_id)] = tree_hash
+    try: await loop.run_in_executor(None, write_file_atomically, COMMAND_SYNC_STATE_FILE, json.dumps(state))
+    except OSError as e: log_event('commands_sync_state_save_failed', logging.WARNING, error=str(e))
+
+@bot.event
+async def on_ready():
+    global startup_completed
+    if startup_completed:
+        log_event('bot_reconnected', user=bot.user.name, user_id=bot.user.id)
+        return
+    startup_completed = True
+    log_event('bot_logged_in', user=bot.user.name, user_id=bot.user.id, guilds=len(bot.guilds))
+    await sync_commands_if_changed()
+    await configs_ready.wait()
+    if config_load_error is not None:
+        log_event('background_tasks_not_started', logging.ERROR, reason="guild configurations failed to load; fix the storage and restart the bot")
+        return
+    resource_poller.start()
+    queue_engine.start()
+    action_scheduler.start()
+    config_reloader.start()
+    ready_seconds = time.perf_counter() - PROCESS_STARTED_AT
+    metrics.set_gauge('ptero_startup_ready_seconds', ready_seconds)
+    log_event('startup_ready', logging.INFO, ready_seconds=round(ready_seconds, 3), guilds=len(bot.guilds))
 
 ptero_group = app_commands.Group(name="ptero", description="Commands for managing Pterodactyl servers")
 
+def invalidate_panel_caches(panel_url: typing.Optional[str]):
+    server_name_cache.invalidate_panel(panel_url)
+    resource_poller.invalidate_panel(panel_url)
+    server_list_page_cache.invalidate_panel(panel_url)
+    server_index.invalidate_panel(panel_url)
+
 def ensure_guild_config_structure(guild_id_str: str):
     if guild_id_str not in ALL_GUILD_CONFIGS:
         ALL_GUILD_CONFIGS[guild_id_str] = {}
@@ -102,8 +1370,13 @@ def ensure_guild_config_structure(guild_id_str: str):
 async def ptero_set_api(interaction: discord.Interaction, api_key: str):
     guild_id_str = str(interaction.guild.id)
     ensure_guild_config_structure(guild_id_str)
-    ALL_GUILD_CONFIGS[guild_id_str]['api_key'] = api_key
-    await save_all_guild_configs()
+    previous_credentials = get_panel_credentials(ALL_GUILD_CONFIGS[guild_id_str])
+    ALL_GUILD_CONFIGS[guild_id_str]['api_key'] = credential_store.seal(api_key)
+    release_unused_credentials(previous_credentials)
+    invalidate_panel_caches(ALL_GUILD_CONFIGS[guild_id_str].get('panel_url'))
+    server_index.invalidate_guild(guild_id_str)
+    resource_poller.track_default_server(guild_id_str, ALL_GUILD_CONFIGS[guild_id_str])
+    save_guild_config(guild_id_str)
     await interaction.response.send_message(f"✅ Pterodactyl API key for guild **{interaction.guild.name}** has been set.", ephemeral=True)
 
 @ptero_group.command(name="set_url", description="Sets the Pterodactyl panel URL for this guild.")
@@ -116,10 +1389,145 @@ async def ptero_set_url(interaction: discord.Interaction, panel_url: str):
         await interaction.response.send_message("❌ Invalid URL format. URL should start with `http://` or `https://`.", ephemeral=True)
         return
     ensure_guild_config_structure(guild_id_str)
+    invalidate_panel_caches(ALL_GUILD_CONFIGS[guild_id_str].get('panel_url'))
+    server_index.invalidate_guild(guild_id_str)
+    previous_credentials = get_panel_credentials(ALL_GUILD_CONFIGS[guild_id_str])
     ALL_GUILD_CONFIGS[guild_id_str]['panel_url'] = panel_url.rstrip('/')
-    await save_all_guild_configs()
+    release_unused_credentials(previous_credentials)
+    server_name_cache.invalidate_panel(ALL_GUILD_CONFIGS[guild_id_str]['panel_url'])
+    resource_poller.track_default_server(guild_id_str, ALL_GUILD_CONFIGS[guild_id_str])
+    save_guild_config(guild_id_str)
     await interaction.response.send_message(f"✅ Pterodactyl panel URL for guild **{interaction.guild.name}** has been set to: `{ALL_GUILD_CONFIGS[guild_id_str]['panel_url']}`", ephemeral=True)
 
+MAX_PANELS_PER_GUILD = 10
+PANEL_NAME_PATTERN = re.compile(r'^[a-z0-9][a-z0-9_-]{0,31}$')
+
+panel_group = app_commands.Group(name="panel", description="Manage additional Pterodactyl panels", parent=ptero_group)
+
+def get_guild_panels(guild_config: typing.Optional[dict]) -> typing.List[typing.Tuple[str, dict]]:
+    if not guild_config: return []
+    panels = []
+    if guild_config.get('panel_url') and guild_config.get('api_key'):
+        panels.append(('default', {'panel_url': guild_config['panel_url'], 'api_key': guild_config['api_key']}))
+    panels.extend(sorted(guild_config.get('panels', {}).items()))
+    return panels
+
+@panel_group.command(name="add", description="Registers an additional Pterodactyl panel for fleet commands.")
+@app_commands.describe(name="Short name for the panel (e.g., 'eu-1')", panel_url="Full URL of the panel (e.g., https://panel.example.com)", api_key="Client API key for that panel")
+@app_commands.checks.has_permissions(administrator=True)
+@app_commands.guild_only()
+async def ptero_add_panel(interaction: discord.Interaction, name: str, panel_url: str, api_key: str):
+    guild_id_str = str(interaction.guild.id)
+    name = name.lower()
+    if not PANEL_NAME_PATTERN.match(name) or name == 'default':
+        await interaction.response.send_message("❌ Invalid panel name. Use up to 32 lowercase letters, digits, `-` or `_` (`default` is reserved for the main panel).", ephemeral=True)
+        return
+    if not (panel_url.startswith('http://') or panel_url.startswith('https://')):
+        await interaction.response.send_message("❌ Invalid URL format. URL should start with `http://` or `https://`.", ephemeral=True)
+        return
+    ensure_guild_config_structure(guild_id_str)
+    panels = ALL_GUILD_CONFIGS[guild_id_str].setdefault('panels', {})
+    if name not in panels and len(panels) >= MAX_PANELS_PER_GUILD:
+        await interaction.response.send_message(f"❌ This guild already has {MAX_PANELS_PER_GUILD} additional panels. Remove one with `/ptero panel remove` first.", ephemeral=True)
+        return
+    previous = panels.get(name)
+    if previous: invalidate_panel_caches(previous['panel_url'])
+    panels[name] = {'panel_url': panel_url.rstrip('/'), 'api_key': credential_store.seal(api_key)}
+    if previous: release_unused_credentials({panel_credential_key(previous)})
+    server_index.invalidate_guild(guild_id_str)
+    save_guild_config(guild_id_str)
+    await interaction.response.send_message(f"✅ Panel `{name}` ({panels[name]['panel_url']}) has been {'updated' if previous else 'added'}.", ephemeral=True)
+
+@panel_group.command(name="remove", description="Removes an additional Pterodactyl panel.")
+@app_commands.describe(name="Name of the panel to remove")
+@app_commands.checks.has_permissions(administrator=True)
+@app_commands.guild_only()
+async def ptero_remove_panel(interaction: discord.Interaction, name: str):
+    guild_id_str = str(interaction.guild.id)
+    panels = ALL_GUILD_CONFIGS.get(guild_id_str, {}).get('panels', {})
+    panel = panels.pop(name.lower(), None)
+    if panel is None:
+        await interaction.response.send_message(f"❌ Panel `{name}` not found.", ephemeral=True)
+        return
+    invalidate_panel_caches(panel['panel_url'])
+    release_unused_credentials({panel_credential_key(panel)})
+    server_index.invalidate_guild(guild_id_str)
+    save_guild_config(guild_id_str)
+    await interaction.response.send_message(f"✅ Panel `{name.lower()}` has been removed.", ephemeral=True)
+
+CONFIG_RELOAD_INTERVAL = float(os.getenv('PTERO_CONFIG_RELOAD_SECONDS', '5'))
+
+def get_panel_credentials(guild_config: typing.Optional[dict]) -> typing.Set[typing.Tuple[str, str]]:
+    return {panel_credential_key(panel) for _, panel in get_guild_panels(guild_config)}
+
+def release_unused_credentials(credential_keys: typing.Set[tuple]):
+    if not credential_keys: return
+    in_use = set().union(*(get_panel_credentials(guild_config) for guild_config in ALL_GUILD_CONFIGS.values()))
+    ptero_client.forget_credentials(credential_keys - in_use)
+
+def apply_guild_config_change(guild_id_str: str, old_config: typing.Optional[dict], new_config: typing.Optional[dict]) -> typing.Set[tuple]:
+    old_panels = get_panel_credentials(old_config)
+    old_schedules = dict((old_config or {}).get('schedules', {}))
+    if new_config is None:
+        ALL_GUILD_CONFIGS.pop(guild_id_str, None)
+    else:
+        if old_config is None: ALL_GUILD_CONFIGS[guild_id_str] = new_config
+        else:
+            # Commands still running hold the old dict; updating it in place keeps the changes they make after the reload.
+            old_config.clear(); old_config.update(new_config)
+            new_config = old_config
+        if reseal_guild_credentials(new_config): save_guild_config(guild_id_str)
+    server_index.invalidate_guild(guild_id_str)
+    new_panels = get_panel_credentials(new_config)
+    for panel_url in {panel_url for panel_url, _ in old_panels ^ new_panels}:
+        invalidate_panel_caches(panel_url)
+    resource_poller.track_default_server(guild_id_str, new_config)
+    for job in (new_config or {}).get('schedules', {}).values():
+        if old_schedules.get(job['id'], {}).get('next_run') != job['next_run']: action_scheduler.schedule(guild_id_str, job)
+    return old_panels - new_panels
+
+async def apply_reloaded_guild_configs(configs: dict, dirty: set):
+    changed_guilds = 0; released_credentials = set()
+    for position, guild_id_str in enumerate(set(ALL_GUILD_CONFIGS) | set(configs)):
+        if position % 500 == 499: await asyncio.sleep(0)
+        if guild_id_str in dirty: continue
+        new_config = configs.get(guild_id_str)
+        if new_config is not None: normalize_guild_config(new_config)
+        old_config = ALL_GUILD_CONFIGS.get(guild_id_str)
+        if new_config == old_config: continue
+        released_credentials |= apply_guild_config_change(guild_id_str, old_config, new_config)
+        changed_guilds += 1
+    if not changed_guilds: return
+    release_unused_credentials(released_credentials)
+    released_panels = {panel_url for panel_url, _ in released_credentials}
+    panels_in_use = {panel_url for guild_config in ALL_GUILD_CONFIGS.values() for panel_url, _ in get_panel_credentials(guild_config)}
+    for panel_url in released_panels - panels_in_use:
+        await console_streams.close_panel(panel_url)
+        await ptero_client.close_panel(panel_url)
+    log_event('guild_configs_reloaded', guilds=changed_guilds, closed_panels=len(released_panels - panels_in_use))
+
+class ConfigReloader:
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._task = None
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            try: await guild_config_persistence.reload(apply_reloaded_guild_configs)
+            except (OSError, ValueError, sqlite3.Error) as e: log_event('guild_configs_reload_skipped', logging.WARNING, error=str(e))
+
+    def start(self):
+        if self.interval > 0 and (self._task is None or self._task.done()):
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            self._task = None
+
+config_reloader = ConfigReloader(CONFIG_RELOAD_INTERVAL)
+
 @ptero_group.command(name="set_default", description="Sets the default Pterodactyl server for this Discord guild.")
 @app_commands.describe(server_identifier="ID (UUID) or alias of the Pterodactyl server to be set as default.")
 @app_commands.checks.has_permissions(administrator=True)
@@ -132,7 +1540,8 @@ async def ptero_set_default(interaction: discord.Interaction, server_identifier:
     resolved_uuid = await resolve_server_identifier(guild_config, server_identifier)
 
     guild_config['default_pterodactyl_server_uuid'] = resolved_uuid
-    await save_all_guild_configs()
+    resource_poller.track_default_server(guild_id_str, guild_config)
+    save_guild_config(guild_id_str)
 
     ptero_server_display_name = await get_pterodactyl_server_name(guild_config, resolved_uuid)
 
@@ -153,9 +1562,7 @@ async def ptero_config(interaction: discord.Interaction):
         if guild_config.get('panel_url'):
             panel_url_value = f"`{guild_config['panel_url']}`"
         if guild_config.get('api_key'):
-            api_key = guild_config['api_key']
-            masked_key = api_key[:4] + "..." + api_key[-4:] if len(api_key) > 8 else api_key
-            api_key_value = f"`{masked_key}`"
+            api_key_value = f"`{credential_store.mask(guild_config['api_key'])}`"
         if guild_config.get('default_pterodactyl_server_uuid'):
             default_uuid = guild_config['default_pterodactyl_server_uuid']
             default_server_display_name = await get_pterodactyl_server_name(guild_config, default_uuid)
@@ -164,6 +1571,10 @@ async def ptero_config(interaction: discord.Interaction):
     embed.add_field(name="Panel URL", value=panel_url_value, inline=False)
     embed.add_field(name="API Key", value=api_key_value, inline=False)
     embed.add_field(name="Default Pterodactyl Server", value=default_server_value, inline=False)
+    if guild_config and guild_config.get('panel_url'):
+        embed.add_field(name="Panel Health", value=ptero_client.health_for(guild_config['panel_url']).describe(), inline=False)
+    if guild_config and guild_config.get('panels'):
+        embed.add_field(name="Additional Panels", value="\n".join(f"`{name}`: `{panel['panel_url']}` — {ptero_client.health_for(panel['panel_url']).describe()}" for name, panel in sorted(guild_config['panels'].items())), inline=False)
     await interaction.response.send_message(embed=embed, ephemeral=True)
 
 @ptero_group.command(name="set_alias", description="Sets or updates an alias for a Pterodactyl server ID.")
@@ -176,7 +1587,8 @@ async def ptero_set_alias(interaction: discord.Interaction, alias_name: str, pte
     alias_name_lower = alias_name.lower()
 
     ALL_GUILD_CONFIGS[guild_id_str]['server_aliases'][alias_name_lower] = ptero_server_id
-    await save_all_guild_configs()
+    save_guild_config(guild_id_str)
+    server_index.invalidate_guild(guild_id_str)
     await interaction.response.send_message(f"✅ Alias `'{alias_name_lower}'` has been set for Pterodactyl server ID: `{ptero_server_id}`.", ephemeral=True)
 
 @ptero_group.command(name="delete_alias", description="Deletes a defined Pterodactyl server alias.")
@@ -190,7 +1602,8 @@ async def ptero_delete_alias(interaction: discord.Interaction, alias_name: str):
 
     if guild_config and 'server_aliases' in guild_config and alias_name_lower in guild_config['server_aliases']:
         del ALL_GUILD_CONFIGS[guild_id_str]['server_aliases'][alias_name_lower]
-        await save_all_guild_configs()
+        save_guild_config(guild_id_str)
+        server_index.invalidate_guild(guild_id_str)
         await interaction.response.send_message(f"✅ Alias `'{alias_name_lower}'` has been deleted.", ephemeral=True)
     else:
         await interaction.response.send_message(f"❌ Alias `'{alias_name_lower}'` not found.", ephemeral=True)
@@ -206,11 +1619,9 @@ async def ptero_aliases(interaction: discord.Interaction):
         await interaction.response.send_message("ℹ️ No Pterodactyl server aliases defined for this Discord guild.", ephemeral=True)
         return
 
-    embed = discord.Embed(title=f"📜 Defined Pterodactyl Aliases for: {interaction.guild.name}", color=discord.Color.info())
-    description = ""
-    for alias, uuid in aliases.items():
-        description += f"`{alias}` ➔ `{uuid}`\n"
-    if not description: description = "No aliases."
+    embed = discord.Embed(title=f"📜 Defined Pterodactyl Aliases for: {interaction.guild.name}", color=discord.Color.blurple())
+    description = "\n".join(f"`{alias}` ➔ `{uuid}`" for alias, uuid in sorted(aliases.items()))
+    if len(description) > 4000: description = description[:3900] + "\n\n... (list too long, partial list shown)"
     embed.description = description
     await interaction.response.send_message(embed=embed, ephemeral=True)
 
@@ -233,34 +1644,55 @@ async def ptero_help(interaction: discord.Interaction):
         description="List of available commands (administrator permissions required):",
         color=discord.Color.blue()
     )
-    embed.add_field(name="Bot Configuration", value="`/ptero set_api <API_KEY>`\n`/ptero set_url <PANEL_URL>`\n`/ptero set_default <ID_or_alias>`\n`/ptero config`", inline=False)
+    embed.add_field(name="Bot Configuration", value="`/ptero set_api <API_KEY>`\n`/ptero set_url <PANEL_URL>`\n`/ptero set_default <ID_or_alias>`\n`/ptero panel add <name> <PANEL_URL> <API_KEY>`\n`/ptero panel remove <name>`\n`/ptero config`", inline=False)
     embed.add_field(name="Server Alias Management", value="`/ptero set_alias <alias_name> <PTERO_SERVER_ID>`\n`/ptero delete_alias <alias_name>`\n`/ptero aliases`", inline=False)
-    embed.add_field(name="Pterodactyl Server Information", value="`/ptero list_servers`", inline=False)
+    embed.add_field(name="Pterodactyl Server Information", value="`/ptero list_servers`\n`/ptero overview`\n`/ptero console watch [ID_or_alias] [minutes]`\n`/ptero console run_script [script] [attachment] [ID_or_alias] [delay]`", inline=False)
     embed.add_field(name="Pterodactyl Server Control", value=(
         "`/ptero status [ID_or_alias]`\n"
-        "`/ptero start [ID_or_alias]`\n"
-        "`/ptero stop [ID_or_alias]`\n"
-        "`/ptero restart [ID_or_alias]`\n"
-        "`/ptero kill [ID_or_alias]`\n"
+        "`/ptero history [ID_or_alias] [window]`\n"
+        "`/ptero start [ID_or_alias] [wait] [timeout_seconds]`\n"
+        "`/ptero stop [ID_or_alias] [wait] [timeout_seconds]`\n"
+        "`/ptero restart [ID_or_alias] [wait] [timeout_seconds]`\n"
+        "`/ptero kill [ID_or_alias] [wait] [timeout_seconds]`\n"
+        "`/ptero bulk_power <action> <targets> [concurrency]`\n"
         "`/ptero command <ID_or_alias> <command>` (ID/alias required for command)"
     ), inline=False)
     embed.add_field(name="Pterodactyl Server Queue", value=(
         "`/ptero join_queue [ID_or_alias]`\n"
-        "`/ptero queue_status [ID_or_alias]`"
+        "`/ptero leave_queue [ID_or_alias]`\n"
+        "`/ptero queue_status [ID_or_alias]`\n"
+        "`/ptero queue_config <ID_or_alias> <slots> [slot_minutes]`"
+    ), inline=False)
+    embed.add_field(name="Scheduled Actions", value=(
+        "`/ptero schedule add <action> <start_at> [ID_or_alias] [every] [command]`\n"
+        "`/ptero schedule list`\n"
+        "`/ptero schedule remove <schedule_id>`"
     ), inline=False)
     embed.set_footer(text="In control commands, [ID_or_alias] is optional if a default server is set.")
     await interaction.response.send_message(embed=embed, ephemeral=True)
 
 async def get_pterodactyl_server_name(guild_config: dict, resolved_ptero_uuid: str) -> str:
     if not guild_config or not guild_config.get('panel_url') or not guild_config.get('api_key') or not resolved_ptero_uuid: return resolved_ptero_uuid if resolved_ptero_uuid else "Unknown server"
-    api_headers = get_api_headers(guild_config['api_key'])
-    if not api_headers: return resolved_ptero_uuid
+    found, cached_name = server_name_cache.get(guild_config, resolved_ptero_uuid)
+    metrics.cache_lookup('server_name', found)
+    if found: return cached_name or resolved_ptero_uuid
+    panel_url, key_fingerprint = panel_credential_key(guild_config)
+    shared_key = f"server_name:{panel_url}:{key_fingerprint}:{resolved_ptero_uuid}"
+    shared_name = await guild_config_persistence.get_shared(shared_key)
+    if shared_name is not None:
+        server_name_cache.put(guild_config, resolved_ptero_uuid, shared_name)
+        return shared_name
     try:
-        response = requests.get(f"{guild_config['panel_url']}/api/client/servers/{resolved_ptero_uuid}", headers=api_headers, timeout=10)
-        response.raise_for_status()
+        response = await ptero_client.get(guild_config, f"/api/client/servers/{resolved_ptero_uuid}", timeout=10)
         data = response.json()
-        return data.get('attributes', {}).get('name', resolved_ptero_uuid)
-    except: return resolved_ptero_uuid
+        name = data.get('attributes', {}).get('name', resolved_ptero_uuid)
+        server_name_cache.put(guild_config, resolved_ptero_uuid, name)
+        guild_config_persistence.put_shared(shared_key, name, server_name_cache.ttl)
+        return name
+    except PterodactylHTTPError as errh:
+        if errh.response.status_code == 404: server_name_cache.put_missing(guild_config, resolved_ptero_uuid)
+        return resolved_ptero_uuid
+    except Exception: return resolved_ptero_uuid
 
 async def get_server_id_to_use(interaction: discord.Interaction, guild_config: dict, server_identifier: typing.Optional[str]) -> typing.Optional[str]:
     if server_identifier:
@@ -274,6 +1706,31 @@ async def get_server_id_to_use(interaction: discord.Interaction, guild_config: d
         else: await interaction.followup.send(message, ephemeral=True)
         return None
 
+def get_cached_pterodactyl_server_name(guild_config: dict, resolved_ptero_uuid: str) -> typing.Optional[str]:
+    found, cached_name = server_name_cache.get(guild_config, resolved_ptero_uuid)
+    return cached_name if found else None
+
+def format_pending_message(prefix: str, display_name: str, server_identifier: typing.Optional[str], actual_ptero_server_id: str, suffix: str = "") -> str:
+    message = f"{prefix}**{display_name}**"
+    if server_identifier and server_identifier.lower() != actual_ptero_server_id.lower() and server_identifier.lower() != display_name.lower():
+        message += f" (alias: `{server_identifier}`, ID: `{actual_ptero_server_id}`){suffix}..."
+    else:
+        message += f" (ID: `{actual_ptero_server_id}`){suffix}..."
+    return message
+
+async def send_pending_message(interaction: discord.Interaction, content: str) -> typing.Optional[discord.WebhookMessage]:
+    try: return await interaction.followup.send(content, wait=True)
+    except discord.HTTPException as e: log_event('pending_message_failed', logging.WARNING, error=str(e)); return None
+
+async def finish_pending_message(interaction: discord.Interaction, pending_message: typing.Optional[discord.WebhookMessage], content: typing.Optional[str] = None, embed: typing.Optional[discord.Embed] = None):
+    if pending_message is not None:
+        try:
+            await pending_message.edit(content=content, embed=embed)
+            return
+        except discord.HTTPException as e: log_event('pending_message_edit_failed', logging.WARNING, error=str(e))
+    if embed is not None: await interaction.followup.send(content=content, embed=embed)
+    else: await interaction.followup.send(content)
+
 @ptero_group.command(name="status", description="Checks the status and resources of a Pterodactyl server.")
 @app_commands.describe(server_identifier="ID or alias of the Pterodactyl server (optional, if default is set).")
 @app_commands.checks.has_permissions(administrator=True)
@@ -286,21 +1743,15 @@ async def ptero_status(interaction: discord.Interaction, server_identifier: typi
     actual_ptero_server_id = await get_server_id_to_use(interaction, guild_config, server_identifier)
     if not actual_ptero_server_id: return
 
-    ptero_server_display_name = await get_pterodactyl_server_name(guild_config, actual_ptero_server_id)
-
-    initial_message = f"⏳ Checking Pterodactyl server status: **{ptero_server_display_name}**"
-    if server_identifier and server_identifier.lower() != actual_ptero_server_id.lower() and server_identifier.lower() != ptero_server_display_name.lower():
-        initial_message += f" (alias: `{server_identifier}`, ID: `{actual_ptero_server_id}`)..."
-    else:
-        initial_message += f" (ID: `{actual_ptero_server_id}`)..."
-    await interaction.followup.send(initial_message)
+    name_task = asyncio.create_task(get_pterodactyl_server_name(guild_config, actual_ptero_server_id))
+    request_task = asyncio.create_task(resource_poller.get(guild_config, actual_ptero_server_id))
+    pending_display_name = get_cached_pterodactyl_server_name(guild_config, actual_ptero_server_id) or server_identifier or actual_ptero_server_id
+    pending_message = await send_pending_message(interaction, format_pending_message("⏳ Checking Pterodactyl server status: ", pending_display_name, server_identifier, actual_ptero_server_id))
+    ptero_server_display_name = await name_task
 
-    api_headers = get_api_headers(guild_config['api_key'])
     try:
-        api_url = f"{guild_config['panel_url']}/api/client/servers/{actual_ptero_server_id}/resources"
-        response = requests.get(api_url, headers=api_headers, timeout=10)
-        response.raise_for_status()
-        data = response.json(); attributes = data.get('attributes', {}); status_text = attributes.get('current_state', 'unknown')
+        data, snapshot_age = await request_task
+        attributes = data.get('attributes', {}); status_text = attributes.get('current_state', 'unknown')
         resources = attributes.get('resources', {}); ram_current_bytes = resources.get('memory_bytes', 0); ram_current_mb = ram_current_bytes / (1024**2)
         cpu_absolute = resources.get('cpu_absolute', 0); disk_bytes = resources.get('disk_bytes', 0); disk_mb = disk_bytes / (1024**2)
         limits = attributes.get('limits', {}); ram_limit_mb = limits.get('memory', 0) if limits.get('memory', 0) > 0 else "Unlimited"
@@ -309,41 +1760,377 @@ async def ptero_status(interaction: discord.Interaction, server_identifier: typi
         embed = discord.Embed(title=f"📊 Status: {ptero_server_display_name}", description=f"Pterodactyl ID: `{actual_ptero_server_id}`", color=color)
         embed.add_field(name="Status", value=status_text.capitalize(), inline=True); embed.add_field(name="CPU", value=f"{cpu_absolute:.2f}% / {cpu_limit}%", inline=True)
         embed.add_field(name="RAM", value=f"{ram_current_mb:.2f} MB / {ram_limit_mb} MB", inline=True); embed.add_field(name="Disk", value=f"{disk_mb:.2f} MB / {disk_limit_mb} MB", inline=True)
-        network_data = resources.get('network', {}); rx_bytes = network_data.get('rx_bytes', 0); tx_bytes = network_data.get('tx_bytes', 0)
+        network_data = resources.get('network', {}); rx_bytes = network_data.get('rx_bytes', resources.get('network_rx_bytes', 0)); tx_bytes = network_data.get('tx_bytes', resources.get('network_tx_bytes', 0))
         embed.add_field(name="Network (Received)", value=f"{rx_bytes / (1024**2):.2f} MB", inline=True); embed.add_field(name="Network (Sent)", value=f"{tx_bytes / (1024**2):.2f} MB", inline=True)
-        embed.set_footer(text=f"Discord Guild: {interaction.guild.name} | By: {interaction.user.display_name}"); embed.timestamp = discord.utils.utcnow()
-        await interaction.followup.send(embed=embed)
-    except requests.exceptions.HTTPError as errh:
+        embed.set_footer(text=f"Discord Guild: {interaction.guild.name} | By: {interaction.user.display_name} | Data age: {snapshot_age:.0f}s")
+        embed.timestamp = discord.utils.utcnow() - datetime.timedelta(seconds=snapshot_age)
+        await finish_pending_message(interaction, pending_message, embed=embed)
+    except PterodactylHTTPError as errh:
         msg = f"HTTP Error: {errh.response.status_code}"
         resolved_id_for_error = actual_ptero_server_id or server_identifier
         if errh.response.status_code == 404: msg = f"❌ Pterodactyl server with ID `{resolved_id_for_error}` not found on `{guild_config['panel_url']}`."
         elif errh.response.status_code == 403: msg = f"❌ Insufficient permissions (API key) to read Pterodactyl server status `{resolved_id_for_error}`."
         else: msg += f" - {errh.response.text[:500]}"
-        await interaction.followup.send(msg)
-    except Exception as e: print(f"Error in ptero_status: {e}"); await interaction.followup.send(f"❌ An unexpected error occurred: {e}")
+        await finish_pending_message(interaction, pending_message, msg)
+    except Exception as e: log_event('command_failed', logging.ERROR, command='status', error=str(e)); await finish_pending_message(interaction, pending_message, f"❌ An unexpected error occurred: {e}")
+
+HISTORY_CHART_FIELDS = (('cpu', "CPU", lambda value: f"{value:.1f}%"), ('memory', "RAM", lambda value: f"{value:.0f} MB"), ('disk', "Disk", lambda value: f"{value:.0f} MB"), ('rx_rate', "Network In", format_byte_rate), ('tx_rate', "Network Out", format_byte_rate))
+
+@ptero_group.command(name="history", description="Shows resource usage trends of a Pterodactyl server.")
+@app_commands.describe(server_identifier="ID or alias of the Pterodactyl server (optional, if default is set).", window="Time range to show")
+@app_commands.choices(window=[app_commands.Choice(name="Last hour (1 min steps)", value='1h'), app_commands.Choice(name="Last 48 hours (1 h steps)", value='48h'), app_commands.Choice(name="Last 30 days (1 day steps)", value='30d')])
+@app_commands.checks.has_permissions(administrator=True)
+@app_commands.guild_only()
+async def ptero_history(interaction: discord.Interaction, server_identifier: typing.Optional[str] = None, window: typing.Optional[app_commands.Choice[str]] = None):
+    await interaction.response.defer(ephemeral=False)
+    guild_config = await check_guild_pterodactyl_config_and_respond(interaction)
+    if not guild_config: return
 
-async def send_pterodactyl_power_command(interaction: discord.Interaction, guild_config: dict, server_identifier: typing.Optional[str], command: str, friendly_name: str):
     actual_ptero_server_id = await get_server_id_to_use(interaction, guild_config, server_identifier)
     if not actual_ptero_server_id: return
 
-    ptero_server_display_name = await get_pterodactyl_server_name(guild_config, actual_ptero_server_id)
+    tier_name = window.value if window else '1h'
+    name_task = asyncio.create_task(get_pterodactyl_server_name(guild_config, actual_ptero_server_id))
+    request_task = asyncio.create_task(resource_poller.get(guild_config, actual_ptero_server_id))
+    pending_display_name = get_cached_pterodactyl_server_name(guild_config, actual_ptero_server_id) or server_identifier or actual_ptero_server_id
+    pending_message = await send_pending_message(interaction, format_pending_message("⏳ Loading resource history for: ", pending_display_name, server_identifier, actual_ptero_server_id))
+    ptero_server_display_name = await name_task
 
-    initial_message = f"⏳ Sending '{friendly_name}' to Pterodactyl: **{ptero_server_display_name}**"
-    if server_identifier and server_identifier.lower() != actual_ptero_server_id.lower() and server_identifier.lower() != ptero_server_display_name.lower():
-        initial_message += f" (alias: `{server_identifier}`, ID: `{actual_ptero_server_id}`)..."
+    try:
+        await request_task
+        history = resource_history.get(guild_config['panel_url'], actual_ptero_server_id)
+        tier = history.tiers[tier_name] if history else None
+        embed = discord.Embed(title=f"📈 History: {ptero_server_display_name}", description=f"Pterodactyl ID: `{actual_ptero_server_id}`", color=discord.Color.blurple())
+        now = time.time(); samples_seen = 0
+        for field_name, label, formatter in HISTORY_CHART_FIELDS:
+            series = tier.series(HISTORY_FIELDS.index(field_name), now) if tier else []
+            present = [value for value in series if value is not None]
+            if not present: continue
+            samples_seen = max(samples_seen, len(present))
+            summary = f"now {formatter(present[-1])} · avg {formatter(sum(present) / len(present))} · max {formatter(max(present))}"
+            embed.add_field(name=label, value=f"```\n{render_sparkline(series)}\n```{summary}", inline=False)
+        if not samples_seen:
+            embed.description += "\nNo history collected yet. Samples are recorded while the server's status is being checked; try again in a minute."
+        embed.set_footer(text=f"Discord Guild: {interaction.guild.name} | By: {interaction.user.display_name} | Window: {tier_name}")
+        embed.timestamp = discord.utils.utcnow()
+        await finish_pending_message(interaction, pending_message, embed=embed)
+    except PterodactylHTTPError as errh:
+        msg = f"HTTP Error: {errh.response.status_code}"
+        resolved_id_for_error = actual_ptero_server_id or server_identifier
+        if errh.response.status_code == 404: msg = f"❌ Pterodactyl server with ID `{resolved_id_for_error}` not found on `{guild_config['panel_url']}`."
+        elif errh.response.status_code == 403: msg = f"❌ Insufficient permissions (API key) to read Pterodactyl server status `{resolved_id_for_error}`."
+        else: msg += f" - {errh.response.text[:500]}"
+        await finish_pending_message(interaction, pending_message, msg)
+    except Exception as e: log_event('command_failed', logging.ERROR, command='history', error=str(e)); await finish_pending_message(interaction, pending_message, f"❌ An unexpected error occurred: {e}")
+
+class ConsoleWatch:
+    def __init__(self, stream: ServerConsoleStream, message: discord.WebhookMessage, display_name: str, server_uuid: str, duration_seconds: float, update_interval: float = 3.0):
+        self.stream = stream
+        self.message = message
+        self.display_name = display_name
+        self.server_uuid = server_uuid
+        self.ends_at = time.time() + duration_seconds
+        self.update_interval = update_interval
+        self._dirty = True
+
+    def on_event(self, event: str, args: list):
+        self._dirty = True
+        if event == 'stream closed': self.ends_at = time.time()
+
+    def build_embed(self, finished: bool = False) -> discord.Embed:
+        state = self.stream.state or 'unknown'
+        color = discord.Color.green() if state == 'running' else (discord.Color.orange() if state in ('stopping', 'starting') else (discord.Color.red() if state == 'offline' else discord.Color.greyple()))
+        embed = discord.Embed(title=f"📡 {'Watch ended' if finished else 'Live'}: {self.display_name}", color=discord.Color.light_grey() if finished else color)
+        console_tail = ""
+        for line in reversed(self.stream.console_lines):
+            if len(console_tail) + len(line) + 1 > 1800: break
+            console_tail = f"{line}\n{console_tail}"
+        description = f"Pterodactyl ID: `{self.server_uuid}`"
+        if not finished: description += f"\nEnds <t:{int(self.ends_at)}:R>"
+        if self.stream.error: description += f"\n⚠️ {self.stream.error}"
+        console_tail = console_tail.replace("```", "`\u200b``")
+        embed.description = description + (f"\n```\n{console_tail}```" if console_tail else "\n*(no console output yet)*")
+        embed.add_field(name="Status", value=state.capitalize(), inline=True)
+        stats = self.stream.stats
+        if stats:
+            memory_limit = stats.get('memory_limit_bytes', 0)
+            embed.add_field(name="CPU", value=f"{stats.get('cpu_absolute', 0):.2f}%", inline=True)
+            embed.add_field(name="RAM", value=f"{stats.get('memory_bytes', 0) / (1024**2):.2f} MB" + (f" / {memory_limit / (1024**2):.0f} MB" if memory_limit else ""), inline=True)
+            embed.add_field(name="Disk", value=f"{stats.get('disk_bytes', 0) / (1024**2):.2f} MB", inline=True)
+            network_data = stats.get('network', {})
+            embed.add_field(name="Network (Received)", value=f"{network_data.get('rx_bytes', 0) / (1024**2):.2f} MB", inline=True)
+            embed.add_field(name="Network (Sent)", value=f"{network_data.get('tx_bytes', 0) / (1024**2):.2f} MB", inline=True)
+        embed.timestamp = discord.utils.utcnow()
+        return embed
+
+    async def run(self):
+        self.stream.add_listener(self.on_event)
+        try:
+            while time.time() < self.ends_at:
+                await asyncio.sleep(min(self.update_interval, max(self.ends_at - time.time(), 0)))
+                if self._dirty:
+                    self._dirty = False
+                    # content=None also clears the "still connecting" warning once the stream delivers events.
+                    await self.message.edit(content=None, embed=self.build_embed())
+        except discord.HTTPException as e: log_event('console_watch_update_failed', logging.WARNING, server=self.server_uuid, error=str(e))
+        finally:
+            self.stream.remove_listener(self.on_event)
+            try: await self.message.edit(content=None, embed=self.build_embed(finished=True))
+            except discord.HTTPException: pass
+
+console_group = app_commands.Group(name="console", description="Live console access to Pterodactyl servers", parent=ptero_group)
+
+@console_group.command(name="watch", description="Streams live stats and console output of a Pterodactyl server.")
+@app_commands.describe(server_identifier="ID or alias of the server (optional, if default is set).", minutes="How long to keep the live view open (1-14 minutes).")
+@app_commands.checks.has_permissions(administrator=True)
+@app_commands.guild_only()
+async def ptero_watch(interaction: discord.Interaction, server_identifier: typing.Optional[str] = None, minutes: app_commands.Range[int, 1, 14] = 5):
+    await interaction.response.defer(ephemeral=False)
+    guild_config = await check_guild_pterodactyl_config_and_respond(interaction)
+    if not guild_config: return
+
+    actual_ptero_server_id = await get_server_id_to_use(interaction, guild_config, server_identifier)
+    if not actual_ptero_server_id: return
+
+    name_task = asyncio.create_task(get_pterodactyl_server_name(guild_config, actual_ptero_server_id))
+    stream = console_streams.get_stream(guild_config, actual_ptero_server_id)
+    pending_display_name = get_cached_pterodactyl_server_name(guild_config, actual_ptero_server_id) or server_identifier or actual_ptero_server_id
+    pending_message = await send_pending_message(interaction, format_pending_message("⏳ Connecting to the console of ", pending_display_name, server_identifier, actual_ptero_server_id))
+    ptero_server_display_name = await name_task
+    if pending_message is None: return
+
+    watch = ConsoleWatch(stream, pending_message, ptero_server_display_name, actual_ptero_server_id, minutes * 60)
+    create_background_task(watch.run())
+    if not await stream.wait_ready():
+        await pending_message.edit(content=f"⚠️ Still connecting to the console of **{ptero_server_display_name}**{f': {stream.error}' if stream.error else '...'}")
     else:
-        initial_message += f" (ID: `{actual_ptero_server_id}`)..."
-    await interaction.followup.send(initial_message)
+        await pending_message.edit(content=None, embed=watch.build_embed())
+
+MAX_SCRIPT_COMMANDS = 100
+MAX_SCRIPT_SECONDS = 14 * 60  # interaction tokens expire after 15 minutes, after which the result could not be posted
+MAX_SCRIPT_BYTES = 64 * 1024
+
+def parse_console_script(text: str) -> typing.List[str]:
+    lines = text.replace('\r\n', '\n').strip().split('\n')
+    if len(lines) == 1: lines = lines[0].split(';')
+    return [line.strip() for line in lines if line.strip() and not line.strip().startswith('#')]
+
+class ConsoleScriptRun:
+    def __init__(self, stream: ServerConsoleStream, commands: typing.List[str], delay: float):
+        self.stream = stream
+        self.commands = commands
+        self.delay = delay
+        self.capturing = False
+        self.log_lines = []
+        self.output_lines = 0
+        self.sent = 0
+
+    def on_event(self, event: str, args: list):
+        if not self.capturing or event not in ('console output', 'daemon message') or not args: return
+        self.log_lines.append(ANSI_ESCAPE_PATTERN.sub('', str(args[0])).rstrip())
+        self.output_lines += 1
+
+    async def run(self, settle_seconds: float):
+        was_ready = self.stream.ready.is_set()
+        self.stream.add_listener(self.on_event)
+        try:
+            if not await self.stream.wait_ready():
+                raise PterodactylConnectionError(self.stream.error or "Timed out connecting to the console websocket.")
+            # A fresh connection replays recent console history right after authenticating; let it pass before capturing.
+            if not was_ready: await asyncio.sleep(0.5)
+            self.capturing = True
+            for index, command in enumerate(self.commands):
+                if self.stream.closed: raise PterodactylConnectionError(self.stream.error)
+                self.log_lines.append(f"$ {command}")
+                await self.stream.send_command(command)
+                self.sent += 1
+                await asyncio.sleep(self.delay if index < len(self.commands) - 1 else max(self.delay, settle_seconds))
+        finally:
+            self.capturing = False
+            self.stream.remove_listener(self.on_event)
+
+    def render_log(self) -> str:
+        return "\n".join(self.log_lines) + "\n"
+
+@console_group.command(name="run_script", description="Runs several console commands over one connection and returns their output.")
+@app_commands.describe(script="Commands separated by ';' (or attach a file with one command per line)", attachment="Text file with one command per line ('#' starts a comment)", server_identifier="ID or alias of the server (optional, if default is set).", delay="Seconds to wait between commands (0-10)")
+@app_commands.checks.has_permissions(administrator=True)
+@app_commands.guild_only()
+async def ptero_run_script(interaction: discord.Interaction, script: typing.Optional[str] = None, attachment: typing.Optional[discord.Attachment] = None, server_identifier: typing.Optional[str] = None, delay: app_commands.Range[float, 0.0, 10.0] = 1.0):
+    if not script and not attachment:
+        await interaction.response.send_message("❌ Provide a `script` or an `attachment` with the commands to run.", ephemeral=True)
+        return
+    if attachment and attachment.size > MAX_SCRIPT_BYTES:
+        await interaction.response.send_message(f"❌ The attached script is too large (max {MAX_SCRIPT_BYTES // 1024} KB).", ephemeral=True)
+        return
+    await interaction.response.defer(ephemeral=False)
+    guild_config = await check_guild_pterodactyl_config_and_respond(interaction)
+    if not guild_config: return
+
+    actual_ptero_server_id = await get_server_id_to_use(interaction, guild_config, server_identifier)
+    if not actual_ptero_server_id: return
+
+    try: script_text = (await attachment.read()).decode('utf-8') if attachment else script
+    except (discord.HTTPException, UnicodeDecodeError) as e:
+        await interaction.followup.send(f"❌ Could not read the attached script: {e}", ephemeral=True)
+        return
+    commands = parse_console_script(script_text)
+    if not commands or len(commands) > MAX_SCRIPT_COMMANDS:
+        await interaction.followup.send(f"❌ A script must contain between 1 and {MAX_SCRIPT_COMMANDS} commands (found {len(commands)}).", ephemeral=True)
+        return
+    if len(commands) * delay > MAX_SCRIPT_SECONDS:
+        await interaction.followup.send(f"❌ {len(commands)} commands with a {delay:g}s delay would take longer than {MAX_SCRIPT_SECONDS // 60} minutes. Use a shorter delay or split the script.", ephemeral=True)
+        return
+
+    name_task = asyncio.create_task(get_pterodactyl_server_name(guild_config, actual_ptero_server_id))
+    script_run = ConsoleScriptRun(console_streams.get_stream(guild_config, actual_ptero_server_id), commands, delay)
+    run_task = asyncio.create_task(script_run.run(settle_seconds=2.0))
+    pending_display_name = get_cached_pterodactyl_server_name(guild_config, actual_ptero_server_id) or server_identifier or actual_ptero_server_id
+    pending_message = await send_pending_message(interaction, format_pending_message(f"⏳ Running {len(commands)} console command(s) on ", pending_display_name, server_identifier, actual_ptero_server_id))
+    ptero_server_display_name = await name_task
+
+    started_at = time.monotonic()
+    try:
+        await asyncio.wait_for(run_task, timeout=MAX_SCRIPT_SECONDS)
+        summary = f"✅ Ran {script_run.sent} command(s) on **{ptero_server_display_name}** in {time.monotonic() - started_at:.1f}s ({script_run.output_lines} line(s) of output)."
+    except asyncio.TimeoutError:
+        summary = f"⚠️ Script truncated after {script_run.sent}/{len(commands)} command(s) on **{ptero_server_display_name}**: it ran longer than {MAX_SCRIPT_SECONDS // 60} minutes, after which Discord no longer accepts the result."
+    except PterodactylError as e:
+        summary = f"❌ Script stopped after {script_run.sent}/{len(commands)} command(s) on **{ptero_server_display_name}**: {e}"
+    except Exception as e:
+        log_event('command_failed', logging.ERROR, command='console run_script', error=str(e))
+        summary = f"❌ Script stopped after {script_run.sent}/{len(commands)} command(s) on **{ptero_server_display_name}**: Unexpected error: {e}"
+    log_text = script_run.render_log()
+    preview = log_text[-1500:]
+    escaped_preview = preview.replace('```', "'''")
+    await finish_pending_message(interaction, pending_message, f"{summary}\n```\n{escaped_preview}```" if script_run.log_lines else summary)
+    if len(log_text) > len(preview):
+        await interaction.followup.send(file=discord.File(io.BytesIO(log_text.encode('utf-8')), filename=f"script-{actual_ptero_server_id}.log"))
+
+POWER_TARGET_STATES = {'start': 'running', 'restart': 'running', 'stop': 'offline', 'kill': 'offline'}
+
+class PowerStateWatch:
+    def __init__(self, manager, guild_config: dict, server_uuid: str):
+        self.manager = manager
+        self.guild_config = {'panel_url': guild_config['panel_url'], 'api_key': guild_config['api_key']}
+        self.server_uuid = server_uuid
+        self.state = None
+        self.waiters = []
+        self._last_uptime = None
+        self._stream = None
+        self._task = None
+
+    def wait_for(self, target_state: str, must_leave: bool = False) -> asyncio.Future:
+        future = asyncio.get_running_loop().create_future()
+        self.waiters.append([target_state, must_leave, future])
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+        return future
+
+    def _update(self, state: typing.Optional[str], uptime: typing.Optional[int] = None):
+        # An uptime that went backwards means the server restarted between two observations.
+        restarted = uptime is not None and self._last_uptime is not None and uptime < self._last_uptime
+        if uptime is not None: self._last_uptime = uptime
+        if not state: return
+        self.state = state
+        for waiter in list(self.waiters):
+            target_state, must_leave, future = waiter
+            if future.done():
+                self.waiters.remove(waiter)
+                continue
+            # A restart waiter only counts the target state once the server has left it (or visibly restarted).
+            if must_leave and (state != target_state or restarted):
+                waiter[1] = must_leave = False
+            if not must_leave and state == target_state:
+                future.set_result(state)
+                self.waiters.remove(waiter)
+
+    def on_event(self, event: str, args: list):
+        if event == 'status' and args: self._update(args[0])
+        elif event == 'stats' and self._stream.stats: self._update(self._stream.state, self._stream.stats.get('uptime'))
+        elif event == 'stream closed':
+            for _, _, future in self.waiters:
+                if not future.done(): future.set_exception(PterodactylConnectionError(args[0]))
+
+    def _has_waiters(self) -> bool:
+        self.waiters = [waiter for waiter in self.waiters if not waiter[2].done()]
+        return bool(self.waiters)
+
+    async def _poll(self):
+        data, _ = await resource_poller.get(self.guild_config, self.server_uuid, max_age=0)
+        attributes = data.get('attributes', {})
+        self._update(attributes.get('current_state'), attributes.get('resources', {}).get('uptime'))
+
+    async def _run(self):
+        self._stream = console_streams.get_stream(self.guild_config, self.server_uuid)
+        self._stream.add_listener(self.on_event)
+        poll_interval = 1.0
+        try:
+            while self._has_waiters():
+                if self._stream.ready.is_set():
+                    self._update(self._stream.state)
+                    poll_interval = 1.0
+                    await asyncio.sleep(1.0)
+                    continue
+                try: await self._poll()
+                except PterodactylError as e: log_event('power_state_poll_failed', logging.WARNING, server=self.server_uuid, error=str(e))
+                await asyncio.sleep(poll_interval)
+                poll_interval = min(poll_interval * 1.5, 10.0)
+        finally:
+            self._stream.remove_listener(self.on_event)
+            self.manager.release(self)
+
+class PowerStateWatchManager:
+    def __init__(self):
+        self._watches = {}
+
+    def wait_for(self, guild_config: dict, server_uuid: str, target_state: str, must_leave: bool = False) -> asyncio.Future:
+        key = (*panel_credential_key(guild_config), server_uuid)
+        watch = self._watches.get(key)
+        if watch is None:
+            watch = self._watches[key] = PowerStateWatch(self, guild_config, server_uuid)
+        return watch.wait_for(target_state, must_leave)
+
+    def release(self, watch: PowerStateWatch):
+        key = (*panel_credential_key(watch.guild_config), watch.server_uuid)
+        if self._watches.get(key) is watch and not watch._has_waiters():
+            del self._watches[key]
+
+    def last_state(self, guild_config: dict, server_uuid: str) -> typing.Optional[str]:
+        watch = self._watches.get((*panel_credential_key(guild_config), server_uuid))
+        return watch.state if watch else None
+
+power_state_watches = PowerStateWatchManager()
+
+async def send_pterodactyl_power_command(interaction: discord.Interaction, guild_config: dict, server_identifier: typing.Optional[str], command: str, friendly_name: str, wait: bool = False, timeout_seconds: float = 180):
+    actual_ptero_server_id = await get_server_id_to_use(interaction, guild_config, server_identifier)
+    if not actual_ptero_server_id: return
 
+    name_task = asyncio.create_task(get_pterodactyl_server_name(guild_config, actual_ptero_server_id))
+    target_state = POWER_TARGET_STATES[command]
+    # Start watching before the power request so that quick state transitions are not missed.
+    state_future = power_state_watches.wait_for(guild_config, actual_ptero_server_id, target_state, must_leave=command == 'restart') if wait else None
+    started_at = time.monotonic()
+    request_task = asyncio.create_task(ptero_client.post(guild_config, f"/api/client/servers/{actual_ptero_server_id}/power", payload={'signal': command}, timeout=15))
+    pending_display_name = get_cached_pterodactyl_server_name(guild_config, actual_ptero_server_id) or server_identifier or actual_ptero_server_id
+    pending_message = await send_pending_message(interaction, format_pending_message(f"⏳ Sending '{friendly_name}' to Pterodactyl: ", pending_display_name, server_identifier, actual_ptero_server_id))
+    ptero_server_display_name = await name_task
 
-    api_url = f"{guild_config['panel_url']}/api/client/servers/{actual_ptero_server_id}/power"
-    payload = {'signal': command}
-    api_headers = get_api_headers(guild_config['api_key'])
     try:
-        response = requests.post(api_url, headers=api_headers, json=payload, timeout=15)
-        response.raise_for_status()
-        await interaction.followup.send(f"✅ Command '{friendly_name}' sent to **{ptero_server_display_name}**.")
-    except requests.exceptions.HTTPError as errh:
+        await request_task
+        if state_future is None:
+            await finish_pending_message(interaction, pending_message, f"✅ Command '{friendly_name}' sent to **{ptero_server_display_name}**.")
+            return
+        await finish_pending_message(interaction, pending_message, f"⏳ Command '{friendly_name}' sent to **{ptero_server_display_name}**. Waiting for it to be {target_state}...")
+        try:
+            await asyncio.wait_for(state_future, timeout_seconds)
+            await finish_pending_message(interaction, pending_message, f"✅ **{ptero_server_display_name}** is {target_state} ('{friendly_name}' took {time.monotonic() - started_at:.1f}s).")
+        except asyncio.TimeoutError:
+            last_state = power_state_watches.last_state(guild_config, actual_ptero_server_id) or 'unknown'
+            await finish_pending_message(interaction, pending_message, f"⚠️ Command '{friendly_name}' sent to **{ptero_server_display_name}**, but it was not {target_state} after {timeout_seconds:.0f}s (last state: {last_state}).")
+        except PterodactylConnectionError as e:
+            await finish_pending_message(interaction, pending_message, f"⚠️ Command '{friendly_name}' sent to **{ptero_server_display_name}**, but stopped waiting for it to be {target_state}: {e}")
+    except PterodactylHTTPError as errh:
         msg = f"HTTP Error: {errh.response.status_code}"
         resolved_id_for_error = actual_ptero_server_id or server_identifier
         if errh.response.status_code == 404: msg = f"❌ Pterodactyl server with ID `{resolved_id_for_error}` not found."
@@ -353,48 +2140,292 @@ async def send_pterodactyl_power_command(interaction: discord.Interaction, guild
              except: status_message = "Request conflict (e.g., server already in that state)."
              msg = f"⚠️ Cannot '{friendly_name}' on `{resolved_id_for_error}`. {status_message}"
         else: msg += f" - {errh.response.text[:500]}"
-        await interaction.followup.send(msg)
-    except Exception as e: print(f"Error in send_power_command ({command}): {e}"); await interaction.followup.send(f"❌ Unexpected error '{friendly_name}': {e}")
+        await finish_pending_message(interaction, pending_message, msg)
+    except Exception as e: log_event('command_failed', logging.ERROR, command=command, error=str(e)); await finish_pending_message(interaction, pending_message, f"❌ Unexpected error '{friendly_name}': {e}")
+    finally:
+        if state_future is not None and not state_future.done(): state_future.cancel()
 
 @ptero_group.command(name="start", description="Starts a Pterodactyl server.")
-@app_commands.describe(server_identifier="ID or alias of the server (optional, if default is set).")
+@app_commands.describe(server_identifier="ID or alias of the server (optional, if default is set).", wait="Wait until the server is running and report how long it took", timeout_seconds="How long to wait (10-600 seconds)")
 @app_commands.checks.has_permissions(administrator=True)
 @app_commands.guild_only()
-async def ptero_start(interaction: discord.Interaction, server_identifier: typing.Optional[str] = None):
+async def ptero_start(interaction: discord.Interaction, server_identifier: typing.Optional[str] = None, wait: bool = False, timeout_seconds: app_commands.Range[int, 10, 600] = 180):
     await interaction.response.defer(ephemeral=False)
     guild_config = await check_guild_pterodactyl_config_and_respond(interaction)
     if not guild_config: return
-    await send_pterodactyl_power_command(interaction, guild_config, server_identifier, "start", "Start")
+    await send_pterodactyl_power_command(interaction, guild_config, server_identifier, "start", "Start", wait, timeout_seconds)
 
 @ptero_group.command(name="stop", description="Stops a Pterodactyl server.")
-@app_commands.describe(server_identifier="ID or alias of the server (optional, if default is set).")
+@app_commands.describe(server_identifier="ID or alias of the server (optional, if default is set).", wait="Wait until the server is offline and report how long it took", timeout_seconds="How long to wait (10-600 seconds)")
 @app_commands.checks.has_permissions(administrator=True)
 @app_commands.guild_only()
-async def ptero_stop(interaction: discord.Interaction, server_identifier: typing.Optional[str] = None):
+async def ptero_stop(interaction: discord.Interaction, server_identifier: typing.Optional[str] = None, wait: bool = False, timeout_seconds: app_commands.Range[int, 10, 600] = 180):
     await interaction.response.defer(ephemeral=False)
     guild_config = await check_guild_pterodactyl_config_and_respond(interaction)
     if not guild_config: return
-    await send_pterodactyl_power_command(interaction, guild_config, server_identifier, "stop", "Stop")
+    await send_pterodactyl_power_command(interaction, guild_config, server_identifier, "stop", "Stop", wait, timeout_seconds)
 
 @ptero_group.command(name="restart", description="Restarts a Pterodactyl server.")
-@app_commands.describe(server_identifier="ID or alias of the server (optional, if default is set).")
+@app_commands.describe(server_identifier="ID or alias of the server (optional, if default is set).", wait="Wait until the server is running and report how long it took", timeout_seconds="How long to wait (10-600 seconds)")
 @app_commands.checks.has_permissions(administrator=True)
 @app_commands.guild_only()
-async def ptero_restart(interaction: discord.Interaction, server_identifier: typing.Optional[str] = None):
+async def ptero_restart(interaction: discord.Interaction, server_identifier: typing.Optional[str] = None, wait: bool = False, timeout_seconds: app_commands.Range[int, 10, 600] = 180):
     await interaction.response.defer(ephemeral=False)
     guild_config = await check_guild_pterodactyl_config_and_respond(interaction)
     if not guild_config: return
-    await send_pterodactyl_power_command(interaction, guild_config, server_identifier, "restart", "Restart")
+    await send_pterodactyl_power_command(interaction, guild_config, server_identifier, "restart", "Restart", wait, timeout_seconds)
 
 @ptero_group.command(name="kill", description="Forces a Pterodactyl server to stop (kill).")
-@app_commands.describe(server_identifier="ID or alias of the server (optional, if default is set).")
+@app_commands.describe(server_identifier="ID or alias of the server (optional, if default is set).", wait="Wait until the server is offline and report how long it took", timeout_seconds="How long to wait (10-600 seconds)")
 @app_commands.checks.has_permissions(administrator=True)
 @app_commands.guild_only()
-async def ptero_kill(interaction: discord.Interaction, server_identifier: typing.Optional[str] = None):
+async def ptero_kill(interaction: discord.Interaction, server_identifier: typing.Optional[str] = None, wait: bool = False, timeout_seconds: app_commands.Range[int, 10, 600] = 180):
     await interaction.response.defer(ephemeral=False)
     guild_config = await check_guild_pterodactyl_config_and_respond(interaction)
     if not guild_config: return
-    await send_pterodactyl_power_command(interaction, guild_config, server_identifier, "kill", "Forced stop")
+    await send_pterodactyl_power_command(interaction, guild_config, server_identifier, "kill", "Forced stop", wait, timeout_seconds)
+
+POWER_ACTION_NAMES = {'start': "Start", 'stop': "Stop", 'restart': "Restart", 'kill': "Forced stop"}
+
+class ServerListPageCache:
+    def __init__(self, ttl: float = 30.0, max_entries: int = 500):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries = collections.OrderedDict()
+
+    def get(self, key: tuple):
+        entry = self._entries.get(key)
+        if entry is None or entry[1] < time.monotonic():
+            self._entries.pop(key, None)
+            return None
+        self._entries.move_to_end(key)
+        return entry[0]
+
+    def put(self, key: tuple, value):
+        self._entries[key] = (value, time.monotonic() + self.ttl)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate_panel(self, panel_url: typing.Optional[str]):
+        for key in [key for key in self._entries if key[0] == panel_url]:
+            del self._entries[key]
+
+server_list_page_cache = ServerListPageCache()
+
+class ServerIndex:
+    def __init__(self, entries: typing.List[typing.Tuple[str, str, str, bool]]):
+        self.entries = sorted(entries)
+        self._keys = [entry[0] for entry in self.entries]
+
+    def search(self, query: str, limit: int = 25, include_aliases: bool = True) -> typing.List[typing.Tuple[str, str]]:
+        query = query.lower().strip()
+        results = collections.OrderedDict()
+        for position in range(bisect.bisect_left(self._keys, query), len(self._keys)):
+            search_key, value, label, is_alias = self.entries[position]
+            if not search_key.startswith(query) or len(results) >= limit: break
+            if include_aliases or not is_alias: results.setdefault(value, label)
+        if len(results) < limit and query:
+            for search_key, value, label, is_alias in self.entries:
+                if query in search_key and (include_aliases or not is_alias): results.setdefault(value, label)
+                if len(results) >= limit: break
+        return list(results.items())
+
+class ServerIndexRegistry:
+    def __init__(self, warm_interval: float = 300.0):
+        self.warm_interval = warm_interval
+        self._panel_servers = {}
+        self._panel_versions = collections.defaultdict(int)
+        self._guild_indexes = {}
+        self._warmed_at = {}
+
+    def record_servers(self, guild_config: dict, servers: typing.List[dict]):
+        panel_key = panel_credential_key(guild_config)
+        known = self._panel_servers.setdefault(panel_key, {})
+        for attrs in servers:
+            identifier = attrs.get('identifier', attrs.get('uuid'))
+            if identifier: known[identifier] = (attrs.get('name', identifier), attrs.get('uuid', identifier))
+        self._panel_versions[panel_key] += 1
+
+    def invalidate_guild(self, guild_id_str: str):
+        self._guild_indexes.pop(guild_id_str, None)
+
+    def invalidate_panel(self, panel_url: typing.Optional[str]):
+        for panel_key in [panel_key for panel_key in self._panel_servers if panel_key[0] == panel_url]:
+            del self._panel_servers[panel_key]
+            self._panel_versions[panel_key] += 1
+        for panel_key in [panel_key for panel_key in self._warmed_at if panel_key[0] == panel_url]:
+            del self._warmed_at[panel_key]
+
+    def _warm(self, guild_config: dict, panel_key: tuple):
+        if time.monotonic() - self._warmed_at.get(panel_key, -self.warm_interval) < self.warm_interval: return
+        self._warmed_at[panel_key] = time.monotonic()
+        async def warm():
+            try: await fetch_server_list_page(guild_config, 1, 100)
+            except Exception: pass
+        create_background_task(warm())
+
+    def get(self, guild_id_str: str, guild_config: dict) -> ServerIndex:
+        panel_key = panel_credential_key(guild_config)
+        version = self._panel_versions[panel_key]
+        cached = self._guild_indexes.get(guild_id_str)
+        if cached is not None and cached[0] == version: return cached[1]
+        entries = []
+        for alias, server_id in guild_config.get('server_aliases', {}).items():
+            entries.append((alias, alias, f"{alias} → {server_id}", True))
+        known = self._panel_servers.get(panel_key)
+        if known is None and all(panel_key): self._warm(guild_config, panel_key)
+        for identifier, (name, server_uuid) in (known or {}).items():
+            label = f"{name} ({identifier})"
+            entries.append((name.lower(), identifier, label, False))
+            entries.append((identifier.lower(), identifier, label, False))
+            entries.append((server_uuid.lower(), identifier, label, False))
+        index = ServerIndex(entries)
+        self._guild_indexes[guild_id_str] = (version, index)
+        return index
+
+server_index = ServerIndexRegistry()
+
+async def server_identifier_autocomplete(interaction: discord.Interaction, current: str) -> typing.List[app_commands.Choice[str]]:
+    guild_config = get_guild_config(interaction.guild_id) if interaction.guild_id else None
+    if not guild_config: return []
+    matches = server_index.get(str(interaction.guild_id), guild_config).search(current)
+    return [app_commands.Choice(name=label[:100], value=value[:100]) for value, label in matches]
+
+async def panel_server_id_autocomplete(interaction: discord.Interaction, current: str) -> typing.List[app_commands.Choice[str]]:
+    guild_config = get_guild_config(interaction.guild_id) if interaction.guild_id else None
+    if not guild_config: return []
+    matches = server_index.get(str(interaction.guild_id), guild_config).search(current, include_aliases=False)
+    return [app_commands.Choice(name=label[:100], value=value[:100]) for value, label in matches]
+
+async def alias_name_autocomplete(interaction: discord.Interaction, current: str) -> typing.List[app_commands.Choice[str]]:
+    guild_config = get_guild_config(interaction.guild_id) if interaction.guild_id else None
+    if not guild_config: return []
+    aliases = sorted(guild_config.get('server_aliases', {}))
+    current = current.lower()
+    start = bisect.bisect_left(aliases, current)
+    matches = [alias for alias in aliases[start:start + 25] if alias.startswith(current)]
+    return [app_commands.Choice(name=alias[:100], value=alias[:100]) for alias in matches]
+
+async def fetch_server_list_page(guild_config: dict, page: int, per_page: int) -> typing.Tuple[typing.List[dict], dict]:
+    cache_key = (*panel_credential_key(guild_config), page, per_page)
+    cached = server_list_page_cache.get(cache_key)
+    metrics.cache_lookup('server_list_page', cached is not None)
+    if cached is not None: return cached
+    response = await ptero_client.get(guild_config, "/api/client", params={'page': page, 'per_page': per_page}, timeout=15)
+    data = response.json()
+    servers = [server_obj.get('attributes', {}) for server_obj in data.get('data', [])]
+    server_index.record_servers(guild_config, servers)
+    for attrs in servers:
+        if 'name' in attrs:
+            server_name_cache.put(guild_config, attrs.get('uuid'), attrs['name'])
+            server_name_cache.put(guild_config, attrs.get('identifier', attrs.get('uuid')), attrs['name'])
+    pagination = data.get('meta', {}).get('pagination', {})
+    server_list_page_cache.put(cache_key, (servers, pagination))
+    return servers, pagination
+
+async def fetch_all_pterodactyl_servers(guild_config: dict, per_page: int = 100) -> typing.List[dict]:
+    servers, pagination = await fetch_server_list_page(guild_config, 1, per_page)
+    remaining_pages = await asyncio.gather(*(fetch_server_list_page(guild_config, page, per_page) for page in range(2, pagination.get('total_pages', 1) + 1)))
+    return servers + [attrs for page_servers, _ in remaining_pages for attrs in page_servers]
+
+async def resolve_bulk_targets(guild_config: dict, targets: str) -> typing.List[typing.Tuple[str, str]]:
+    resolved = collections.OrderedDict()
+    if targets.strip().lower() == 'all':
+        for attrs in await fetch_all_pterodactyl_servers(guild_config):
+            resolved.setdefault(attrs.get('identifier', attrs.get('uuid')), attrs.get('name', attrs.get('uuid')))
+        return list(resolved.items())
+    aliases = guild_config.get('server_aliases', {})
+    for token in re.split(r'[,\s]+', targets.strip()):
+        if not token: continue
+        if any(char in token for char in '*?['):
+            for alias in sorted(fnmatch.filter(aliases, token.lower())):
+                resolved.setdefault(aliases[alias], alias)
+        else:
+            server_id = await resolve_server_identifier(guild_config, token)
+            resolved.setdefault(server_id, token if token.lower() in aliases else (get_cached_pterodactyl_server_name(guild_config, server_id) or server_id))
+    return list(resolved.items())
+
+class BulkPowerRun:
+    STATUS_ICONS = {'pending': "⏳", 'running': "🔄", 'done': "✅", 'conflict': "⚠️", 'failed': "❌"}
+
+    def __init__(self, guild_config: dict, action: str, targets: typing.List[typing.Tuple[str, str]], concurrency: int):
+        self.guild_config = guild_config
+        self.action = action
+        self.targets = targets
+        self.concurrency = concurrency
+        self.results = {server_id: ('pending', "") for server_id, _ in targets}
+        self.started_at = time.monotonic()
+        self.finished = False
+
+    async def _send_one(self, semaphore: asyncio.Semaphore, server_id: str):
+        async with semaphore:
+            self.results[server_id] = ('running', "")
+            try:
+                await ptero_client.post(self.guild_config, f"/api/client/servers/{server_id}/power", payload={'signal': self.action}, timeout=15)
+                self.results[server_id] = ('done', "sent")
+            except PterodactylHTTPError as errh:
+                status_code = errh.response.status_code
+                if status_code == 409: self.results[server_id] = ('conflict', "already in that state")
+                elif status_code == 404: self.results[server_id] = ('failed', "not found")
+                elif status_code == 403: self.results[server_id] = ('failed', "insufficient permissions")
+                elif status_code == 429: self.results[server_id] = ('failed', "rate limited by panel")
+                else: self.results[server_id] = ('failed', f"HTTP {status_code}")
+            except Exception as e:
+                self.results[server_id] = ('failed', str(e)[:60])
+
+    async def run(self):
+        semaphore = asyncio.Semaphore(self.concurrency)
+        await asyncio.gather(*(self._send_one(semaphore, server_id) for server_id, _ in self.targets))
+        self.finished = True
+
+    def build_embed(self) -> discord.Embed:
+        counts = collections.Counter(status for status, _ in self.results.values())
+        finished_count = counts['done'] + counts['conflict'] + counts['failed']
+        color = discord.Color.orange() if not self.finished else (discord.Color.green() if not counts['failed'] else discord.Color.red())
+        embed = discord.Embed(title=f"⚡ Bulk '{POWER_ACTION_NAMES[self.action]}' ({finished_count}/{len(self.targets)})", color=color)
+        label_width = min(max((len(label) for _, label in self.targets), default=0), 24)
+        lines = []
+        for server_id, label in self.targets:
+            status, detail = self.results[server_id]
+            lines.append(f"{self.STATUS_ICONS[status]} {label[:label_width]:<{label_width}} {detail}".rstrip())
+        table = ""
+        for index, line in enumerate(lines):
+            if len(table) + len(line) > 3800:
+                table += f"... and {len(lines) - index} more\n"
+                break
+            table += line + "\n"
+        embed.description = f"```\n{table}```"
+        embed.set_footer(text=f"✅ {counts['done']}  ⚠️ {counts['conflict']}  ❌ {counts['failed']} | Concurrency: {self.concurrency} | {time.monotonic() - self.started_at:.1f}s")
+        return embed
+
+@ptero_group.command(name="bulk_power", description="Sends a power action to many Pterodactyl servers at once.")
+@app_commands.describe(action="Power action to send", targets="Comma-separated IDs/aliases, an alias glob (e.g. 'mc-*'), or 'all' for every server on the panel", concurrency="How many servers to contact at the same time (1-20).")
+@app_commands.choices(action=[app_commands.Choice(name=friendly_name, value=signal) for signal, friendly_name in POWER_ACTION_NAMES.items()])
+@app_commands.checks.has_permissions(administrator=True)
+@app_commands.guild_only()
+async def ptero_bulk_power(interaction: discord.Interaction, action: app_commands.Choice[str], targets: str, concurrency: app_commands.Range[int, 1, 20] = 5):
+    await interaction.response.defer(ephemeral=False)
+    guild_config = await check_guild_pterodactyl_config_and_respond(interaction)
+    if not guild_config: return
+
+    try: resolved_targets = await resolve_bulk_targets(guild_config, targets)
+    except PterodactylError as e:
+        await interaction.followup.send(f"❌ Could not resolve targets: {e}")
+        return
+    if not resolved_targets:
+        await interaction.followup.send(f"❌ No servers matched `{targets}`.")
+        return
+
+    bulk_run = BulkPowerRun(guild_config, action.value, resolved_targets, concurrency)
+    progress_message = await send_pending_message(interaction, f"⏳ Sending '{action.name}' to {len(resolved_targets)} servers...")
+    run_task = asyncio.create_task(bulk_run.run())
+    while not run_task.done():
+        await asyncio.wait({run_task}, timeout=2.0)
+        if progress_message is not None:
+            try: await progress_message.edit(content=None, embed=bulk_run.build_embed())
+            except discord.HTTPException as e: log_event('bulk_power_progress_failed', logging.WARNING, error=str(e))
+    if progress_message is None: await interaction.followup.send(embed=bulk_run.build_embed())
 
 @ptero_group.command(name="command", description="Sends a command to the Pterodactyl server console.")
 @app_commands.describe(command="Command to send", server_identifier="ID or alias of the server (optional, if default is set).")
@@ -408,73 +2439,511 @@ async def ptero_command(interaction: discord.Interaction, command: str, server_i
     actual_ptero_server_id = await get_server_id_to_use(interaction, guild_config, server_identifier)
     if not actual_ptero_server_id: return
 
-    ptero_server_display_name = await get_pterodactyl_server_name(guild_config, actual_ptero_server_id)
-
-    initial_message = f"⏳ Sending command to **{ptero_server_display_name}**"
-    if server_identifier and server_identifier.lower() != actual_ptero_server_id.lower() and server_identifier.lower() != ptero_server_display_name.lower():
-        initial_message += f" (alias: `{server_identifier}`, ID: `{actual_ptero_server_id}`): `{command}`..."
-    else:
-        initial_message += f" (ID: `{actual_ptero_server_id}`): `{command}`..."
-    await interaction.followup.send(initial_message)
+    name_task = asyncio.create_task(get_pterodactyl_server_name(guild_config, actual_ptero_server_id))
+    request_task = asyncio.create_task(ptero_client.post(guild_config, f"/api/client/servers/{actual_ptero_server_id}/command", payload={'command': command}, timeout=10))
+    pending_display_name = get_cached_pterodactyl_server_name(guild_config, actual_ptero_server_id) or server_identifier or actual_ptero_server_id
+    pending_message = await send_pending_message(interaction, format_pending_message("⏳ Sending command to ", pending_display_name, server_identifier, actual_ptero_server_id, f": `{command}`"))
+    ptero_server_display_name = await name_task
 
-    api_url = f"{guild_config['panel_url']}/api/client/servers/{actual_ptero_server_id}/command"
-    payload_cmd = {'command': command}
-    api_headers = get_api_headers(guild_config['api_key'])
     try:
-        response = requests.post(api_url, headers=api_headers, json=payload_cmd, timeout=10)
-        response.raise_for_status()
-        await interaction.followup.send(f"✅ Command `{command}` sent to **{ptero_server_display_name}**.")
-    except requests.exceptions.HTTPError as errh:
+        await request_task
+        await finish_pending_message(interaction, pending_message, f"✅ Command `{command}` sent to **{ptero_server_display_name}**.")
+    except PterodactylHTTPError as errh:
         msg = f"HTTP Error: {errh.response.status_code}"
         resolved_id_for_error = actual_ptero_server_id or server_identifier
         if errh.response.status_code == 404: msg = f"❌ Pterodactyl server with ID `{resolved_id_for_error}` not found."
         elif errh.response.status_code == 403: msg = f"❌ Insufficient permissions (API key) to send commands to server `{resolved_id_for_error}`."
         elif errh.response.status_code == 502: msg = f"❌ Server `{resolved_id_for_error}` is likely not running (error 502)."
         else: msg += f" - {errh.response.text[:500]}"
-        await interaction.followup.send(msg)
-    except Exception as e: print(f"Error in ptero_command: {e}"); await interaction.followup.send(f"❌ Unexpected error: {e}")
+        await finish_pending_message(interaction, pending_message, msg)
+    except Exception as e: log_event('command_failed', logging.ERROR, command='command', error=str(e)); await finish_pending_message(interaction, pending_message, f"❌ Unexpected error: {e}")
+
+SCHEDULE_DURATION_PATTERN = re.compile(r'^(?:(\d+)d)?(?:(\d+)h)?(?:(\d+)m)?(?:(\d+)s)?$')
+SCHEDULE_MIN_INTERVAL_SECONDS = 60
+MAX_SCHEDULES_PER_GUILD = 25
+
+def parse_schedule_duration(text: str) -> typing.Optional[int]:
+    match = SCHEDULE_DURATION_PATTERN.match(text.strip().lower().replace(' ', ''))
+    if not match or not any(match.groups()): return None
+    days, hours, minutes, seconds = (int(part or 0) for part in match.groups())
+    return days * 86400 + hours * 3600 + minutes * 60 + seconds
+
+def parse_schedule_start(text: str, now: float) -> typing.Optional[float]:
+    text = text.strip()
+    time_of_day = re.match(r'^(\d{1,2}):(\d{2})$', text)
+    if time_of_day:
+        hour, minute = int(time_of_day.group(1)), int(time_of_day.group(2))
+        if hour > 23 or minute > 59: return None
+        current = datetime.datetime.fromtimestamp(now, datetime.timezone.utc)
+        candidate = current.replace(hour=hour, minute=minute, second=0, microsecond=0)
+        if candidate.timestamp() <= now: candidate += datetime.timedelta(days=1)
+        return candidate.timestamp()
+    try:
+        moment = datetime.datetime.fromisoformat(text)
+        if moment.tzinfo is None: moment = moment.replace(tzinfo=datetime.timezone.utc)
+        return moment.timestamp()
+    except ValueError: pass
+    delay = parse_schedule_duration(text)
+    return now + delay if delay is not None else None
+
+def format_schedule_duration(seconds: int) -> str:
+    parts = []
+    for unit_seconds, unit in ((86400, 'd'), (3600, 'h'), (60, 'm'), (1, 's')):
+        if seconds >= unit_seconds:
+            parts.append(f"{seconds // unit_seconds}{unit}")
+            seconds %= unit_seconds
+    return "".join(parts) or "0s"
+
+def describe_scheduled_action(job: dict) -> str:
+    return f"console `{job['command']}`" if job['action'] == 'command' else POWER_ACTION_NAMES.get(job['action'], job['action'])
+
+class ActionScheduler:
+    def __init__(self, spread_seconds: float = 2.0):
+        self.spread_seconds = spread_seconds
+        self._heap = []
+        self._sequence = 0
+        self._panel_next_slot = {}
+        self._wake = None
+        self._task = None
+
+    def _push(self, fire_at: float, guild_id_str: str, job_id: str, due: float, slotted: bool = False):
+        self._sequence += 1
+        heapq.heappush(self._heap, (fire_at, self._sequence, guild_id_str, job_id, due, slotted))
+        if self._wake: self._wake.set()
+
+    def schedule(self, guild_id_str: str, job: dict):
+        self._push(job['next_run'], guild_id_str, job['id'], job['next_run'])
+
+    def load(self):
+        for guild_id_str, guild_config in list(ALL_GUILD_CONFIGS.items()):
+            for job in guild_config.get('schedules', {}).values():
+                self.schedule(guild_id_str, job)
+
+    def _current_job(self, guild_id_str: str, job_id: str, due: float) -> typing.Optional[dict]:
+        job = ALL_GUILD_CONFIGS.get(guild_id_str, {}).get('schedules', {}).get(job_id)
+        # Heap entries are never removed in place; an entry is stale once its job was deleted or rescheduled.
+        return job if job is not None and job['next_run'] == due else None
+
+    def _advance(self, guild_id_str: str, job: dict, now: float):
+        if job.get('every'):
+            missed_runs = int((now - job['next_run']) // job['every']) + 1
+            job['next_run'] = job['next_run'] + max(missed_runs, 1) * job['every']
+            self.schedule(guild_id_str, job)
+        else:
+            ALL_GUILD_CONFIGS[guild_id_str]['schedules'].pop(job['id'], None)
+        # Persist the new next_run before firing, so a reload during the request cannot bring back the due run from disk.
+        save_guild_config(guild_id_str)
 
-@ptero_group.command(name="join_queue", description="Joins the queue for a Pterodactyl server.")
-@app_commands.describe(server_identifier="ID or alias of the server (optional, if default is set).")
+    async def _fire(self, guild_id_str: str, job: dict):
+        guild_config = ALL_GUILD_CONFIGS.get(guild_id_str, {})
+        try:
+            if job['action'] == 'command':
+                await ptero_client.post(guild_config, f"/api/client/servers/{job['server_uuid']}/command", payload={'command': job['command']}, timeout=10)
+            else:
+                await ptero_client.post(guild_config, f"/api/client/servers/{job['server_uuid']}/power", payload={'signal': job['action']}, timeout=15)
+            outcome = 'ok'; result = "✅ OK"
+        except PterodactylHTTPError as errh:
+            outcome = 'conflict' if errh.response.status_code == 409 else 'failed'; result = f"{'⚠️' if outcome == 'conflict' else '❌'} HTTP {errh.response.status_code}"
+        except Exception as e:
+            outcome = 'failed'; result = f"❌ {e}"
+        metrics.inc('ptero_scheduled_runs_total', action=job['action'], outcome=outcome)
+        log_event('scheduled_run', logging.INFO if outcome == 'ok' else logging.WARNING, guild=guild_id_str, schedule=job['id'], action=job['action'], server=job['server_uuid'], outcome=outcome)
+        job = ALL_GUILD_CONFIGS.get(guild_id_str, {}).get('schedules', {}).get(job['id'], job)
+        job['last_run'] = time.time(); job['last_result'] = result
+        save_guild_config(guild_id_str)
+        if outcome == 'failed' and job.get('channel_id'):
+            channel = bot.get_channel(job['channel_id'])
+            if channel is not None:
+                try: await channel.send(f"{result} — scheduled {describe_scheduled_action(job)} (`{job['id']}`) on `{job['server_uuid']}` failed.")
+                except discord.HTTPException as e: log_event('scheduled_run_report_failed', logging.WARNING, guild=guild_id_str, schedule=job['id'], error=str(e))
+
+    async def _run(self):
+        while True:
+            self._wake.clear()
+            if not self._heap:
+                await self._wake.wait()
+                continue
+            delay = self._heap[0][0] - time.time()
+            if delay > 0:
+                try: await asyncio.wait_for(self._wake.wait(), timeout=delay)
+                except asyncio.TimeoutError: pass
+                continue
+            fire_at, _, guild_id_str, job_id, due, slotted = heapq.heappop(self._heap)
+            job = self._current_job(guild_id_str, job_id, due)
+            if job is None: continue
+            now = time.time()
+            panel_url = ALL_GUILD_CONFIGS[guild_id_str].get('panel_url')
+            if not slotted:
+                slot = max(now, self._panel_next_slot.get(panel_url, 0.0))
+                self._panel_next_slot[panel_url] = slot + self.spread_seconds
+                if slot > now:
+                    self._push(slot, guild_id_str, job_id, due, slotted=True)
+                    continue
+            self._advance(guild_id_str, job, now)
+            create_background_task(self._fire(guild_id_str, job))
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._wake = asyncio.Event()
+            self.load()
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            self._task = None
+
+action_scheduler = ActionScheduler()
+
+schedule_group = app_commands.Group(name="schedule", description="Manage scheduled power actions and console commands", parent=ptero_group)
+
+SCHEDULE_ACTION_CHOICES = [app_commands.Choice(name=friendly_name, value=signal) for signal, friendly_name in POWER_ACTION_NAMES.items()] + [app_commands.Choice(name="Console command", value='command')]
+
+@schedule_group.command(name="add", description="Schedules a one-shot or recurring power action or console command.")
+@app_commands.describe(action="What to run", start_at="First run: HH:MM (UTC), an ISO date/time, or a delay such as '30m' or '2h'", server_identifier="ID or alias of the server (optional, if default is set).", every="Repeat interval such as '24h' or '1d12h' (leave empty for a one-shot action)", command="Console command to send (only for 'Console command')")
+@app_commands.choices(action=SCHEDULE_ACTION_CHOICES)
 @app_commands.checks.has_permissions(administrator=True)
 @app_commands.guild_only()
-async def ptero_join_queue(interaction: discord.Interaction, server_identifier: typing.Optional[str] = None):
-    await interaction.response.defer(ephemeral=False)
+async def ptero_schedule(interaction: discord.Interaction, action: app_commands.Choice[str], start_at: str, server_identifier: typing.Optional[str] = None, every: typing.Optional[str] = None, command: typing.Optional[str] = None):
+    if action.value == 'command' and not command:
+        await interaction.response.send_message("❌ The `command` option is required for scheduled console commands.", ephemeral=True)
+        return
+    now = time.time()
+    next_run = parse_schedule_start(start_at, now)
+    if next_run is None:
+        await interaction.response.send_message("❌ Invalid `start_at`. Use `HH:MM` (UTC), an ISO date/time such as `2024-05-01 03:00`, or a delay such as `30m`.", ephemeral=True)
+        return
+    interval = None
+    if every:
+        interval = parse_schedule_duration(every)
+        if interval is None or interval < SCHEDULE_MIN_INTERVAL_SECONDS:
+            await interaction.response.send_message(f"❌ Invalid `every`. Use a duration such as `6h` or `1d`; the minimum is {SCHEDULE_MIN_INTERVAL_SECONDS} seconds.", ephemeral=True)
+            return
+    await interaction.response.defer(ephemeral=True)
     guild_config = await check_guild_pterodactyl_config_and_respond(interaction)
     if not guild_config: return
 
     actual_ptero_server_id = await get_server_id_to_use(interaction, guild_config, server_identifier)
     if not actual_ptero_server_id: return
 
+    guild_id_str = str(interaction.guild.id)
+    schedules = ALL_GUILD_CONFIGS[guild_id_str].setdefault('schedules', {})
+    if len(schedules) >= MAX_SCHEDULES_PER_GUILD:
+        await interaction.followup.send(f"❌ This guild already has {MAX_SCHEDULES_PER_GUILD} scheduled actions. Remove one with `/ptero schedule remove` first.", ephemeral=True)
+        return
+    job_id = format(random.getrandbits(24), '06x')
+    while job_id in schedules: job_id = format(random.getrandbits(24), '06x')
+    job = {'id': job_id, 'action': action.value, 'command': command if action.value == 'command' else None, 'server_uuid': actual_ptero_server_id, 'next_run': next_run, 'every': interval, 'channel_id': interaction.channel_id, 'created_by': interaction.user.id, 'last_run': None, 'last_result': None}
+    schedules[job_id] = job
+    save_guild_config(guild_id_str)
+    action_scheduler.schedule(guild_id_str, job)
     ptero_server_display_name = await get_pterodactyl_server_name(guild_config, actual_ptero_server_id)
+    repeat_text = f", then every {format_schedule_duration(interval)}" if interval else " (once)"
+    await interaction.followup.send(f"✅ Scheduled {describe_scheduled_action(job)} on **{ptero_server_display_name}** at <t:{int(next_run)}:f>{repeat_text}. Schedule ID: `{job_id}`", ephemeral=True)
 
-    initial_message = f"⏳ Attempting to join queue for: **{ptero_server_display_name}**"
-    if server_identifier and server_identifier.lower() != actual_ptero_server_id.lower() and server_identifier.lower() != ptero_server_display_name.lower():
-        initial_message += f" (alias: `{server_identifier}`, ID: `{actual_ptero_server_id}`)..."
-    else:
-        initial_message += f" (ID: `{actual_ptero_server_id}`)..."
-    await interaction.followup.send(initial_message)
+@schedule_group.command(name="list", description="Lists scheduled actions for this guild.")
+@app_commands.checks.has_permissions(administrator=True)
+@app_commands.guild_only()
+async def ptero_schedules(interaction: discord.Interaction):
+    schedules = ALL_GUILD_CONFIGS.get(str(interaction.guild.id), {}).get('schedules', {})
+    if not schedules:
+        await interaction.response.send_message("ℹ️ No scheduled actions. Add one with `/ptero schedule add`.", ephemeral=True)
+        return
+    embed = discord.Embed(title=f"🗓️ Scheduled Actions for {interaction.guild.name}", color=discord.Color.blurple())
+    for job in sorted(schedules.values(), key=lambda job: job['next_run']):
+        value = f"Server: `{job['server_uuid']}`\nNext: <t:{int(job['next_run'])}:f> (<t:{int(job['next_run'])}:R>)\nRepeat: {'every ' + format_schedule_duration(job['every']) if job.get('every') else 'once'}"
+        if job.get('last_run'): value += f"\nLast: <t:{int(job['last_run'])}:R> — {job['last_result']}"
+        embed.add_field(name=f"`{job['id']}` · {describe_scheduled_action(job)}", value=value, inline=False)
+    await interaction.response.send_message(embed=embed, ephemeral=True)
 
-    api_url = f"{guild_config['panel_url']}/api/client/servers/{actual_ptero_server_id}/join-queue"
-    api_headers = get_api_headers(guild_config['api_key'])
-    try:
-        response = requests.post(api_url, headers=api_headers, timeout=15)
-        response.raise_for_status()
+@schedule_group.command(name="remove", description="Removes a scheduled action.")
+@app_commands.describe(schedule_id="ID of the scheduled action (see /ptero schedule list)")
+@app_commands.checks.has_permissions(administrator=True)
+@app_commands.guild_only()
+async def ptero_unschedule(interaction: discord.Interaction, schedule_id: str):
+    guild_id_str = str(interaction.guild.id)
+    schedules = ALL_GUILD_CONFIGS.get(guild_id_str, {}).get('schedules', {})
+    job = schedules.pop(schedule_id.strip().lower(), None)
+    if job is None:
+        await interaction.response.send_message(f"❌ No scheduled action with ID `{schedule_id}`.", ephemeral=True)
+        return
+    save_guild_config(guild_id_str)
+    await interaction.response.send_message(f"✅ Removed scheduled {describe_scheduled_action(job)} (`{job['id']}`).", ephemeral=True)
+
+async def schedule_id_autocomplete(interaction: discord.Interaction, current: str) -> typing.List[app_commands.Choice[str]]:
+    schedules = ALL_GUILD_CONFIGS.get(str(interaction.guild_id), {}).get('schedules', {})
+    current = current.lower()
+    return [app_commands.Choice(name=f"{job['id']} · {describe_scheduled_action(job)} · {job['server_uuid']}"[:100], value=job['id']) for job in schedules.values() if current in job['id'] or current in describe_scheduled_action(job).lower()][:25]
+
+QUEUE_STATE_FILE = "ptero_queues.json" if SHARD_IDS is None else f"ptero_queues.shards-{'-'.join(map(str, SHARD_IDS))}.json"
+
+class FenwickTree:
+    def __init__(self, size: int = 64):
+        self.size = size
+        self._tree = [0] * (size + 1)
+
+    def add(self, index: int, delta: int):
+        while index <= self.size:
+            self._tree[index] += delta
+            index += index & -index
+
+    def prefix_sum(self, index: int) -> int:
+        total = 0
+        while index > 0:
+            total += self._tree[index]
+            index -= index & -index
+        return total
+
+    def find_kth(self, k: int) -> int:
+        index = 0
+        step = 1 << self.size.bit_length()
+        while step:
+            next_index = index + step
+            if next_index <= self.size and self._tree[next_index] < k:
+                index = next_index
+                k -= self._tree[next_index]
+            step >>= 1
+        return index + 1
+
+class ServerQueue:
+    # Pterodactyl reports no player counts, so "slots" is a number set by an admin, not the game server's real capacity.
+    def __init__(self, slots: int = 1, admit_seconds: int = 600):
+        self.slots = slots
+        self.admit_seconds = admit_seconds
+        self.admitted = {}
+        self._tree = FenwickTree()
+        self._next_ticket = 1
+        self._tickets = {}
+        self._waiting = {}
+
+    def __len__(self) -> int:
+        return len(self._tickets)
+
+    def _rebuild(self):
+        ordered = [self._waiting[ticket] for ticket in sorted(self._waiting)]
+        size = 64
+        while size < len(ordered) * 2 + 1: size *= 2
+        self._tree = FenwickTree(size)
+        self._tickets = {}
+        self._waiting = {}
+        for ticket, entry in enumerate(ordered, start=1):
+            self._tickets[entry[0]] = ticket
+            self._waiting[ticket] = entry
+            self._tree.add(ticket, 1)
+        self._next_ticket = len(ordered) + 1
+
+    def join(self, user_id: int, channel_id: typing.Optional[int]) -> int:
+        if user_id in self._tickets: return self.position(user_id)
+        if self._next_ticket > self._tree.size: self._rebuild()
+        ticket = self._next_ticket
+        self._next_ticket += 1
+        self._tickets[user_id] = ticket
+        self._waiting[ticket] = (user_id, channel_id)
+        self._tree.add(ticket, 1)
+        return self.position(user_id)
+
+    def leave(self, user_id: int) -> bool:
+        if self.admitted.pop(user_id, None) is not None: return True
+        ticket = self._tickets.pop(user_id, None)
+        if ticket is None: return False
+        del self._waiting[ticket]
+        self._tree.add(ticket, -1)
+        return True
+
+    def position(self, user_id: int) -> typing.Optional[int]:
+        ticket = self._tickets.get(user_id)
+        return self._tree.prefix_sum(ticket) if ticket is not None else None
+
+    def pop_head(self) -> typing.Optional[typing.Tuple[int, typing.Optional[int]]]:
+        if not self._tickets: return None
+        ticket = self._tree.find_kth(1)
+        user_id, channel_id = self._waiting.pop(ticket)
+        del self._tickets[user_id]
+        self._tree.add(ticket, -1)
+        return user_id, channel_id
+
+    def expire_admissions(self, now: float):
+        for user_id in [user_id for user_id, (admitted_until, _) in self.admitted.items() if admitted_until <= now]:
+            del self.admitted[user_id]
+
+    def to_dict(self) -> dict:
+        return {
+            'slots': self.slots,
+            'admit_seconds': self.admit_seconds,
+            'waiting': [list(self._waiting[ticket]) for ticket in sorted(self._waiting)],
+            'admitted': {str(user_id): list(entry) for user_id, entry in self.admitted.items()},
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'ServerQueue':
+        queue = cls(data.get('slots', data.get('capacity', 1)), data.get('admit_seconds', 600))
+        for user_id, channel_id in data.get('waiting', []):
+            queue.join(user_id, channel_id)
+        queue.admitted = {int(user_id): tuple(entry) for user_id, entry in data.get('admitted', {}).items()}
+        return queue
+
+class QueueEngine:
+    def __init__(self, path: str, check_interval: float = 10.0, debounce_seconds: float = 2.0, max_concurrent_checks: int = 10):
+        self.path = path
+        self.check_interval = check_interval
+        self.debounce_seconds = debounce_seconds
+        self.max_concurrent_checks = max_concurrent_checks
+        self.queues = {}
+        self.loaded = asyncio.Event()
+        self._task = None
+        self._save_task = None
+        self._dirty = False
+        self._save_lock = asyncio.Lock()
+
+    def _read(self) -> dict:
         try:
-            response_data = response.json(); message = response_data.get('attributes', {}).get('message', "Join request sent.")
-            position = response_data.get('attributes', {}).get('position')
-            if position is not None: message += f" Position: {position}."
-            await interaction.followup.send(f"✅ {message} (Server: **{ptero_server_display_name}**)")
-        except json.JSONDecodeError: await interaction.followup.send(f"✅ Join queue request sent for **{ptero_server_display_name}**.")
-    except requests.exceptions.HTTPError as errh:
-        error_message = f"HTTP Error: {errh.response.status_code}"
-        try: error_details = errh.response.json().get('errors', [{}])[0].get('detail', 'API error.')
-        except: error_details = errh.response.text[:100]
-        error_message += f" - {error_details}"
-        resolved_id_for_error = actual_ptero_server_id or server_identifier
-        if errh.response.status_code == 409: error_message = f"⚠️ Cannot join queue for `{resolved_id_for_error}`. {error_details}"
-        await interaction.followup.send(f"❌ {error_message}")
-    except Exception as e: print(f"Error in ptero_join_queue: {e}"); await interaction.followup.send(f"❌ Unexpected error: {e}")
+            with open(self.path, 'r') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except json.JSONDecodeError:
+            log_event('queue_state_corrupted', logging.WARNING, path=self.path)
+            return {}
+
+    async def load(self):
+        data = await asyncio.get_running_loop().run_in_executor(None, self._read)
+        for key, queue_data in data.items():
+            guild_id_str, server_uuid = key.split(':', 1)
+            if owns_guild(guild_id_str): self.queues[(guild_id_str, server_uuid)] = ServerQueue.from_dict(queue_data)
+        self.loaded.set()
+
+    def queue_for(self, guild_id_str: str, server_uuid: str) -> ServerQueue:
+        queue = self.queues.get((guild_id_str, server_uuid))
+        if queue is None:
+            queue = self.queues[(guild_id_str, server_uuid)] = ServerQueue()
+        return queue
+
+    def find_queue(self, guild_id_str: str, server_uuid: str) -> typing.Optional[ServerQueue]:
+        return self.queues.get((guild_id_str, server_uuid))
+
+    def mark_dirty(self):
+        self._dirty = True
+        if self._save_task is None or self._save_task.done():
+            self._save_task = asyncio.create_task(self._save_later())
+
+    async def _save_later(self):
+        # Changes made while a save is writing leave _dirty set, so they get their own save.
+        while self._dirty:
+            await asyncio.sleep(self.debounce_seconds)
+            await self.save()
+
+    async def save(self):
+        async with self._save_lock:
+            self._dirty = False
+            data = json.dumps({f"{guild_id_str}:{server_uuid}": queue.to_dict() for (guild_id_str, server_uuid), queue in self.queues.items() if len(queue) or queue.admitted or queue.slots != 1 or queue.admit_seconds != 600})
+            try: await asyncio.get_running_loop().run_in_executor(None, write_file_atomically, self.path, data)
+            except OSError as e:
+                self._dirty = True
+                log_event('queue_state_save_failed', logging.CRITICAL, path=self.path, error=str(e))
+
+    async def notify(self, user_id: int, channel_id: typing.Optional[int], text: str):
+        try:
+            user = bot.get_user(user_id) or await bot.fetch_user(user_id)
+            await user.send(text)
+            return
+        except discord.HTTPException: pass
+        channel = bot.get_channel(channel_id) if channel_id else None
+        if channel is not None:
+            try: await channel.send(f"<@{user_id}> {text}", allowed_mentions=discord.AllowedMentions(users=True))
+            except discord.HTTPException as e: log_event('queue_notification_failed', logging.WARNING, user=user_id, error=str(e))
+
+    async def _advance(self, guild_id_str: str, server_uuid: str, queue: ServerQueue):
+        guild_config = ALL_GUILD_CONFIGS.get(guild_id_str)
+        if not guild_config or not guild_config.get('panel_url') or not guild_config.get('api_key'): return
+        try: data, _ = await resource_poller.get(guild_config, server_uuid, max_age=self.check_interval * 3)
+        except PterodactylError: return
+        if data.get('attributes', {}).get('current_state') != 'running': return
+        display_name = await get_pterodactyl_server_name(guild_config, server_uuid)
+        while len(queue.admitted) < queue.slots and len(queue):
+            user_id, channel_id = queue.pop_head()
+            queue.admitted[user_id] = (time.time() + queue.admit_seconds, channel_id)
+            self.mark_dirty()
+            await self.notify(user_id, channel_id, f"🎮 It's your turn on **{display_name}**! Your slot is reserved for {queue.admit_seconds // 60} minutes.")
+
+    async def _advance_quietly(self, semaphore: asyncio.Semaphore, guild_id_str: str, server_uuid: str, queue: ServerQueue):
+        async with semaphore:
+            try: await self._advance(guild_id_str, server_uuid, queue)
+            except Exception as e: log_event('queue_advance_failed', logging.ERROR, guild=guild_id_str, server=server_uuid, error=str(e))
+
+    async def check_queues(self, semaphore: asyncio.Semaphore):
+        now = time.time()
+        waiting = []
+        for (guild_id_str, server_uuid), queue in list(self.queues.items()):
+            admitted_before = len(queue.admitted)
+            queue.expire_admissions(now)
+            if len(queue.admitted) != admitted_before: self.mark_dirty()
+            if len(queue) and len(queue.admitted) < queue.slots: waiting.append((guild_id_str, server_uuid, queue))
+        # Checked concurrently so one slow panel does not hold up queues on every other panel.
+        await asyncio.gather(*(self._advance_quietly(semaphore, *entry) for entry in waiting))
+
+    async def _run(self):
+        await self.loaded.wait()
+        semaphore = asyncio.Semaphore(self.max_concurrent_checks)
+        while True:
+            await self.check_queues(semaphore)
+            await asyncio.sleep(self.check_interval)
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            self._task = None
+        if self.loaded.is_set(): await self.save()
+
+queue_engine = QueueEngine(QUEUE_STATE_FILE)
+
+async def resolve_queue_target(interaction: discord.Interaction, server_identifier: typing.Optional[str]) -> typing.Optional[typing.Tuple[dict, str, str]]:
+    guild_config = await check_guild_pterodactyl_config_and_respond(interaction)
+    if not guild_config: return None
+    actual_ptero_server_id = await get_server_id_to_use(interaction, guild_config, server_identifier)
+    if not actual_ptero_server_id: return None
+    await queue_engine.loaded.wait()
+    return guild_config, actual_ptero_server_id, await get_pterodactyl_server_name(guild_config, actual_ptero_server_id)
+
+@ptero_group.command(name="join_queue", description="Joins the queue for a Pterodactyl server.")
+@app_commands.describe(server_identifier="ID or alias of the server (optional, if default is set).")
+@app_commands.checks.has_permissions(administrator=True)
+@app_commands.guild_only()
+async def ptero_join_queue(interaction: discord.Interaction, server_identifier: typing.Optional[str] = None):
+    await interaction.response.defer(ephemeral=False)
+    target = await resolve_queue_target(interaction, server_identifier)
+    if not target: return
+    guild_config, actual_ptero_server_id, ptero_server_display_name = target
+
+    queue = queue_engine.queue_for(str(interaction.guild.id), actual_ptero_server_id)
+    if interaction.user.id in queue.admitted:
+        await interaction.followup.send(f"ℹ️ You already have a slot on **{ptero_server_display_name}**.")
+        return
+    already_queued = queue.position(interaction.user.id) is not None
+    position = queue.join(interaction.user.id, interaction.channel_id)
+    queue_engine.mark_dirty()
+    message = "You are already in the queue" if already_queued else "You joined the queue"
+    await interaction.followup.send(f"✅ {message} for **{ptero_server_display_name}**. Position: {position}. You will be notified when it's your turn.")
+
+@ptero_group.command(name="leave_queue", description="Leaves the queue (or frees your slot) for a Pterodactyl server.")
+@app_commands.describe(server_identifier="ID or alias of the server (optional, if default is set).")
+@app_commands.checks.has_permissions(administrator=True)
+@app_commands.guild_only()
+async def ptero_leave_queue(interaction: discord.Interaction, server_identifier: typing.Optional[str] = None):
+    await interaction.response.defer(ephemeral=True)
+    target = await resolve_queue_target(interaction, server_identifier)
+    if not target: return
+    guild_config, actual_ptero_server_id, ptero_server_display_name = target
+
+    queue = queue_engine.find_queue(str(interaction.guild.id), actual_ptero_server_id)
+    if queue is not None and queue.leave(interaction.user.id):
+        queue_engine.mark_dirty()
+        await interaction.followup.send(f"✅ You left the queue for **{ptero_server_display_name}**.", ephemeral=True)
+    else:
+        await interaction.followup.send(f"ℹ️ You are not in the queue for **{ptero_server_display_name}**.", ephemeral=True)
 
 @ptero_group.command(name="queue_status", description="Checks the status of the queue for a Pterodactyl server.")
 @app_commands.describe(server_identifier="ID or alias of the server (optional, if default is set).")
@@ -482,45 +2951,108 @@ async def ptero_join_queue(interaction: discord.Interaction, server_identifier:
 @app_commands.guild_only()
 async def ptero_queue_status(interaction: discord.Interaction, server_identifier: typing.Optional[str] = None):
     await interaction.response.defer(ephemeral=False)
-    guild_config = await check_guild_pterodactyl_config_and_respond(interaction)
-    if not guild_config: return
+    target = await resolve_queue_target(interaction, server_identifier)
+    if not target: return
+    guild_config, actual_ptero_server_id, ptero_server_display_name = target
+
+    queue = queue_engine.find_queue(str(interaction.guild.id), actual_ptero_server_id) or ServerQueue()
+    position = queue.position(interaction.user.id)
+    is_queued = position is not None
+    embed = discord.Embed(title=f"⏳ Queue Status: {ptero_server_display_name}", description=f"Pterodactyl ID: `{actual_ptero_server_id}`", color=discord.Color.blue() if is_queued else discord.Color.light_grey())
+    embed.add_field(name="In Queue?", value="Yes ✅" if is_queued else "No ❌", inline=True); embed.add_field(name="Queue Length", value=str(len(queue)), inline=True)
+    embed.add_field(name="Slots in Use", value=f"{len(queue.admitted)} / {queue.slots}", inline=True)
+    if interaction.user.id in queue.admitted:
+        embed.add_field(name="Your Slot", value=f"Reserved until <t:{int(queue.admitted[interaction.user.id][0])}:t>", inline=True)
+    if is_queued:
+        embed.add_field(name="Your Position", value=str(position), inline=True)
+        estimated_time_seconds = -(-position // queue.slots) * queue.admit_seconds
+        minutes, seconds = divmod(estimated_time_seconds, 60)
+        estimated_time_str = f"{minutes} min {seconds} sec" if minutes > 0 else f"{seconds} sec"
+        embed.add_field(name="Estimated Time", value=f"up to {estimated_time_str}", inline=True)
+    embed.set_footer(text=f"Discord Guild: {interaction.guild.name} | By: {interaction.user.display_name}"); embed.timestamp = discord.utils.utcnow()
+    await interaction.followup.send(embed=embed)
+
+@ptero_group.command(name="queue_config", description="Configures the bot-side queue for a Pterodactyl server.")
+@app_commands.describe(server_identifier="ID or alias of the server", slots="How many queued users may play at the same time (set by you; the panel does not report player counts)", slot_minutes="How long an admitted user keeps their slot")
+@app_commands.checks.has_permissions(administrator=True)
+@app_commands.guild_only()
+async def ptero_queue_config(interaction: discord.Interaction, server_identifier: str, slots: app_commands.Range[int, 1, 500], slot_minutes: app_commands.Range[int, 1, 1440] = 10):
+    await interaction.response.defer(ephemeral=True)
+    target = await resolve_queue_target(interaction, server_identifier)
+    if not target: return
+    guild_config, actual_ptero_server_id, ptero_server_display_name = target
+
+    queue = queue_engine.queue_for(str(interaction.guild.id), actual_ptero_server_id)
+    queue.slots = slots
+    queue.admit_seconds = slot_minutes * 60
+    queue_engine.mark_dirty()
+    await interaction.followup.send(f"✅ Queue for **{ptero_server_display_name}** now admits {slots} user(s) at a time for {slot_minutes} minute(s) each.", ephemeral=True)
+
+LIST_SERVERS_PAGE_SIZE = 15
+
+def format_server_list_error(error: Exception) -> str:
+    if isinstance(error, PterodactylHTTPError):
+        msg = f"HTTP Error while fetching server list: {error.response.status_code}"
+        if error.response.status_code == 403: msg += " - Insufficient permissions (API key) to list servers."
+        else:
+            try: msg += f" - {error.response.json().get('errors', [{}])[0].get('detail', error.response.text[:100])}"
+            except: msg += f" - {error.response.text[:100]}"
+        return f"❌ {msg}"
+    if isinstance(error, PterodactylConnectionError):
+        return f"❌ A connection error occurred while fetching the server list: {error}"
+    log_event('command_failed', logging.ERROR, command='list_servers', error=str(error))
+    return "❌ An unexpected error occurred while fetching the server list."
+
+class ServerListView(discord.ui.View):
+    def __init__(self, guild_config: dict, total_pages: int):
+        super().__init__(timeout=300)
+        self.guild_config = guild_config
+        self.page = 1
+        self.total_pages = total_pages
+        self.message = None
+        self._update_buttons()
+
+    def _update_buttons(self):
+        self.previous_page.disabled = self.page <= 1
+        self.next_page.disabled = self.page >= self.total_pages
+
+    def build_embed(self, servers: typing.List[dict], pagination: dict) -> discord.Embed:
+        output_text = []
+        for attrs in servers:
+            server_uuid = attrs.get('uuid', 'No UUID')
+            output_text.append(f"**Name:** `{attrs.get('name', 'No Name')}`\n  **ID (identifier):** `{attrs.get('identifier', server_uuid)}`\n  **UUID:** `{server_uuid}`\n")
+        embed = discord.Embed(
+            title=f"🖥️ Available Pterodactyl Servers ({pagination.get('total', len(servers))})",
+            description=f"Panel: `{self.guild_config['panel_url']}`\n\n" + "\n".join(output_text),
+            color=discord.Color.dark_teal()
+        )
+        embed.set_footer(text=f"Page {self.page}/{self.total_pages}")
+        return embed
 
-    actual_ptero_server_id = await get_server_id_to_use(interaction, guild_config, server_identifier)
-    if not actual_ptero_server_id: return
+    async def show_page(self, interaction: discord.Interaction, page: int):
+        await interaction.response.defer()
+        try:
+            servers, pagination = await fetch_server_list_page(self.guild_config, page, LIST_SERVERS_PAGE_SIZE)
+        except Exception as e:
+            await interaction.followup.send(format_server_list_error(e), ephemeral=True)
+            return
+        self.page = page
+        self.total_pages = max(pagination.get('total_pages', self.total_pages), 1)
+        self._update_buttons()
+        await interaction.edit_original_response(embed=self.build_embed(servers, pagination), view=self)
 
-    ptero_server_display_name = await get_pterodactyl_server_name(guild_config, actual_ptero_server_id)
+    @discord.ui.button(label="◀ Previous", style=discord.ButtonStyle.secondary)
+    async def previous_page(self, interaction: discord.Interaction, button: discord.ui.Button):
+        await self.show_page(interaction, self.page - 1)
 
-    initial_message = f"⏳ Checking queue status for: **{ptero_server_display_name}**"
-    if server_identifier and server_identifier.lower() != actual_ptero_server_id.lower() and server_identifier.lower() != ptero_server_display_name.lower():
-        initial_message += f" (alias: `{server_identifier}`, ID: `{actual_ptero_server_id}`)..."
-    else:
-        initial_message += f" (ID: `{actual_ptero_server_id}`)..."
-    await interaction.followup.send(initial_message)
+    @discord.ui.button(label="Next ▶", style=discord.ButtonStyle.secondary)
+    async def next_page(self, interaction: discord.Interaction, button: discord.ui.Button):
+        await self.show_page(interaction, self.page + 1)
 
-    api_url = f"{guild_config['panel_url']}/api/client/servers/{actual_ptero_server_id}"
-    api_headers = get_api_headers(guild_config['api_key'])
-    try:
-        response = requests.get(api_url, headers=api_headers, timeout=10)
-        response.raise_for_status()
-        data = response.json(); attributes = data.get('attributes', {})
-        is_queued = attributes.get('is_queued', False); position = attributes.get('position')
-        estimated_time_seconds = attributes.get('estimated_time_seconds'); queue_length = attributes.get('queue_length', 0)
-        embed = discord.Embed(title=f"რი Queue Status: {ptero_server_display_name}", description=f"Pterodactyl ID: `{actual_ptero_server_id}`", color=discord.Color.blue() if is_queued else discord.Color.light_grey())
-        embed.add_field(name="In Queue?", value="Yes ✅" if is_queued else "No ❌", inline=True); embed.add_field(name="Queue Length", value=str(queue_length), inline=True)
-        if is_queued and position is not None: embed.add_field(name="Your Position", value=str(position), inline=True)
-        if estimated_time_seconds is not None:
-            minutes, seconds = divmod(estimated_time_seconds, 60)
-            estimated_time_str = f"{minutes} min {seconds} sec" if minutes > 0 else f"{seconds} sec"
-            embed.add_field(name="Estimated Time", value=estimated_time_str, inline=True)
-        embed.set_footer(text=f"Discord Guild: {interaction.guild.name} | By: {interaction.user.display_name}"); embed.timestamp = discord.utils.utcnow()
-        await interaction.followup.send(embed=embed)
-    except requests.exceptions.HTTPError as errh:
-        error_message = f"HTTP Error: {errh.response.status_code}"
-        try: error_details = errh.response.json().get('errors', [{}])[0].get('detail', 'API error.')
-        except: error_details = errh.response.text[:100]
-        error_message += f" - {error_details}"
-        await interaction.followup.send(f"❌ {error_message}")
-    except Exception as e: print(f"Error in ptero_queue_status: {e}"); await interaction.followup.send(f"❌ Unexpected error: {e}")
+    async def on_timeout(self):
+        if self.message is None: return
+        try: await self.message.edit(view=None)
+        except discord.HTTPException: pass
 
 @ptero_group.command(name="list_servers", description="Displays a list of Pterodactyl servers available for the API key.")
 @app_commands.checks.has_permissions(administrator=True)
@@ -530,67 +3062,117 @@ async def ptero_list_servers(interaction: discord.Interaction):
     guild_config = await check_guild_pterodactyl_config_and_respond(interaction)
     if not guild_config: return
 
-    api_headers = get_api_headers(guild_config['api_key'])
     try:
-        api_url = f"{guild_config['panel_url']}/api/client"
-        response = requests.get(api_url, headers=api_headers, timeout=15)
-        response.raise_for_status()
-
-        data = response.json()
-        servers_data = data.get('data', [])
-
-        if not servers_data:
-            await interaction.followup.send("ℹ️ No Pterodactyl servers found for the configured API key.", ephemeral=True)
-            return
-
-        embed = discord.Embed(
-            title=f"🖥️ Available Pterodactyl Servers ({len(servers_data)})",
-            description=f"Panel: `{guild_config['panel_url']}`",
-            color=discord.Color.dark_teal()
-        )
-
-        output_text = []
-        for server_obj in servers_data:
-            attrs = server_obj.get('attributes', {})
-            server_name = attrs.get('name', 'No Name')
-            server_uuid = attrs.get('uuid', 'No UUID')
-            server_identifier = attrs.get('identifier', server_uuid)
-
-            output_text.append(f"**Name:** `{server_name}`\n  **ID (identifier):** `{server_identifier}`\n  **UUID:** `{server_uuid}`\n")
-
-        full_description = "\n".join(output_text)
+        servers, pagination = await fetch_server_list_page(guild_config, 1, LIST_SERVERS_PAGE_SIZE)
+    except Exception as e:
+        await interaction.followup.send(format_server_list_error(e), ephemeral=True)
+        return
 
-        if len(full_description) > 4000:
-            full_description = full_description[:3900] + "\n\n... (list too long, partial list shown)"
+    if not servers:
+        await interaction.followup.send("ℹ️ No Pterodactyl servers found for the configured API key.", ephemeral=True)
+        return
 
-        embed.description = full_description
+    view = ServerListView(guild_config, max(pagination.get('total_pages', 1), 1))
+    embed = view.build_embed(servers, pagination)
+    if view.total_pages > 1:
+        view.message = await interaction.followup.send(embed=embed, view=view, ephemeral=True, wait=True)
+    else:
         await interaction.followup.send(embed=embed, ephemeral=True)
 
-    except requests.exceptions.HTTPError as errh:
-        msg = f"HTTP Error while fetching server list: {errh.response.status_code}"
-        if errh.response.status_code == 403: msg += " - Insufficient permissions (API key) to list servers."
-        else:
-            try: msg += f" - {errh.response.json().get('errors', [{}])[0].get('detail', errh.response.text[:100])}"
-            except: msg += f" - {errh.response.text[:100]}"
-        await interaction.followup.send(f"❌ {msg}", ephemeral=True)
-    except requests.exceptions.RequestException as e:
-        await interaction.followup.send(f"❌ A connection error occurred while fetching the server list: {e}", ephemeral=True)
+OVERVIEW_CONCURRENCY_PER_PANEL = 8
+
+async def collect_panel_overview(panel_config: dict) -> dict:
+    summary = {'servers': 0, 'states': collections.Counter(), 'cpu_absolute': 0.0, 'memory_bytes': 0, 'disk_bytes': 0, 'error': None}
+    try: servers = await fetch_all_pterodactyl_servers(panel_config)
     except Exception as e:
-        print(f"Unexpected error in ptero_list_servers: {e}")
-        await interaction.followup.send(f"❌ An unexpected error occurred while fetching the server list.", ephemeral=True)
+        summary['error'] = format_server_list_error(e)
+        return summary
+    summary['servers'] = len(servers)
+    semaphore = asyncio.Semaphore(OVERVIEW_CONCURRENCY_PER_PANEL)
+
+    async def collect_server(attrs: dict):
+        async with semaphore:
+            try: data, _ = await resource_poller.get(panel_config, attrs.get('uuid', attrs.get('identifier')), max_age=30, track=False)
+            except PterodactylError:
+                summary['states']['unreachable'] += 1
+                return
+        attributes = data.get('attributes', {}); resources = attributes.get('resources', {})
+        summary['states'][attributes.get('current_state', 'unknown')] += 1
+        summary['cpu_absolute'] += resources.get('cpu_absolute', 0.0)
+        summary['memory_bytes'] += resources.get('memory_bytes', 0)
+        summary['disk_bytes'] += resources.get('disk_bytes', 0)
+
+    await asyncio.gather(*(collect_server(attrs) for attrs in servers))
+    return summary
+
+def format_overview_states(states: collections.Counter) -> str:
+    icons = {'running': "🟢", 'starting': "🟡", 'stopping': "🟠", 'offline': "🔴", 'unreachable': "⚠️"}
+    return " ".join(f"{icons.get(state, '⚪')} {count} {state}" for state, count in sorted(states.items(), key=lambda item: -item[1])) or "No servers"
+
+@ptero_group.command(name="overview", description="Summarizes the state and resource usage of every server on all panels.")
+@app_commands.checks.has_permissions(administrator=True)
+@app_commands.guild_only()
+async def ptero_overview(interaction: discord.Interaction):
+    await interaction.response.defer(ephemeral=False)
+    panels = get_guild_panels(get_guild_config(interaction.guild.id))
+    if not panels:
+        await interaction.followup.send("❌ No Pterodactyl panel is configured. Use `/ptero set_url` and `/ptero set_api`, or `/ptero panel add`.", ephemeral=True)
+        return
+
+    pending_message = await send_pending_message(interaction, f"⏳ Collecting fleet overview from {len(panels)} panel(s)...")
+    started_at = time.monotonic()
+    summaries = await asyncio.gather(*(collect_panel_overview(panel_config) for _, panel_config in panels))
+    total_states = collections.Counter(); total_servers = 0; total_cpu = 0.0; total_memory = 0; total_disk = 0
+    embed = discord.Embed(title=f"🛰️ Fleet Overview: {interaction.guild.name}", color=discord.Color.blurple())
+    for (panel_name, panel_config), summary in zip(panels, summaries):
+        if summary['error']:
+            embed.add_field(name=f"{panel_name} · {panel_config['panel_url']}", value=summary['error'][:1024], inline=False)
+            continue
+        total_states.update(summary['states']); total_servers += summary['servers']
+        total_cpu += summary['cpu_absolute']; total_memory += summary['memory_bytes']; total_disk += summary['disk_bytes']
+        embed.add_field(name=f"{panel_name} · {panel_config['panel_url']}", value=(
+            f"{format_overview_states(summary['states'])}\n"
+            f"CPU: {summary['cpu_absolute']:.1f}% | RAM: {summary['memory_bytes'] / (1024**3):.2f} GB | Disk: {summary['disk_bytes'] / (1024**3):.2f} GB"
+        ), inline=False)
+    embed.description = (
+        f"**{total_servers}** servers on **{len(panels)}** panel(s)\n"
+        f"{format_overview_states(total_states)}\n"
+        f"Total CPU: **{total_cpu:.1f}%** | Total RAM: **{total_memory / (1024**3):.2f} GB** | Total Disk: **{total_disk / (1024**3):.2f} GB**"
+    )
+    embed.set_footer(text=f"Discord Guild: {interaction.guild.name} | By: {interaction.user.display_name} | Collected in {time.monotonic() - started_at:.1f}s")
+    embed.timestamp = discord.utils.utcnow()
+    await finish_pending_message(interaction, pending_message, embed=embed)
+
+async def panel_name_autocomplete(interaction: discord.Interaction, current: str) -> typing.List[app_commands.Choice[str]]:
+    panels = ALL_GUILD_CONFIGS.get(str(interaction.guild_id), {}).get('panels', {})
+    current = current.lower()
+    return [app_commands.Choice(name=f"{name} · {panel['panel_url']}"[:100], value=name) for name, panel in sorted(panels.items()) if current in name][:25]
+
+for group_command in ptero_group.walk_commands():
+    parameter_names = {parameter.name for parameter in getattr(group_command, 'parameters', [])}
+    if 'server_identifier' in parameter_names: group_command.autocomplete('server_identifier')(server_identifier_autocomplete)
+    if 'ptero_server_id' in parameter_names: group_command.autocomplete('ptero_server_id')(panel_server_id_autocomplete)
+ptero_delete_alias.autocomplete('alias_name')(alias_name_autocomplete)
+ptero_unschedule.autocomplete('schedule_id')(schedule_id_autocomplete)
+ptero_remove_panel.autocomplete('name')(panel_name_autocomplete)
 
 bot.tree.add_command(ptero_group)
 
 @bot.tree.error
 async def on_app_command_error(interaction: discord.Interaction, error: app_commands.AppCommandError):
     original_error = error.original if isinstance(error, app_commands.CommandInvokeError) else error
+    record_command_finished(interaction, interaction.command.qualified_name if interaction.command else 'unknown', 'error')
 
     if isinstance(original_error, app_commands.MissingPermissions) or isinstance(error, app_commands.MissingPermissions):
         message = f"🚫 {interaction.user.mention}, you do not have administrator permissions on this Discord guild to use this command!"
     elif isinstance(original_error, app_commands.NoPrivateMessage) or isinstance(error, app_commands.NoPrivateMessage):
          message = "🚫 This command can only be used in a guild."
+    elif isinstance(error, ConfigsNotReady) and config_load_error is not None:
+        message = "❌ The bot could not load its guild configurations. Please contact its administrator."
+    elif isinstance(error, ConfigsNotReady):
+        message = "⏳ The bot is still starting up. Please try again in a few seconds."
     else:
-        print(f"Unhandled slash command error '{interaction.data.get('name', 'unknown') if interaction.data else 'unknown'}': {original_error}")
+        log_event('command_failed', logging.ERROR, command=interaction.command.qualified_name if interaction.command else 'unknown', error=str(original_error))
         message = "❌ An internal bot error occurred. Please contact its administrator."
 
     if not interaction.response.is_done():
@@ -599,21 +3181,49 @@ async def on_app_command_error(interaction: discord.Interaction, error: app_comm
         try:
             await interaction.followup.send(message, ephemeral=True)
         except discord.errors.InteractionResponded: pass
-        except Exception as e_followup: print(f"Error sending followup after main error: {e_followup}")
+        except Exception as e_followup: log_event('error_followup_failed', logging.WARNING, error=str(e_followup))
+
+def collect_runtime_gauges():
+    metrics.set_gauge('ptero_guild_configs', len(ALL_GUILD_CONFIGS))
+    metrics.set_gauge('ptero_resource_poll_targets', len(resource_poller._targets))
+    metrics.set_gauge('ptero_console_streams', len(console_streams._streams))
+    for panel_url, health in ptero_client._health.items():
+        metrics.set_gauge('ptero_panel_circuit_open', 1 if health.state == 'open' else 0, panel=panel_url)
+
+metrics.collectors.append(collect_runtime_gauges)
 
 if __name__ == "__main__":
     if DISCORD_TOKEN:
         async def main():
-            await load_all_guild_configs()
-            await bot.start(DISCORD_TOKEN)
+            discord.utils.setup_logging(level=getattr(logging, os.getenv('PTERO_LOG_LEVEL', 'INFO').upper(), logging.INFO))
+            config_load = asyncio.create_task(load_all_guild_configs())
+            queue_load = asyncio.create_task(queue_engine.load())
+            lag_monitor = asyncio.create_task(monitor_event_loop_lag())
+            metrics_runner = await start_metrics_server(int(METRICS_PORT)) if METRICS_PORT else None
+            try:
+                await bot.start(DISCORD_TOKEN)
+            finally:
+                for startup_task in (config_load, queue_load):
+                    try: await startup_task
+                    except Exception as e: log_event('startup_task_failed', logging.ERROR, error=str(e))
+                await queue_engine.stop()
+                await action_scheduler.stop()
+                await config_reloader.stop()
+                lag_monitor.cancel()
+                if metrics_runner: await metrics_runner.cleanup()
+                await resource_poller.stop()
+                await console_streams.close()
+                # Compacting after a failed load would overwrite the stored configs with an empty snapshot.
+                await guild_config_persistence.close(compact=config_load_error is None)
+                await ptero_client.close()
 
         try:
             asyncio.run(main())
         except discord.errors.LoginFailure:
-            print("CRITICAL ERROR: Failed to log in the bot. Check your token (DISCORD_TOKEN).")
+            log_event('startup_failed', logging.CRITICAL, reason="Failed to log in the bot; check DISCORD_BOT_TOKEN")
         except KeyboardInterrupt:
-            print("Bot stopped by user.")
+            log_event('bot_stopped', reason="interrupted by user")
         except Exception as e:
-            print(f"An unexpected error occurred during bot startup: {e}")
+            log_event('startup_failed', logging.CRITICAL, error=str(e))
     else:
-        print("CRITICAL ERROR: Discord bot token (DISCORD_TOKEN) not found.")
+        log_event('startup_failed', logging.CRITICAL, reason="Discord bot token (DISCORD_BOT_TOKEN) not found")
@@ -0,0 +1,185 @@
+import asyncio
+
+from aiohttp import web
+
+import bot
+
+async def start_panel(handler):
+    app = web.Application()
+    app.router.add_route('*', '/{path:.*}', handler)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    site = web.TCPSite(runner, '127.0.0.1', 0)
+    await site.start()
+    return runner, f"http://127.0.0.1:{site._server.sockets[0].getsockname()[1]}"
+
+def run_against_panel(monkeypatch, handler, scenario):
+    monkeypatch.setattr(bot, 'jittered_backoff', lambda attempt, **kwargs: 0.0)
+
+    async def main():
+        runner, panel_url = await start_panel(handler)
+        client = bot.PterodactylClient(max_retries=0)
+        try: return await scenario(client, {'panel_url': panel_url, 'api_key': 'ptlc_key'})
+        finally:
+            await client.close()
+            await runner.cleanup()
+    return asyncio.run(main())
+
+def test_panel_errors_open_the_breaker_and_a_probe_closes_it(monkeypatch):
+    panel_up = {'value': False}; probes = []
+
+    async def handler(request):
+        if request.path == bot.PanelHealth.PROBE_PATH: probes.append(request.path)
+        return web.json_response({}) if panel_up['value'] else web.Response(status=503)
+
+    async def scenario(client, guild_config):
+        health = client.health_for(guild_config['panel_url'])
+        health.probe_interval = 0.05
+        for _ in range(health.failure_threshold):
+            try: await client.get(guild_config, '/api/client')
+            except bot.PterodactylHTTPError: pass
+        assert health.state == 'open'
+        requests_before = len(probes)
+        try:
+            await client.post(guild_config, '/api/client/servers/abc/power', payload={'signal': 'start'})
+            raise AssertionError("expected a fast failure")
+        except bot.PanelUnavailableError as e: assert "unreachable since" in str(e)
+        assert len(probes) == requests_before
+        panel_up['value'] = True
+        for _ in range(100):
+            if health.state == 'closed': break
+            await asyncio.sleep(0.02)
+        assert health.state == 'closed' and probes
+        assert (await client.get(guild_config, '/api/client')).status_code == 200
+
+    run_against_panel(monkeypatch, handler, scenario)
+
+def test_node_errors_do_not_open_the_breaker(monkeypatch):
+    async def handler(request):
+        return web.json_response({'errors': [{'code': 'DaemonConnectionException', 'status': '504', 'detail': "An error was encountered while processing this request."}]}, status=504)
+
+    async def scenario(client, guild_config):
+        health = client.health_for(guild_config['panel_url'])
+        for _ in range(health.failure_threshold * 2):
+            try: await client.get(guild_config, '/api/client/servers/abc/resources')
+            except bot.PterodactylHTTPError: pass
+        assert health.state == 'closed' and health.consecutive_failures == 0
+
+    run_against_panel(monkeypatch, handler, scenario)
+
+def test_proxy_errors_on_server_endpoints_open_the_breaker(monkeypatch):
+    async def handler(request):
+        return web.Response(status=502, text="<html>Bad Gateway</html>")
+
+    async def scenario(client, guild_config):
+        health = client.health_for(guild_config['panel_url'])
+        health.probe_interval = 60
+        for _ in range(health.failure_threshold):
+            try: await client.post(guild_config, '/api/client/servers/abc/power', payload={'signal': 'start'})
+            except bot.PterodactylHTTPError: pass
+        assert health.state == 'open'
+
+    run_against_panel(monkeypatch, handler, scenario)
+
+def test_hanging_resources_endpoint_opens_the_breaker(monkeypatch):
+    async def handler(request):
+        await asyncio.sleep(0.5)
+        return web.json_response({})
+
+    async def scenario(client, guild_config):
+        health = client.health_for(guild_config['panel_url'])
+        health.probe_interval = 60
+        for _ in range(health.failure_threshold):
+            try: await client.get(guild_config, '/api/client/servers/abc/resources', timeout=0.05)
+            except bot.PterodactylTimeoutError: pass
+        assert health.state == 'open'
+        try:
+            await client.get(guild_config, '/api/client/servers/abc/resources', timeout=0.05)
+            raise AssertionError("expected a fast failure")
+        except bot.PanelUnavailableError: pass
+
+    run_against_panel(monkeypatch, handler, scenario)
+
+def test_connection_errors_open_the_breaker(monkeypatch):
+    async def scenario(client, guild_config):
+        guild_config = {**guild_config, 'panel_url': 'http://127.0.0.1:9'}
+        health = client.health_for(guild_config['panel_url'])
+        health.probe_interval = 60
+        for _ in range(health.failure_threshold):
+            try: await client.get(guild_config, '/api/client/servers/abc/resources')
+            except bot.PanelUnavailableError: raise
+            except bot.PterodactylConnectionError: pass
+        assert health.state == 'open'
+        assert health.describe().startswith("🔴")
+
+    async def handler(request):
+        return web.Response()
+
+    run_against_panel(monkeypatch, handler, scenario)
+
+def test_probe_waits_for_the_rate_limiter(monkeypatch):
+    async def handler(request):
+        return web.json_response({})
+
+    async def scenario(client, guild_config):
+        limiter = client.rate_limiter_for(guild_config)
+        limiter.tokens = 3.0
+        await client._probe(guild_config, bot.PanelHealth.PROBE_PATH)
+        assert limiter.tokens < 3.0
+
+    run_against_panel(monkeypatch, handler, scenario)
+
+def test_timeouts_are_not_retried(monkeypatch):
+    calls = []
+
+    async def handler(request):
+        calls.append(request.path)
+        await asyncio.sleep(1)
+        return web.json_response({})
+
+    async def scenario(client, guild_config):
+        client.max_retries = 3
+        started = asyncio.get_running_loop().time()
+        try:
+            await client.get(guild_config, '/api/client', timeout=0.2)
+            raise AssertionError("expected a timeout")
+        except bot.PterodactylTimeoutError: pass
+        return asyncio.get_running_loop().time() - started
+
+    assert run_against_panel(monkeypatch, handler, scenario) < 0.5
+    assert len(calls) == 1
+
+def test_retries_stop_at_the_request_timeout(monkeypatch):
+    calls = []
+
+    async def handler(request):
+        calls.append(request.path)
+        return web.Response(status=503)
+
+    async def scenario(client, guild_config):
+        client.max_retries = 10
+        client.health_for(guild_config['panel_url']).failure_threshold = 100
+        monkeypatch.setattr(bot, 'jittered_backoff', lambda attempt, **kwargs: 0.15)
+        try: await client.get(guild_config, '/api/client', timeout=0.4)
+        except bot.PterodactylHTTPError as e: return e.response.status_code
+
+    assert run_against_panel(monkeypatch, handler, scenario) == 503
+    assert 2 <= len(calls) <= 3
+
+def test_coalesced_gets_are_exported_as_counters(monkeypatch):
+    monkeypatch.setattr(bot, 'metrics', bot.Metrics())
+    release = asyncio.Event()
+
+    async def handler(request):
+        await release.wait()
+        return web.json_response({})
+
+    async def scenario(client, guild_config):
+        gets = [asyncio.ensure_future(client.get(guild_config, '/api/client')) for _ in range(3)]
+        await asyncio.sleep(0.05); release.set()
+        await asyncio.gather(*gets)
+        rendered = bot.metrics.render()
+        assert "# TYPE ptero_panel_gets_total counter" in rendered and "ptero_panel_gets_total 3" in rendered
+        assert "ptero_panel_gets_coalesced_total 2" in rendered
+
+    run_against_panel(monkeypatch, handler, scenario)
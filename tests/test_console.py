@@ -0,0 +1,41 @@
+import asyncio
+
+import pytest
+
+import bot
+
+GUILD_CONFIG = {'panel_url': 'https://panel', 'api_key': 'ptlc_key'}
+
+class FakeMessage:
+    def __init__(self):
+        self.edits = []
+
+    async def edit(self, **kwargs):
+        self.edits.append(kwargs)
+
+def test_closing_a_panel_ends_watches_and_power_waits(monkeypatch):
+    async def idle(self):
+        await asyncio.sleep(3600)
+    monkeypatch.setattr(bot.ServerConsoleStream, '_run', idle)
+
+    async def scenario():
+        manager = bot.ConsoleStreamManager()
+        stream = manager.get_stream(GUILD_CONFIG, 'abc')
+        message = FakeMessage()
+        watch = bot.ConsoleWatch(stream, message, 'Server', 'abc', 600, update_interval=0.01)
+        watch_task = asyncio.create_task(watch.run())
+        power_watch = bot.PowerStateWatch(None, GUILD_CONFIG, 'abc')
+        power_watch._stream = stream
+        state_future = asyncio.get_running_loop().create_future()
+        power_watch.waiters.append(['running', False, state_future])
+        stream.add_listener(power_watch.on_event)
+        await asyncio.sleep(0.02)
+        await manager.close_panel('https://panel')
+        await asyncio.wait_for(watch_task, 1)
+        assert stream.closed and not stream.listeners and not manager._streams
+        assert "Watch ended" in message.edits[-1]['embed'].title and "removed" in message.edits[-1]['embed'].description
+        with pytest.raises(bot.PterodactylConnectionError):
+            state_future.result()
+        assert stream._idle_handle is None
+
+    asyncio.run(scenario())
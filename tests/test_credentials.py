@@ -0,0 +1,67 @@
+import pytest
+
+import bot
+
+Fernet = pytest.importorskip('cryptography.fernet').Fernet
+
+def test_seal_reveal_and_mask():
+    store = bot.CredentialStore([Fernet.generate_key().decode()])
+    sealed = store.seal('ptlc_secretkey1234')
+    assert sealed.startswith(bot.ENCRYPTED_CREDENTIAL_PREFIX)
+    assert store.seal(sealed) == sealed
+    assert store.reveal(sealed) == 'ptlc_secretkey1234'
+    assert store.mask(sealed) == 'ptlc...1234 (encrypted)'
+
+def test_fingerprint_is_stable_across_ciphertexts_and_rotation():
+    old_key = Fernet.generate_key().decode(); new_key = Fernet.generate_key().decode()
+    sealed = bot.CredentialStore([old_key]).seal('ptlc_shared')
+    store = bot.CredentialStore([new_key, old_key])
+    resealed = store.seal('ptlc_shared')
+    assert resealed != sealed
+    assert store.fingerprint(resealed) == store.fingerprint(sealed) == store.fingerprint('ptlc_shared')
+    assert store.fingerprint('ptlc_other') != store.fingerprint(sealed)
+    assert store.reveal(sealed) == 'ptlc_shared' and sealed in store.stale
+    rotated = store.rotate(sealed)
+    assert sealed not in store.stale
+    assert store.fingerprint(rotated) == store.fingerprint(resealed)
+    assert bot.CredentialStore([new_key]).reveal(rotated) == 'ptlc_shared'
+
+def test_undecryptable_key_raises_but_still_has_a_fingerprint():
+    sealed = bot.CredentialStore([Fernet.generate_key().decode()]).seal('ptlc_lost')
+    store = bot.CredentialStore([Fernet.generate_key().decode()])
+    with pytest.raises(bot.CredentialError):
+        store.reveal(sealed)
+    assert store.mask(sealed) == "(cannot be decrypted)"
+    assert store.fingerprint(sealed) == store.fingerprint('ptlc_lost')
+    with pytest.raises(bot.CredentialError):
+        store.rotate(sealed)
+
+def test_fingerprint_never_decrypts(monkeypatch):
+    store = bot.CredentialStore([Fernet.generate_key().decode()])
+    sealed = store.seal('ptlc_secret')
+    monkeypatch.setattr(store, 'reveal', lambda stored: pytest.fail("fingerprint decrypted the key"))
+    assert store.fingerprint(sealed) == store.fingerprint('ptlc_secret')
+
+def test_keys_sealed_without_a_fingerprint_get_one_on_reseal(monkeypatch):
+    master_key = Fernet.generate_key().decode()
+    store = bot.CredentialStore([master_key])
+    monkeypatch.setattr(bot, 'credential_store', store)
+    legacy = bot.ENCRYPTED_CREDENTIAL_PREFIX + Fernet(master_key.encode()).encrypt(b'ptlc_old').decode()
+    assert store.reveal(legacy) == 'ptlc_old' and not store.has_fingerprint(legacy)
+    guild_config = {'api_key': legacy, 'panels': {}}
+    assert bot.reseal_guild_credentials(guild_config)
+    assert store.has_fingerprint(guild_config['api_key'])
+    assert store.fingerprint(guild_config['api_key']) == store.fingerprint('ptlc_old')
+    assert store.reveal(guild_config['api_key']) == 'ptlc_old'
+    assert not bot.reseal_guild_credentials(guild_config)
+
+def test_guilds_sharing_a_key_share_one_rate_limiter(monkeypatch):
+    store = bot.CredentialStore([Fernet.generate_key().decode()])
+    monkeypatch.setattr(bot, 'credential_store', store)
+    client = bot.PterodactylClient()
+    first = {'panel_url': 'https://panel', 'api_key': store.seal('ptlc_shared')}
+    second = {'panel_url': 'https://panel', 'api_key': store.seal('ptlc_shared')}
+    assert first['api_key'] != second['api_key']
+    assert client.rate_limiter_for(first) is client.rate_limiter_for(second)
+    client.forget_credentials({bot.panel_credential_key(first)})
+    assert not client._rate_limiters
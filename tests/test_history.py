@@ -0,0 +1,39 @@
+import bot
+
+def resources(cpu: float, rx_bytes: int, tx_bytes: int = 0) -> dict:
+    return {'cpu_absolute': cpu, 'memory_bytes': 512 * 1024**2, 'disk_bytes': 0, 'network_rx_bytes': rx_bytes, 'network_tx_bytes': tx_bytes}
+
+RX_RATE = bot.HISTORY_FIELDS.index('rx_rate')
+CPU = bot.HISTORY_FIELDS.index('cpu')
+
+def test_network_rates_are_averaged_over_their_own_samples():
+    history = bot.ServerHistory()
+    history.record(0, resources(10, 0))
+    history.record(10, resources(20, 1000))
+    history.record(20, resources(30, 3000))
+    tier = history.tiers['1h']
+    assert tier.series(CPU, 30)[-1] == 20
+    assert tier.series(RX_RATE, 30)[-1] == 150
+
+def test_counter_reset_leaves_a_gap_instead_of_lowering_the_average():
+    history = bot.ServerHistory()
+    history.record(0, resources(0, 5000))
+    history.record(30, resources(0, 8000))
+    history.record(60, resources(0, 100))
+    series = history.tiers['1h'].series(RX_RATE, 60)
+    assert series[-2:] == [100, None]
+
+def test_buckets_are_reused_once_the_ring_wraps():
+    tier = bot.HistoryTier(60, 3)
+    tier.add(0, (1.0, None, None, None, None))
+    tier.add(180, (5.0, None, None, None, None))
+    assert tier.series(0, 180) == [None, None, 5.0]
+    assert tier.series(1, 180) == [None, None, None]
+
+def test_resource_history_evicts_least_recently_recorded_servers():
+    history = bot.ResourceHistory(max_servers=2)
+    snapshot = {'attributes': {'resources': resources(1, 0)}}
+    for server_uuid in ('a', 'b', 'a', 'c'):
+        history.record('https://panel', server_uuid, snapshot, timestamp=0)
+    assert history.get('https://panel', 'a') and history.get('https://panel', 'c')
+    assert history.get('https://panel', 'b') is None
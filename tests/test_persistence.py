@@ -0,0 +1,128 @@
+import asyncio
+import threading
+
+import bot
+
+class BlockingStorage:
+    supports_shared_cache = False
+
+    def __init__(self):
+        self.writes = []
+        self.write_started = threading.Event()
+        self.release = threading.Event()
+
+    def change_token(self):
+        return len(self.writes)
+
+    def load(self, owns_guild_id, strict=False):
+        return {}
+
+    def write_changes(self, changes):
+        self.write_started.set()
+        self.release.wait(5)
+        self.writes.append(dict(changes))
+
+    def should_compact(self):
+        return False
+
+    def compact(self, configs_json, owns_guild_id):
+        pass
+
+    def close(self):
+        pass
+
+def test_mark_dirty_during_flush_schedules_another_write(monkeypatch):
+    monkeypatch.setattr(bot, 'ALL_GUILD_CONFIGS', {'1': {'panel_url': 'a'}, '2': {'panel_url': 'b'}})
+
+    async def scenario():
+        storage = BlockingStorage()
+        persistence = bot.GuildConfigPersistence(storage, debounce_seconds=0.01)
+        persistence.mark_dirty('1')
+        await asyncio.get_running_loop().run_in_executor(None, storage.write_started.wait, 5)
+        persistence.mark_dirty('2')
+        storage.release.set()
+        for _ in range(200):
+            if len(storage.writes) == 2: break
+            await asyncio.sleep(0.01)
+        persistence._executor.shutdown(wait=False)
+        return storage.writes
+
+    writes = asyncio.run(scenario())
+    assert [set(changes) for changes in writes] == [{'1'}, {'2'}]
+    assert '"panel_url":"b"' in writes[1]['2']
+
+def make_json_storage(tmp_path):
+    return bot.JsonGuildConfigStorage(str(tmp_path / 'configs.json'), str(tmp_path / 'configs.journal'), str(tmp_path / 'configs.lock'))
+
+def test_compact_keeps_entries_appended_by_another_shard(tmp_path, monkeypatch):
+    monkeypatch.setattr(bot, 'SHARD_IDS', [0])
+    shard_zero = make_json_storage(tmp_path); other_shard = make_json_storage(tmp_path)
+    other_shard.write_changes({'1': '{"panel_url":"old"}'})
+    owns = lambda guild_id_str: guild_id_str == '0'
+    with other_shard._locked(True):
+        compact = threading.Thread(target=shard_zero.compact, args=('{"0":{"panel_url":"mine"}}', owns))
+        compact.start()
+        compact.join(0.2)
+        assert compact.is_alive()
+        with open(other_shard.journal_path, 'a') as f:
+            f.write('{"guild":"1","config":{"panel_url":"new"}}\n')
+    compact.join(5)
+    assert make_json_storage(tmp_path).load(lambda guild_id_str: True) == {'0': {'panel_url': 'mine'}, '1': {'panel_url': 'new'}}
+
+def test_json_journal_replays_deletions(tmp_path):
+    storage = make_json_storage(tmp_path)
+    storage.write_changes({'1': '{"a":1}', '2': '{"b":2}'})
+    storage.write_changes({'1': None})
+    assert storage.load(lambda guild_id_str: True) == {'2': {'b': 2}}
+    storage.compact('{"2":{"b":3}}', lambda guild_id_str: True)
+    assert storage.load(lambda guild_id_str: True) == {'2': {'b': 3}}
+    assert storage.journal_entries == 0
+
+def test_sqlite_compact_evicts_expired_shared_cache_rows(tmp_path):
+    storage = bot.SQLiteGuildConfigStorage(str(tmp_path / 'configs.db'))
+    storage.put_shared('expired', 'x', -1)
+    storage.put_shared('fresh', 'y', 60)
+    assert not storage.should_compact()
+    storage.compact('{}', lambda guild_id_str: True)
+    assert [row[0] for row in storage._connect().execute("SELECT key FROM shared_cache")] == ['fresh']
+    assert storage.get_shared('fresh') == 'y'
+    storage.close()
+
+class RecordingStorage(BlockingStorage):
+    def __init__(self):
+        super().__init__()
+        self.release.set()
+        self.token = 0
+        self.compactions = 0
+
+    def change_token(self):
+        return self.token
+
+    def compact(self, configs_json, owns_guild_id):
+        self.compactions += 1
+
+def test_close_does_not_compact_over_an_unreloaded_outside_edit(monkeypatch):
+    monkeypatch.setattr(bot, 'ALL_GUILD_CONFIGS', {'1': {'panel_url': 'a'}})
+
+    async def scenario():
+        storage = RecordingStorage()
+        persistence = bot.GuildConfigPersistence(storage)
+        await persistence.load()
+        storage.token += 1
+        await persistence.close(compact=True)
+        return storage
+
+    storage = asyncio.run(scenario())
+    assert storage.compactions == 0
+
+def test_unexpected_write_errors_keep_guilds_dirty(monkeypatch):
+    monkeypatch.setattr(bot, 'ALL_GUILD_CONFIGS', {'1': {'panel_url': object()}})
+
+    async def scenario():
+        persistence = bot.GuildConfigPersistence(RecordingStorage())
+        persistence._dirty.add('1')
+        await persistence.flush()
+        persistence._executor.shutdown(wait=False)
+        return persistence._dirty
+
+    assert asyncio.run(scenario()) == {'1'}
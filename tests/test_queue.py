@@ -0,0 +1,80 @@
+import asyncio
+import json
+import threading
+
+import bot
+
+def test_fenwick_tree_prefix_sums_and_kth():
+    tree = bot.FenwickTree(16)
+    for index in (2, 5, 9): tree.add(index, 1)
+    assert [tree.prefix_sum(index) for index in (1, 2, 5, 9, 16)] == [0, 1, 2, 3, 3]
+    assert [tree.find_kth(k) for k in (1, 2, 3)] == [2, 5, 9]
+
+def test_queue_positions_follow_joins_and_leaves():
+    queue = bot.ServerQueue()
+    for user_id in (10, 20, 30): queue.join(user_id, None)
+    assert queue.join(20, None) == 2
+    assert queue.leave(20) and not queue.leave(20)
+    assert queue.position(30) == 2
+    assert queue.pop_head() == (10, None)
+    assert queue.position(30) == 1 and len(queue) == 1
+
+def test_queue_survives_ticket_rebuilds_and_round_trips():
+    queue = bot.ServerQueue(slots=2, admit_seconds=60)
+    for user_id in range(200):
+        queue.join(user_id, user_id)
+        if user_id % 2: queue.leave(user_id - 1)
+    assert [queue.position(user_id) for user_id in (1, 99, 199)] == [1, 50, 100]
+    queue.admitted[5000] = (123.0, None)
+    restored = bot.ServerQueue.from_dict(json.loads(json.dumps(queue.to_dict())))
+    assert restored.position(199) == 100 and restored.admitted == {5000: (123.0, None)}
+    assert (restored.slots, restored.admit_seconds) == (2, 60)
+    assert bot.ServerQueue.from_dict({'capacity': 3}).slots == 3
+
+def test_mark_dirty_during_a_save_is_written_later(tmp_path, monkeypatch):
+    writes = []; write_started = threading.Event(); release = threading.Event()
+
+    def slow_write(path, data):
+        write_started.set()
+        if not writes: release.wait(5)
+        writes.append(json.loads(data))
+
+    monkeypatch.setattr(bot, 'write_file_atomically', slow_write)
+
+    async def scenario():
+        engine = bot.QueueEngine(str(tmp_path / 'queues.json'), debounce_seconds=0.01)
+        engine.queue_for('1', 'a').join(10, None)
+        engine.mark_dirty()
+        await asyncio.get_running_loop().run_in_executor(None, write_started.wait, 5)
+        engine.queue_for('1', 'a').join(20, None)
+        engine.mark_dirty()
+        release.set()
+        for _ in range(200):
+            if len(writes) == 2: break
+            await asyncio.sleep(0.01)
+
+    asyncio.run(scenario())
+    assert [entry[0] for entry in writes[-1]['1:a']['waiting']] == [10, 20]
+
+def test_find_queue_does_not_create_queues():
+    engine = bot.QueueEngine('unused.json')
+    assert engine.find_queue('1', 'a') is None
+    assert not engine.queues
+
+def test_slow_queue_does_not_hold_up_the_others():
+    async def scenario():
+        engine = bot.QueueEngine('unused.json')
+        finished = []
+
+        async def advance(guild_id_str, server_uuid, queue):
+            await asyncio.sleep(0.5 if server_uuid == 'slow' else 0)
+            finished.append((server_uuid, asyncio.get_running_loop().time()))
+
+        engine._advance = advance
+        for server_uuid in ('slow', 'fast'): engine.queue_for('1', server_uuid).join(1, None)
+        started = asyncio.get_running_loop().time()
+        await engine.check_queues(asyncio.Semaphore(2))
+        return started, dict(finished)
+
+    started, finished = asyncio.run(scenario())
+    assert finished['fast'] - started < 0.2 < finished['slow'] - started
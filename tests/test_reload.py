@@ -0,0 +1,45 @@
+import asyncio
+import copy
+
+import bot
+
+def make_guild(next_run: float) -> dict:
+    return {'panel_url': 'https://panel', 'api_key': 'ptlc_key', 'server_aliases': {}, 'default_pterodactyl_server_uuid': None,
+            'schedules': {'job1': {'id': 'job1', 'server_uuid': 'abc', 'action': 'restart', 'next_run': next_run, 'every': 3600}}}
+
+def test_advanced_schedule_survives_a_reload_before_the_flush(monkeypatch):
+    on_disk = {'1': make_guild(1000.0)}
+    monkeypatch.setattr(bot, 'ALL_GUILD_CONFIGS', copy.deepcopy(on_disk))
+
+    async def scenario():
+        persistence = bot.GuildConfigPersistence(None, debounce_seconds=60)
+        monkeypatch.setattr(bot, 'guild_config_persistence', persistence)
+        scheduler = bot.ActionScheduler()
+        job = bot.ALL_GUILD_CONFIGS['1']['schedules']['job1']
+        scheduler._advance('1', job, 1000.5)
+        assert persistence._dirty == {'1'}
+        await bot.apply_reloaded_guild_configs(copy.deepcopy(on_disk), persistence._dirty)
+        persistence._flush_task.cancel()
+        persistence._executor.shutdown(wait=False)
+
+    asyncio.run(scenario())
+    job = bot.ALL_GUILD_CONFIGS['1']['schedules']['job1']
+    assert job['next_run'] == 4600.0
+    assert bot.ActionScheduler()._current_job('1', 'job1', 1000.0) is None
+
+def test_reload_updates_the_guild_config_in_place(monkeypatch):
+    monkeypatch.setattr(bot, 'ALL_GUILD_CONFIGS', {'1': make_guild(1000.0)})
+    held_by_command = bot.ALL_GUILD_CONFIGS['1']
+    reloaded = make_guild(1000.0); reloaded['server_aliases'] = {'survival': 'abc'}
+
+    asyncio.run(bot.apply_reloaded_guild_configs({'1': reloaded}, set()))
+    assert bot.ALL_GUILD_CONFIGS['1'] is held_by_command
+    assert held_by_command['server_aliases'] == {'survival': 'abc'}
+
+def test_reload_skips_dirty_guilds_and_drops_deleted_ones(monkeypatch):
+    monkeypatch.setattr(bot, 'ALL_GUILD_CONFIGS', {'1': make_guild(1000.0), '2': make_guild(1000.0)})
+    edited = make_guild(1000.0); edited['panel_url'] = 'https://elsewhere'
+
+    asyncio.run(bot.apply_reloaded_guild_configs({'1': edited}, {'1'}))
+    assert bot.ALL_GUILD_CONFIGS['1']['panel_url'] == 'https://panel'
+    assert '2' not in bot.ALL_GUILD_CONFIGS
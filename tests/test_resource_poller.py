@@ -0,0 +1,75 @@
+import asyncio
+import time
+
+import pytest
+
+import bot
+
+class FakeResponse:
+    def __init__(self, data):
+        self._data = data
+
+    def json(self):
+        return self._data
+
+class FakeClient:
+    def __init__(self):
+        self.paths = []
+
+    async def get(self, guild_config, path, **kwargs):
+        self.paths.append(path)
+        return FakeResponse({'attributes': {'current_state': 'running', 'resources': {'cpu_absolute': 1.0}}})
+
+GUILD_CONFIG = {'panel_url': 'https://panel', 'api_key': 'ptlc_key'}
+
+def test_untracked_snapshots_are_reused_but_not_polled(monkeypatch):
+    client = FakeClient()
+    monkeypatch.setattr(bot, 'ptero_client', client)
+    monkeypatch.setattr(bot, 'ALL_GUILD_CONFIGS', {})
+
+    async def scenario():
+        poller = bot.ResourcePoller()
+        semaphore = asyncio.Semaphore(1)
+        await poller.get(GUILD_CONFIG, 'abc', max_age=30, track=False)
+        poller._sweep(time.monotonic() + 1, semaphore)
+        await asyncio.sleep(0)
+        _, age = await poller.get(GUILD_CONFIG, 'abc', max_age=30, track=False)
+        assert len(client.paths) == 1 and age < 30
+        poller._sweep(time.monotonic() + poller.interest_ttl + 1, semaphore)
+        assert not poller._targets
+
+    asyncio.run(scenario())
+
+def test_tracked_servers_are_refreshed_in_the_background(monkeypatch):
+    client = FakeClient()
+    monkeypatch.setattr(bot, 'ptero_client', client)
+    monkeypatch.setattr(bot, 'ALL_GUILD_CONFIGS', {})
+
+    async def scenario():
+        poller = bot.ResourcePoller()
+        await poller.get(GUILD_CONFIG, 'abc')
+        poller._sweep(time.monotonic() + poller.max_interval, asyncio.Semaphore(1))
+        for _ in range(10): await asyncio.sleep(0)
+        assert len(client.paths) == 2
+
+    asyncio.run(scenario())
+
+def test_default_servers_are_polled_without_scanning_guilds(monkeypatch):
+    client = FakeClient()
+    monkeypatch.setattr(bot, 'ptero_client', client)
+    monkeypatch.setattr(bot, 'ALL_GUILD_CONFIGS', {str(guild_id): {**GUILD_CONFIG} for guild_id in range(1000)})
+    monkeypatch.setattr(bot, 'panel_credential_key', lambda guild_config: (guild_config['panel_url'], guild_config['api_key']))
+
+    async def scenario():
+        poller = bot.ResourcePoller()
+        poller.track_default_server('1', {**GUILD_CONFIG, 'default_pterodactyl_server_uuid': 'abc'})
+        poller.track_default_server('2', {**GUILD_CONFIG, 'default_pterodactyl_server_uuid': None})
+        monkeypatch.setattr(bot, 'panel_credential_key', lambda guild_config: pytest.fail("the sweep looked up credentials"))
+        poller._sweep(time.monotonic(), asyncio.Semaphore(1))
+        for _ in range(10): await asyncio.sleep(0)
+        assert client.paths == ['/api/client/servers/abc/resources']
+        poller.track_default_server('1', None)
+        poller._sweep(time.monotonic() + poller.interest_ttl + 1, asyncio.Semaphore(1))
+        assert not poller._targets
+
+    asyncio.run(scenario())
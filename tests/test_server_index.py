@@ -0,0 +1,54 @@
+import asyncio
+import types
+
+import bot
+
+GUILD_CONFIG = {'panel_url': 'https://panel', 'api_key': 'ptlc_key', 'server_aliases': {'survival': 'abc12345'}}
+
+def test_index_matches_aliases_names_and_identifiers():
+    registry = bot.ServerIndexRegistry()
+    registry.record_servers(GUILD_CONFIG, [{'identifier': 'abc12345', 'uuid': 'abc12345-0000', 'name': 'Survival World'}])
+    index = registry.get('1', GUILD_CONFIG)
+    assert [value for value, _ in index.search('surv')][:2] == ['survival', 'abc12345']
+    assert registry.get('1', GUILD_CONFIG) is index
+
+def test_invalidate_panel_allows_an_immediate_rewarm(monkeypatch):
+    warmed = []
+
+    async def fake_fetch(guild_config, page, per_page):
+        warmed.append(guild_config['panel_url'])
+
+    monkeypatch.setattr(bot, 'fetch_server_list_page', fake_fetch)
+
+    async def scenario():
+        registry = bot.ServerIndexRegistry()
+        registry.get('1', GUILD_CONFIG)
+        registry.get('1', GUILD_CONFIG)
+        await asyncio.sleep(0)
+        assert warmed == ['https://panel']
+        registry.invalidate_panel('https://panel')
+        registry.invalidate_guild('1')
+        registry.get('1', GUILD_CONFIG)
+        await asyncio.sleep(0)
+        assert warmed == ['https://panel', 'https://panel']
+
+    asyncio.run(scenario())
+
+class FakeInteractionResponse:
+    async def send_message(self, content, ephemeral=False):
+        self.content = content
+
+def test_replacing_a_panel_drops_the_old_panels_servers(monkeypatch):
+    old_panel = {'panel_url': 'https://old', 'api_key': 'ptlc_old'}
+    monkeypatch.setattr(bot, 'ALL_GUILD_CONFIGS', {'1': {**GUILD_CONFIG, 'panels': {'eu': dict(old_panel)}}})
+    monkeypatch.setattr(bot, 'save_guild_config', lambda guild_id_str: None)
+    registry = bot.ServerIndexRegistry()
+    monkeypatch.setattr(bot, 'server_index', registry)
+    registry.record_servers(old_panel, [{'identifier': 'old12345', 'uuid': 'old12345-0000', 'name': 'Old Server'}])
+    registry._guild_indexes['1'] = (0, None)
+    interaction = types.SimpleNamespace(guild=types.SimpleNamespace(id=1, name='Guild'), response=FakeInteractionResponse())
+
+    asyncio.run(bot.ptero_add_panel.callback(interaction, 'eu', 'https://new', 'ptlc_new'))
+
+    assert "updated" in interaction.response.content
+    assert not registry._panel_servers and '1' not in registry._guild_indexes
@@ -0,0 +1,36 @@
+import asyncio
+
+import bot
+
+class NotFoundResponse:
+    status_code = 404
+    text = ""
+
+class FakeClient:
+    def __init__(self, visible_to):
+        self.visible_to = visible_to
+        self.requests = 0
+
+    async def get(self, guild_config, path, **kwargs):
+        self.requests += 1
+        if guild_config['api_key'] != self.visible_to: raise bot.PterodactylHTTPError(NotFoundResponse())
+        return bot.PterodactylResponse(200, {}, '{"attributes": {"name": "Survival"}}')
+
+def test_names_and_404s_are_cached_per_api_key(monkeypatch):
+    client = FakeClient(visible_to='ptlc_owner')
+    monkeypatch.setattr(bot, 'ptero_client', client)
+    monkeypatch.setattr(bot, 'server_name_cache', bot.ServerNameCache())
+    owner = {'panel_url': 'https://panel', 'api_key': 'ptlc_owner'}
+    stranger = {'panel_url': 'https://panel', 'api_key': 'ptlc_stranger'}
+
+    async def scenario():
+        assert await bot.get_pterodactyl_server_name(stranger, 'abc') == 'abc'
+        assert await bot.get_pterodactyl_server_name(owner, 'abc') == 'Survival'
+        assert await bot.get_pterodactyl_server_name(stranger, 'abc') == 'abc'
+        assert await bot.get_pterodactyl_server_name(owner, 'abc') == 'Survival'
+
+    asyncio.run(scenario())
+    assert client.requests == 2
+    assert bot.get_cached_pterodactyl_server_name(stranger, 'abc') is None
+    bot.server_name_cache.invalidate_panel('https://panel')
+    assert bot.get_cached_pterodactyl_server_name(owner, 'abc') is None
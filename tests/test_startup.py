@@ -0,0 +1,41 @@
+import asyncio
+import types
+
+import discord
+import pytest
+
+import bot
+
+class FakeResponse:
+    def __init__(self):
+        self.choices = None
+
+    async def autocomplete(self, choices):
+        self.choices = choices
+
+def make_interaction(interaction_type):
+    return types.SimpleNamespace(type=interaction_type, extras={}, response=FakeResponse(), created_at=discord.utils.utcnow())
+
+def test_autocomplete_gets_empty_choices_while_configs_load(monkeypatch):
+    monkeypatch.setattr(bot, 'configs_ready', asyncio.Event())
+    interaction = make_interaction(discord.InteractionType.autocomplete)
+    assert asyncio.run(bot.bot.tree.interaction_check(interaction)) is False
+    assert interaction.response.choices == []
+    assert 'ptero_started_at' not in interaction.extras
+
+def test_failed_config_load_releases_waiters_and_rejects_commands(monkeypatch):
+    async def failing_load():
+        raise OSError("disk on fire")
+
+    async def scenario():
+        monkeypatch.setattr(bot, 'configs_ready', asyncio.Event())
+        monkeypatch.setattr(bot, 'config_lock', asyncio.Lock())
+        monkeypatch.setattr(bot.guild_config_persistence, 'load', failing_load)
+        monkeypatch.setattr(bot, 'config_load_error', None)
+        await bot.load_all_guild_configs()
+        assert bot.configs_ready.is_set()
+        assert isinstance(bot.config_load_error, OSError)
+        with pytest.raises(bot.ConfigsNotReady):
+            await bot.bot.tree.interaction_check(make_interaction(discord.InteractionType.application_command))
+
+    asyncio.run(scenario())